@@ -0,0 +1,15 @@
+# gunicorn.conf.py
+# Configuración del servidor web (Procfile: web). Se usan workers gthread:
+# con workers síncronos el árbitro mata cualquier petición que dure más que
+# timeout (30 s por defecto), y las exportaciones en streaming
+# (/api/validation/export/, /api/document/export/) pueden durar minutos. En
+# gthread el hilo principal del worker sigue avisando al árbitro mientras
+# los hilos atienden peticiones largas; timeout solo detecta workers
+# colgados.
+import os
+
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))  # segundos
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))  # segundos
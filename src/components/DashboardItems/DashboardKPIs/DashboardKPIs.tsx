@@ -2,7 +2,7 @@
 
 import React from 'react';
 import { Card, Statistic, Row, Col } from 'antd';
-import { Validation } from '../../../types';
+import { ValidationStats } from '../../../types';
 import { calculateKPIs } from '../../../utils/kpiUtils';
 import { useTranslation } from 'react-i18next';
 import './DashboardKPIs.less';
@@ -11,8 +11,8 @@ import './DashboardKPIs.less';
  * Props para el componente DashboardKPIs
  */
 interface DashboardKPIsProps {
-    /** Array de validaciones para calcular los KPIs */
-    validations: Validation[];
+    /** Estadísticas del servidor de las que se leen los KPIs */
+    stats: ValidationStats | null;
     loading: boolean;
 }
 
@@ -22,11 +22,11 @@ interface DashboardKPIsProps {
  * Presenta estadísticas de validaciones totales, aprobadas, rechazadas y tasa de éxito
  * en un formato de tarjeta visual.
  */
-const DashboardKPIs: React.FC<DashboardKPIsProps> = ({ validations, loading }) => {
+const DashboardKPIs: React.FC<DashboardKPIsProps> = ({ stats, loading }) => {
     const { t } = useTranslation();
 
-    // Calcular KPIs a partir de las validaciones proporcionadas
-    const { totalValidations, approved, rejected, successRate } = calculateKPIs(validations);
+    // KPIs calculados por el servidor para los filtros aplicados
+    const { totalValidations, approved, rejected, successRate } = calculateKPIs(stats);
 
     return (
         <Row gutter={16} style={{ gap: 16 }}>
@@ -2,7 +2,7 @@
 
 import React from 'react';
 import { Table } from 'antd';
-import { Validation } from '../../../types';
+import { ValidationStats } from '../../../types';
 import { groupByDocumentType } from '../../../utils/documentUtils';
 import { useTranslation } from 'react-i18next';
 import './DocumentTypeAnalysis.less';
@@ -11,8 +11,8 @@ import './DocumentTypeAnalysis.less';
  * Props para el componente DocumentTypeAnalysis
  */
 interface DocumentTypeAnalysisProps {
-    /** Array de validaciones para analizar por tipo de documento */
-    validations: Validation[];
+    /** Estadísticas del servidor con el desglose por tipo de documento */
+    stats: ValidationStats | null;
     loading?: boolean;
 }
 
@@ -22,12 +22,12 @@ interface DocumentTypeAnalysisProps {
  * Presenta estadísticas detalladas de validaciones agrupadas por tipo de documento,
  * incluyendo conteo total, aprobadas, rechazadas y tasa de éxito.
  */
-const DocumentTypeAnalysis: React.FC<DocumentTypeAnalysisProps> = ({ validations, loading }) => {
+const DocumentTypeAnalysis: React.FC<DocumentTypeAnalysisProps> = ({ stats, loading }) => {
     // Obtiene la función de traducción para internacionalización
     const { t } = useTranslation();
 
-    // Procesa los datos de validación para agruparlos por tipo de documento
-    const data = groupByDocumentType(validations);
+    // Filas de la tabla a partir del desglose por tipo de documento del servidor
+    const data = groupByDocumentType(stats);
 
     /**
      * Configuración de columnas para la tabla de análisis
@@ -2,7 +2,7 @@
 
 import React, { useState } from 'react';
 import { Card, Select } from 'antd';
-import { Validation } from '../../../types';
+import { ValidationStats } from '../../../types';
 import { BarChart, Bar, XAxis, YAxis, Tooltip, CartesianGrid, ResponsiveContainer } from 'recharts';
 import { groupValidationsByMonth } from '../../../utils/chartUtils';
 import { useTranslation } from 'react-i18next';
@@ -19,8 +19,8 @@ const ACTUAL_YEAR = new Date().getFullYear().toString();
  * Props para el componente ValidationBarChart
  */
 interface ValidationBarChartProps {
-    /** Lista de validaciones para visualizar en el gráfico */
-    validations: Validation[];
+    /** Estadísticas del servidor con la serie mensual a visualizar */
+    stats: ValidationStats | null;
     loading?: boolean;
 }
 
@@ -29,7 +29,7 @@ interface ValidationBarChartProps {
  * 
  * Permite filtrar por año y visualizar la evolución mensual de validaciones
  */
-const ValidationBarChart: React.FC<ValidationBarChartProps> = ({ validations, loading }) => {
+const ValidationBarChart: React.FC<ValidationBarChartProps> = ({ stats, loading }) => {
     /**
      * Estado para el año seleccionado en el filtro
      */
@@ -38,23 +38,19 @@ const ValidationBarChart: React.FC<ValidationBarChartProps> = ({ validations, lo
     const { t } = useTranslation();
 
     /**
-     * Extraer años únicos de los datos de validaciones para poblar el selector
+     * Serie mensual calculada en el servidor
      */
-    const years = Array.from(new Set(validations.map(
-        (val) => new Date(val.timestamp).getFullYear().toString()
-    )));
+    const timeline = stats?.timeline ?? [];
 
     /**
-     * Filtrar validaciones según el año seleccionado
+     * Extraer años únicos de la serie para poblar el selector
      */
-    const filteredValidations = selectedYear
-        ? validations.filter((val) => new Date(val.timestamp).getFullYear().toString() === selectedYear)
-        : validations;
+    const years = Array.from(new Set(timeline.map((entry) => entry.period.slice(0, 4))));
 
     /**
-     * Agrupar las validaciones filtradas por mes para visualización en el gráfico
+     * Repartir la serie del año seleccionado por mes para visualización en el gráfico
      */
-    const data = groupValidationsByMonth(filteredValidations);
+    const data = groupValidationsByMonth(timeline, selectedYear);
 
     return (
         <Card
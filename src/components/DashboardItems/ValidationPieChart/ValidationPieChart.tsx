@@ -2,7 +2,7 @@
 
 import React from 'react';
 import { Card } from 'antd';
-import { Validation } from '../../../types';
+import { ValidationStats } from '../../../types';
 import { PieChart, Pie, Tooltip, Cell, ResponsiveContainer, Label } from 'recharts';
 import { calculateValidationDistribution } from '../../../utils/chartUtils';
 import './ValidationPieChart.less';
@@ -17,8 +17,8 @@ type ValidationStatus = 'success' | 'failure';
  * Props para el componente ValidationPieChart
  */
 interface ValidationPieChartProps {
-    /** Array de validaciones para analizar y mostrar en el gráfico */
-    validations: Validation[];
+    /** Estadísticas del servidor a mostrar en el gráfico */
+    stats: ValidationStats | null;
     /** Indica si los datos están cargándose */
     loading?: boolean;
 }
@@ -29,21 +29,19 @@ interface ValidationPieChartProps {
  * Visualiza la proporción entre validaciones exitosas y fallidas en formato de donut chart,
  * con el porcentaje de éxito en el centro.
  */
-const ValidationPieChart: React.FC<ValidationPieChartProps> = ({ validations, loading }) => {
+const ValidationPieChart: React.FC<ValidationPieChartProps> = ({ stats, loading }) => {
     const { t } = useTranslation();
 
     /**
      * Procesar los datos para obtener la distribución de validaciones por estado
      * El resultado es un array de objetos {status, value} usado por el gráfico
      */
-    const data = calculateValidationDistribution(validations);
+    const data = calculateValidationDistribution(stats);
 
     /**
-     * Calcular la tasa de éxito para mostrarla en el centro del gráfico
+     * Tasa de éxito calculada en el servidor, mostrada en el centro del gráfico
      */
-    const totalValidations = validations.length;
-    const approvedValidations = validations.filter((v) => v.status === 'success').length;
-    const successRate = totalValidations > 0 ? (approvedValidations / totalValidations) * 100 : 0;
+    const successRate = stats?.success_rate ?? 0;
 
     /**
      * Colores asignados a cada estado de validación
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useMemo } from 'react';
 import { Button, Space, Spin, Typography, InputNumber, notification } from 'antd';
 import {
     ZoomOutOutlined,
@@ -12,7 +12,7 @@ import useBreakpoint from 'antd/lib/grid/hooks/useBreakpoint';
 import './PDFViewer.less';
 // @ts-ignore
 import { type PDFDocumentProxy } from "pdfjs-dist";
-import { getDocumentFromBlobContainer } from '../../services/documentService';
+import { getDocumentContentUrl } from '../../services/documentService';
 import { useTranslation } from 'react-i18next';
 import { PDFViewerProps } from './PDFViewer.types';
 import 'react-pdf/dist/Page/AnnotationLayer.css';
@@ -27,7 +27,6 @@ const PDFViewer: React.FC<PDFViewerProps> = ({ documentId, onDownload, style })
     const [numPages, setNumPages] = useState<number | null>(null);
     const [scale, setScale] = useState(1.0);
     const [rotation, setRotation] = useState(0);
-    const [pdfFile, setPdfFile] = useState<any>(null);
     const { t } = useTranslation();
     const { xs, md, lg } = useBreakpoint();
     const isLargeWidth = lg;
@@ -41,29 +40,18 @@ const PDFViewer: React.FC<PDFViewerProps> = ({ documentId, onDownload, style })
     }, [isLargeWidth, isMediumWidth]);
 
     /**
-     * Obtiene el PDF al montar el componente o cuando cambia el documentId.
+     * Fuente del PDF: se pasa la URL (no el blob descargado) para que pdf.js
+     * pida solo los rangos de bytes de las páginas que muestra.
      */
-    useEffect(() => {
-        if (documentId) {
-            fetchPdf();
-        }
-    }, [documentId]);
+    const pdfFile = useMemo(
+        () => (documentId ? { url: getDocumentContentUrl(documentId), withCredentials: true } : null),
+        [documentId]
+    );
 
     /**
-     * Obtiene el PDF desde el contenedor de blobs.
+     * Opciones de pdf.js: sin descarga automática del resto del documento.
      */
-    const fetchPdf = async () => {
-        try {
-            const pdfBlob = await getDocumentFromBlobContainer(documentId);
-            setPdfFile(pdfBlob);
-        } catch (error) {
-            console.error('Error al obtener el PDF:', error);
-            notification.error({
-                message: t('pdf_viewer.doc_load.error.message'),
-                description: t('pdf_viewer.doc_load.error.description'),
-            });
-        }
-    };
+    const pdfOptions = useMemo(() => ({ disableAutoFetch: true, disableStream: true }), []);
 
     /**
      * Se llama cuando se carga el documento PDF correctamente.
@@ -116,6 +104,7 @@ const PDFViewer: React.FC<PDFViewerProps> = ({ documentId, onDownload, style })
             <div className="pdf-viewer-content" style={style}>
                 <Document
                     file={pdfFile}
+                    options={pdfOptions}
                     onLoadSuccess={onDocumentLoadSuccess}
                     onLoadError={onDocumentLoadError}
                     loading={<Spin />}
@@ -2,7 +2,7 @@
 
 import React from 'react';
 import { Table, Button, Spin, Tag } from 'antd';
-import { Validation } from '../../../types';
+import { ValidationSummary } from '../../../types';
 import './ValidationTableHistory.less';
 import { useTranslation } from 'react-i18next';
 
@@ -11,11 +11,11 @@ import { useTranslation } from 'react-i18next';
  */
 interface ValidationTableHistoryProps {
     /* Lista de validaciones a mostrar */
-    validations: Validation[];
+    validations: ValidationSummary[];
     /* Estado de carga de la tabla */
     loading: boolean;
     /* Función para manejar la visualización de detalles de una validación */
-    onViewDetails: (validation: Validation) => void;
+    onViewDetails: (validation: ValidationSummary) => void;
     /* Configuración de paginación */
     pagination: {
         current: number;
@@ -80,7 +80,7 @@ const ValidationTableHistory: React.FC<ValidationTableHistoryProps> = ({
         {
             key: 'actions',
             /* Columna para acciones, muestra un botón para ver detalles */
-            render: (_: any, record: Validation) => (
+            render: (_: any, record: ValidationSummary) => (
                 <Button type="link" onClick={() => onViewDetails(record)}>
                     {t('validationTableHistory.viewDetails')}
                 </Button>
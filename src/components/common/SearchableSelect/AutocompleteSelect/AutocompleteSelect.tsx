@@ -0,0 +1,153 @@
+// src/components/common/SearchableSelect/AutocompleteSelect/AutocompleteSelect.tsx
+
+import React, { useEffect, useMemo, useState } from 'react';
+import { notification } from 'antd';
+import { debounce } from 'lodash';
+import { useTranslation } from 'react-i18next';
+import { AutocompleteOption } from '../../../../types';
+import SearchableSelect from '../SearchableSelect';
+
+/**
+ * Caracteres mínimos para pedir sugerencias (AUTOCOMPLETE_MIN_LENGTH en el backend)
+ */
+export const AUTOCOMPLETE_MIN_LENGTH = 2;
+
+/**
+ * Props para el componente AutocompleteSelect
+ */
+interface AutocompleteSelectProps {
+    value?: string | null;
+    onChange?: (value: string | null) => void;
+    placeholder?: string;
+    style?: React.CSSProperties;
+    disabled?: boolean;
+    /** Obtiene las sugerencias {id, label} para el texto escrito */
+    fetchOptions: (query: string) => Promise<AutocompleteOption[]>;
+    /** Obtiene la opción del valor seleccionado si no está entre las sugerencias */
+    fetchSelected: (id: string) => Promise<AutocompleteOption>;
+}
+
+/**
+ * Select con autocompletado contra /api/autocomplete/
+ *
+ * Pide unas pocas sugerencias {id, label} a partir de lo tecleado, en lugar de
+ * recorrer el listado paginado completo. Un valor inicial (p. ej. el de un
+ * documento existente) se resuelve por su ID para mostrar su etiqueta.
+ */
+const AutocompleteSelect: React.FC<AutocompleteSelectProps> = ({
+    value,
+    onChange,
+    placeholder,
+    style,
+    disabled,
+    fetchOptions,
+    fetchSelected,
+}) => {
+    const [options, setOptions] = useState<AutocompleteOption[]>([]);
+    const [selected, setSelected] = useState<AutocompleteOption | null>(null);
+    const [loading, setLoading] = useState<boolean>(false);
+    const [searchValue, setSearchValue] = useState<string>('');
+    const { t } = useTranslation();
+
+    /**
+     * Pide sugerencias al cambiar el término de búsqueda
+     */
+    useEffect(() => {
+        const query = searchValue.trim();
+        if (query.length < AUTOCOMPLETE_MIN_LENGTH) {
+            setOptions([]);
+            return;
+        }
+        // Descarta las respuestas de búsquedas ya sustituidas por otra
+        let cancelled = false;
+        setLoading(true);
+        fetchOptions(query)
+            .then((results) => {
+                if (!cancelled) setOptions(results);
+            })
+            .catch(() => {
+                if (cancelled) return;
+                notification.error({
+                    message: t('notification.error.title'),
+                    description: t('notification.error.description'),
+                    duration: 3,
+                });
+            })
+            .finally(() => {
+                if (!cancelled) setLoading(false);
+            });
+        return () => {
+            cancelled = true;
+        };
+    }, [searchValue]);
+
+    /**
+     * Resuelve la etiqueta del valor seleccionado cuando llega desde fuera
+     */
+    useEffect(() => {
+        if (!value) {
+            setSelected(null);
+            return;
+        }
+        if (selected?.id === value) {
+            return;
+        }
+        const option = options.find((item) => item.id === value);
+        if (option) {
+            setSelected(option);
+            return;
+        }
+        let cancelled = false;
+        fetchSelected(value)
+            .then((result) => {
+                if (!cancelled) setSelected(result);
+            })
+            .catch(() => {
+                // Sin etiqueta el select muestra el ID
+            });
+        return () => {
+            cancelled = true;
+        };
+    }, [value]);
+
+    /**
+     * Maneja la búsqueda con debounce para evitar peticiones excesivas
+     */
+    const debouncedHandleSearch = useMemo(() => debounce((text: string) => setSearchValue(text), 300), []);
+
+    /**
+     * Sugerencias más el valor seleccionado, para que siempre tenga etiqueta
+     */
+    const data = selected && !options.some((item) => item.id === selected.id) ? [selected, ...options] : options;
+
+    /**
+     * Maneja el cambio de valor seleccionado
+     */
+    const handleSelectChange = (id: string | null) => {
+        setSelected(data.find((item) => item.id === id) || null);
+        if (onChange) {
+            onChange(id);
+        }
+        // Si se borra la selección, limpiar búsqueda
+        if (!id) {
+            setSearchValue('');
+        }
+    };
+
+    return (
+        <SearchableSelect<AutocompleteOption>
+            data={data}
+            value={value}
+            onChange={handleSelectChange}
+            placeholder={placeholder}
+            style={style}
+            renderOption={(item) => item.label}
+            keySelector={(item) => item.id}
+            loading={loading}
+            onSearch={debouncedHandleSearch}
+            disabled={disabled}
+        />
+    );
+};
+
+export default AutocompleteSelect;
@@ -7,8 +7,8 @@ import ValidationBarChart from '../../components/DashboardItems/ValidationBarCha
 import ValidationPieChart from '../../components/DashboardItems/ValidationPieChart/ValidationPieChart';
 import DocumentTypeAnalysis from '../../components/DashboardItems/DocumentTypeAnalysis/DocumentTypeAnalysis';
 import Filters from '../../components/Filters/DashboardFilters/Filters';
-import { getAllValidations } from '../../services/validationService';
-import { Validation } from '../../types';
+import { getValidationStats } from '../../services/validationService';
+import { ValidationStats } from '../../types';
 import { ValidationFilterOptions } from '../../types/filters';
 import { PageContainer } from '@ant-design/pro-layout';
 import './DashboardPage.less';
@@ -20,8 +20,8 @@ import { useTranslation } from 'react-i18next'; // Importar el hook de traducci
 const DashboardPage: React.FC = () => {
   /* Hook para acceder a las funciones de traducción */
   const { t } = useTranslation();
-  /* Estado para almacenar las validaciones */
-  const [validations, setValidations] = useState<Validation[]>([]);
+  /* Estado para almacenar las estadísticas calculadas en el servidor */
+  const [stats, setStats] = useState<ValidationStats | null>(null);
   /* Estado para los filtros aplicados */
   const [filters, setFilters] = useState<ValidationFilterOptions>({});
   /* Estado para controlar la carga de datos */
@@ -33,15 +33,14 @@ const DashboardPage: React.FC = () => {
   }, []);
 
   /**
-   * Función para obtener los datos de validaciones
+   * Función para obtener las estadísticas de validaciones (serie mensual)
    * @param appliedFilters - Filtros a aplicar en la consulta
    */
   const fetchData = async (appliedFilters: ValidationFilterOptions = filters) => {
     try {
       setLoading(true);
-      const validationResponse = await getAllValidations(appliedFilters);
-      console.log(validationResponse);
-      setValidations(validationResponse);
+      const statsResponse = await getValidationStats(appliedFilters, 'month');
+      setStats(statsResponse);
     } catch (error) {
       /* Mostrar notificación de error si falla la obtención de datos */
       notification.error({
@@ -80,22 +79,22 @@ const DashboardPage: React.FC = () => {
       <Row gutter={[16, 16]} className="dashboard-stats-row-container" >
         {/* KPIs principales */}
         <Col xs={24} sm={12} md={12} lg={12} xl={6} style={{ width: '100%' }}>
-          <DashboardKPIs validations={validations} loading={loading} />
+          <DashboardKPIs stats={stats} loading={loading} />
         </Col>
 
         {/* Gráfico circular de validaciones */}
         <Col xs={24} sm={12} md={12} lg={12} xl={6} xxl={6} style={{ width: '100%' }}>
-          <ValidationPieChart validations={validations} loading={loading} />
+          <ValidationPieChart stats={stats} loading={loading} />
         </Col>
 
         {/* Gráfico de barras de validaciones */}
         <Col xs={24} md={24} lg={24} xl={12} xxl={12} style={{ width: '100%' }}>
-          <ValidationBarChart validations={validations} loading={loading} />
+          <ValidationBarChart stats={stats} loading={loading} />
         </Col>
 
         {/* Análisis por tipo de documento */}
         <Col xs={24}>
-          <DocumentTypeAnalysis validations={validations} loading={loading} />
+          <DocumentTypeAnalysis stats={stats} loading={loading} />
         </Col>
       </Row>
     </PageContainer>
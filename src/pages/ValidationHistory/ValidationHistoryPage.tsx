@@ -5,8 +5,8 @@ import { Row, Col, notification } from 'antd';
 import ValidationTable from '../../components/Tables/ValidationTableHistory/ValidationTableHistory';
 import ValidationDetailsModal from '../../components/Modals/ValidationDetailsModal/ValidationDetailsModal';
 import ValidationFilters from '../../components/Filters/ValidationFilters/ValidationFilters';
-import { getValidations } from '../../services/validationService';
-import { Validation } from '../../types';
+import { getValidation, getValidationHistory } from '../../services/validationService';
+import { Validation, ValidationSummary } from '../../types';
 import { ValidationFilterOptions } from '../../types/filters';
 import dayjs from 'dayjs';
 import './ValidationHistory.less';
@@ -29,7 +29,7 @@ const ValidationHistoryPage: React.FC = () => {
     const { t } = useTranslation();
 
     /* Estado para almacenar la lista de validaciones */
-    const [validations, setValidations] = useState<Validation[]>([]);
+    const [validations, setValidations] = useState<ValidationSummary[]>([]);
     /* Estado para controlar la carga de datos */
     const [loading, setLoading] = useState<boolean>(true);
     /* Estado para la validación seleccionada */
@@ -59,7 +59,7 @@ const ValidationHistoryPage: React.FC = () => {
     const fetchData = async (appliedFilters: ValidationFilterOptions = filters, page = currentPage, size = pageSize) => {
         try {
             setLoading(true);
-            const validationResponse = await getValidations(appliedFilters, page, size);
+            const validationResponse = await getValidationHistory(appliedFilters, page, size);
             setValidations(validationResponse.results);
             setTotalItems(validationResponse.count);
         } catch (error) {
@@ -112,12 +112,21 @@ const ValidationHistoryPage: React.FC = () => {
     };
 
     /**
-     * Manejador para mostrar los detalles de una validación
+     * Manejador para mostrar los detalles de una validación. El historial
+     * solo trae filas resumidas: la validación completa se pide al abrirla.
      * @param validation - Validación seleccionada
      */
-    const showValidationDetails = (validation: Validation): void => {
-        setSelectedValidation(validation);
-        setIsModalVisible(true);
+    const showValidationDetails = async (validation: ValidationSummary): Promise<void> => {
+        try {
+            setSelectedValidation(await getValidation(validation.id));
+            setIsModalVisible(true);
+        } catch (error) {
+            notification.error({
+                message: t('validationHistoryPage.fetchErrorMessage'),
+                description: t('validationHistoryPage.fetchErrorDescription'),
+                duration: 3,
+            });
+        }
     }
 
     return (
@@ -1,7 +1,7 @@
 // src/services/companyService.ts
 
 import axios from 'axios';
-import { Company, CompanyResponse } from '../types';
+import { AutocompleteOption, Company, CompanyResponse } from '../types';
 
 
 /**
@@ -24,6 +24,20 @@ export const getCompaniesForSelect = async (page = 1, pageSize = 10, search = ''
     return response.data;
 };
 
+/**
+ * Obtiene sugerencias de compañías para el texto escrito (autocompletado)
+ * @param query - Texto escrito por el usuario
+ * @param limit - Número máximo de sugerencias
+ * @returns Lista de {id, label} ordenada por relevancia
+ */
+export const getCompanySuggestions = async (query: string, limit = 10): Promise<AutocompleteOption[]> => {
+    const response = await axios.get<AutocompleteOption[]>(`${API_URL}/api/autocomplete/companies/`, {
+        params: { q: query, limit },
+        withCredentials: true,
+    });
+    return response.data;
+};
+
 /**
  * Obtiene los detalles de una compañía específica por su ID
  * @param companyId - Identificador único de la compañía
@@ -94,6 +94,16 @@ export const getDocument = async (documentId: string, field?: string) => {
   return field && response.data[field] ? response.data[field] : response.data;
 };
 
+/**
+ * URL de descarga del contenido de un documento. El endpoint admite
+ * peticiones Range, por lo que el visor de PDF puede cargar las páginas
+ * bajo demanda en lugar de descargar el documento completo.
+ * @param documentId - ID del documento
+ * @returns URL del contenido del documento
+ */
+export const getDocumentContentUrl = (documentId: string) =>
+  `${API_URL}/api/documents/${documentId}/`;
+
 /**
  * Obtiene el contenido binario de un documento desde el contenedor de blobs
  * @param documentId - ID del documento
@@ -1,7 +1,7 @@
 // src/services/resourceService.ts
 
 import axios from 'axios';
-import { Resource, ResourceResponse } from '../types';
+import { AutocompleteOption, Resource, ResourceResponse } from '../types';
 
 /**
  * URL base de la API, obtenida de las variables de entorno o valor por defecto
@@ -87,6 +87,20 @@ export const getResourcesBySearch = async (page = 1, pageSize = 10, search = '')
     return response.data;
 }
 
+/**
+ * Obtiene sugerencias de recursos para el texto escrito (autocompletado)
+ * @param query - Texto escrito por el usuario
+ * @param limit - Número máximo de sugerencias
+ * @returns Lista de {id, label} ordenada por relevancia
+ */
+export const getResourceSuggestions = async (query: string, limit = 10): Promise<AutocompleteOption[]> => {
+    const response = await axios.get<AutocompleteOption[]>(`${API_URL}/api/autocomplete/resources/`, {
+        params: { q: query, limit },
+        withCredentials: true,
+    });
+    return response.data;
+}
+
 /**
  * Crea un nuevo recurso genérico
  * @param resource - Datos del recurso a crear
@@ -1,7 +1,7 @@
 // src/services/validationService.ts
 
 import axios from 'axios';
-import { Validation, ValidationRequest, ValidationResponse } from '../types';
+import { Validation, ValidationRequest, ValidationResponse, ValidationStats, ValidationSummaryResponse } from '../types';
 import { ValidationFilterOptions } from '../types/filters';
 
 /**
@@ -27,6 +27,37 @@ export const getValidations = async (filters: ValidationFilterOptions | null, pa
     return response.data;
 };
 
+/**
+ * Obtiene el historial de validaciones (filas resumidas, sin detalles) con
+ * filtros y paginación
+ * @param filters - Opciones de filtrado para las validaciones
+ * @param page - Número de página a consultar
+ * @param pageSize - Cantidad de elementos por página
+ * @returns Respuesta con la lista de validaciones resumidas y el total
+ */
+export const getValidationHistory = async (filters: ValidationFilterOptions | null, page: number | null, pageSize: number | null): Promise<ValidationSummaryResponse> => {
+    const params: { [key: string]: string | number | null } = {
+        page: page || 1,
+        page_size: pageSize || 10,
+        ...filters
+    };
+
+    const response = await axios.get<ValidationSummaryResponse>(`${API_URL}/api/validation/history/`, { params });
+    return response.data;
+};
+
+/**
+ * Obtiene una validación completa, con sus detalles
+ * @param validationId - ID de la validación
+ * @returns Datos de la validación
+ */
+export const getValidation = async (validationId: string): Promise<Validation> => {
+    const response = await axios.get<Validation>(`${API_URL}/api/validation/${validationId}/`, {
+        withCredentials: true,
+    });
+    return response.data;
+};
+
 /**
  * Obtiene validaciones para componentes de selección, con soporte para paginación y búsqueda
  * @param page - Número de página a consultar
@@ -55,6 +86,23 @@ export const getAllValidations = async (filters: ValidationFilterOptions | null)
     return response.data;
 }
 
+/**
+ * Obtiene los indicadores del dashboard calculados en el servidor
+ * @param filters - Opciones de filtrado para las validaciones
+ * @param period - Agrupación de la serie temporal ('day', 'week' o 'month')
+ * @returns Totales por estado, desglose por tipo de documento y serie temporal
+ */
+export const getValidationStats = async (
+    filters: ValidationFilterOptions | null,
+    period: ValidationStats['period'] = 'month',
+): Promise<ValidationStats> => {
+    const response = await axios.get<ValidationStats>(`${API_URL}/api/validation/stats/`, {
+        params: { ...filters, period },
+        withCredentials: true,
+    });
+    return response.data;
+}
+
 /**
  * Busca validaciones por un término de búsqueda
  * @param query - Término de búsqueda
@@ -89,12 +137,52 @@ export const createValidation = async (
     formData.append('status', status);
     formData.append('validation_details', JSON.stringify(validation_details));
 
-    // Enviar la petición POST
+    // Enviar la petición POST. El backend encola la validación y responde 202
+    // con el identificador del trabajo a consultar.
     const response = await axios.post(`${API_URL}/api/validation/`, formData, {
         headers: {
             'Content-Type': 'multipart/form-data',
         },
     });
 
-    return response.data;
+    if (response.status !== 202 || !response.data.job) {
+        return response.data;
+    }
+
+    return waitForValidationJob(response.data.job.id);
+}
+
+/**
+ * Consulta periódicamente un trabajo de validación hasta que termina
+ * @param jobId - ID del trabajo devuelto al crear la validación
+ * @param intervalMs - Milisegundos entre consultas
+ * @param timeoutMs - Milisegundos máximos de espera
+ * @param maxAttempts - Número máximo de consultas
+ * @returns Datos de la validación completada (en 'failure' con la
+ * justificación si el trabajo falló definitivamente)
+ */
+export const waitForValidationJob = async (
+    jobId: string,
+    intervalMs = 2000,
+    timeoutMs = 5 * 60 * 1000,
+    maxAttempts = 150,
+): Promise<Validation> => {
+    const deadline = Date.now() + timeoutMs;
+    for (let attempt = 0; attempt < maxAttempts && Date.now() < deadline; attempt++) {
+        const response = await axios.get(`${API_URL}/api/validation/jobs/${jobId}/`, {
+            withCredentials: true,
+        });
+        const job = response.data;
+        if (job.status === 'done') {
+            return job.validation;
+        }
+        if (job.status === 'failed') {
+            if (job.validation) {
+                return job.validation;
+            }
+            throw new Error(job.error || 'Validation job failed');
+        }
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+    throw new Error(`Validation job ${jobId} did not finish in time`);
 }
\ No newline at end of file
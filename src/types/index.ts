@@ -26,6 +26,58 @@ export interface Validation {
     validation_time: number; // Tiempo en segundos que tomó la validación
 }
 
+/**
+ * Fila del historial de validaciones (/api/validation/history/), sin los
+ * detalles de la validación
+ */
+export interface ValidationSummary {
+    id: string;
+    document: string;
+    document_name: string;
+    document_type: number | null;
+    document_type_name: string | null;
+    resource_id: string | null;
+    company_id: string | null;
+    user: number | null;
+    status: ValidationStatus;
+    timestamp: string;
+    fields_passed: number;
+    fields_failed: number;
+}
+
+export interface ValidationSummaryResponse {
+    count: number;
+    results: ValidationSummary[];
+}
+
+// Conteos por estado de /api/validation/stats/
+export interface ValidationStatusCounts {
+    total: number;
+    success: number;
+    failure: number;
+    pending: number;
+}
+
+export interface ValidationDocumentTypeStats extends ValidationStatusCounts {
+    document_type: number;
+    document_type_name: string | null;
+    success_rate: number;
+}
+
+export interface ValidationTimelineStats extends ValidationStatusCounts {
+    period: string; // Primer día del periodo, 'YYYY-MM-DD'
+}
+
+// Indicadores del dashboard calculados en el backend (/api/validation/stats/)
+export interface ValidationStats {
+    total: number;
+    by_status: Omit<ValidationStatusCounts, 'total'>;
+    success_rate: number;
+    period: 'day' | 'week' | 'month';
+    by_document_type: ValidationDocumentTypeStats[];
+    timeline: ValidationTimelineStats[];
+}
+
 export interface ValidationResponse {
     count: number;
     next: string | null;
@@ -48,6 +100,12 @@ export interface ResourceResponse {
     results: Resource[];
 }
 
+// Sugerencia de /api/autocomplete/ (compañías y recursos)
+export interface AutocompleteOption {
+    id: string;
+    label: string;
+}
+
 export interface ValidationDetail {
     name: string;
     fields_to_validate: FieldToValidate[]
@@ -1,6 +1,6 @@
 // src/utils/chartUtils.ts
 
-import { Validation, ValidationStatus } from '../types';
+import { Validation, ValidationStats, ValidationStatus, ValidationTimelineStats } from '../types';
 import moment from 'moment';
 
 /**
@@ -13,54 +13,42 @@ type DistributionEntry = {
 };
 
 /**
- * Agrupa las validaciones por mes para visualizaciones temporales
- * @param validations - Lista de validaciones a agrupar
+ * Reparte la serie mensual del servidor en los 12 meses de un año
+ * @param timeline - Serie temporal de /api/validation/stats/ con period 'month'
+ * @param year - Año a mostrar ('YYYY')
  * @returns Array de objetos con nombre del mes y número de validaciones
  */
-export const groupValidationsByMonth = (validations: Validation[]) => {
+export const groupValidationsByMonth = (timeline: ValidationTimelineStats[], year: string) => {
     // Crear array con los 12 meses, inicializando el contador de validaciones a 0
     const months = Array.from({ length: 12 }, (_, i) => ({
         month: moment().month(i).format('MMMM'),
         validations: 0,
     }));
 
-    // Para cada validación, incrementar el contador del mes correspondiente
-    validations.forEach((validation) => {
-        const monthIndex = moment(validation.timestamp).month();
-        months[monthIndex].validations += 1;
-    });
+    // Cada periodo empieza el día 1 del mes ('YYYY-MM-01')
+    timeline
+        .filter((entry) => entry.period.slice(0, 4) === year)
+        .forEach((entry) => {
+            const monthIndex = parseInt(entry.period.slice(5, 7), 10) - 1;
+            months[monthIndex].validations += entry.total;
+        });
 
     return months;
 };
 
 /**
- * Calcula la distribución de validaciones por estado (éxito/fallo)
- * @param validations - Lista de validaciones a analizar
+ * Obtiene la distribución de validaciones por estado (éxito/fallo)
+ * @param stats - Estadísticas de /api/validation/stats/ (null mientras cargan)
  * @returns Array de objetos con el estado y el número de validaciones
  */
-export const calculateValidationDistribution = (validations: Validation[]): DistributionEntry[] => {
-    console.log('Calculating validation distribution with validations:', validations);
-
-    // Reducir el array de validaciones para contar por estado
-    const distribution = validations.reduce(
-        (acc, val) => {
-            if (val.status === 'success') {
-                acc.success += 1;
-            } else if (val.status === 'failure') {
-                acc.failed += 1;
-            }
-            return acc;
-        },
-        { success: 0, failed: 0 }
-    );
-
+export const calculateValidationDistribution = (stats: ValidationStats | null): DistributionEntry[] => {
     // Preparar los datos para el gráfico
     const data: DistributionEntry[] = [
-        { status: ValidationStatus.SUCCESS, value: distribution.success },
-        { status: ValidationStatus.FAILURE, value: distribution.failed },
+        { status: ValidationStatus.SUCCESS, value: stats?.by_status.success ?? 0 },
+        { status: ValidationStatus.FAILURE, value: stats?.by_status.failure ?? 0 },
         // Agrega otros estados si es necesario
     ];
 
     // Filtrar estados con valor cero para no mostrar en el gráfico
     return data.filter((item) => item.value > 0);
-};
\ No newline at end of file
+};
@@ -1,40 +1,30 @@
 // src/utils/kpiUtils.ts
 
-import { Validation } from '../types';
+import { ValidationStats } from '../types';
 
 /**
- * Calcula indicadores clave de rendimiento (KPIs) a partir de un conjunto de validaciones
- * @param validations - Lista de validaciones a analizar
- * @returns Objeto con los KPIs calculados
+ * Obtiene los indicadores clave de rendimiento (KPIs) de las estadísticas del servidor
+ * @param stats - Estadísticas de /api/validation/stats/ (null mientras cargan)
+ * @returns Objeto con los KPIs
  */
-export const calculateKPIs = (validations: Validation[]) => {
+export const calculateKPIs = (stats: ValidationStats | null) => {
     // Número total de validaciones en el conjunto de datos
-    const totalValidations = validations.length;
+    const totalValidations = stats?.total ?? 0;
 
     // Número de validaciones aprobadas (estado 'success')
-    const approved = validations.filter(v => v.status === 'success').length;
+    const approved = stats?.by_status.success ?? 0;
 
     // Número de validaciones rechazadas (estado 'failure')
-    const rejected = validations.filter(v => v.status === 'failure').length;
+    const rejected = stats?.by_status.failure ?? 0;
 
-    // Tasa de éxito como porcentaje (validaciones aprobadas / total)
-    // Devuelve 0 si no hay validaciones para evitar división por cero
-    const successRate = totalValidations > 0 ? (approved / totalValidations) * 100 : 0;
+    // Tasa de éxito como porcentaje (validaciones aprobadas / total), calculada en el servidor
+    const successRate = stats?.success_rate ?? 0;
 
-    // Tiempo promedio de validación en segundos
-    // Calcula la suma de todos los tiempos y la divide por el número total de validaciones
-    // Devuelve 0 si no hay validaciones para evitar división por cero
-    const averageValidationTime =
-        totalValidations > 0
-            ? validations.reduce((acc, v) => acc + (v.validation_time || 0), 0) / totalValidations
-            : 0;
-
-    // Devuelve un objeto con todos los KPIs calculados
+    // Devuelve un objeto con todos los KPIs
     return {
         totalValidations,
         approved,
         rejected,
         successRate,
-        averageValidationTime,
     };
-};
\ No newline at end of file
+};
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.models import User  # Importar el modelo User de Django
 from django.contrib.auth.admin import UserAdmin  # Importar el administrador del modelo User de Django
-from .models import Document, DocumentType, Log, Validation, Company, Resource, Vehicle, Employee, FieldToExtract, FieldToValidate
+from .models import Document, DocumentType, Log, Validation, ValidationJob, UploadSession, Company, Resource, Vehicle, Employee, FieldToExtract, FieldToValidate
 
 # Comentamos el registro del modelo de usuario personalizado existente
 # @admin.register(Users)
@@ -32,12 +32,29 @@ class ValidationAdmin(admin.ModelAdmin):
     list_filter = ['status', 'timestamp']
     search_fields = ['document__name', 'user__username']
 
+@admin.register(ValidationJob)
+class ValidationJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'validation', 'status', 'attempts', 'worker', 'created_at', 'finished_at']
+    readonly_fields = ['id', 'created_at', 'started_at', 'finished_at']
+    list_filter = ['status', 'created_at']
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ['id', 'filename', 'user', 'size', 'status', 'created_at', 'expires_at']
+    readonly_fields = ['id', 'created_at', 'updated_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['filename', 'user__username']
+
 @admin.register(Log)
 class LogAdmin(admin.ModelAdmin):
-    list_display = ['timestamp', 'user', 'event']
+    list_display = ['timestamp', 'user', 'event', 'entity_type', 'entity_id']
     readonly_fields = ['timestamp']
-    list_filter = ['timestamp', 'user']
-    search_fields = ['event', 'details', 'user__username']
+    list_filter = ['timestamp', 'entity_type', 'user']
+    # La tabla está particionada por mes: se navega por fecha y se busca por
+    # columnas indexadas en lugar de recorrer 'details' de todo el histórico.
+    date_hierarchy = 'timestamp'
+    search_fields = ['=entity_id', '=event', 'user__username']
+    show_full_result_count = False
 
 @admin.register(Company)
 class CompanyAdmin(admin.ModelAdmin):
@@ -3,5 +3,7 @@ from django.apps import AppConfig
 class TfgCtaimaBackendAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tfg_ctaima_app'
-    
-    
\ No newline at end of file
+
+    def ready(self):
+        # Registra los receptores de señales
+        from . import signals  # noqa: F401
@@ -0,0 +1,271 @@
+# tfg_ctaima_app/audit.py
+# Escritura del registro de auditoría (Log). Las vistas registran eventos
+# con record() y el sink configurado en AUDIT_SINK decide cómo llegan a la
+# base de datos:
+#   'sync'     -> un INSERT por evento dentro de la propia petición
+#   'buffered' -> se acumulan en memoria y un hilo los guarda con
+#                 bulk_create al llegar a AUDIT_BUFFER_SIZE eventos o cada
+#                 AUDIT_FLUSH_INTERVAL segundos (y al terminar el proceso)
+#   'spool'    -> se añaden a ficheros JSONL locales que el comando
+#                 ingest_audit_spool carga después en la base de datos
+# Si un volcado a la base de datos falla, los eventos se escriben en el
+# spool para no perderlos.
+
+import atexit
+import glob
+import json
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Log
+
+logger = logging.getLogger(__name__)
+
+LOG_FIELDS = ('user_id', 'event', 'details', 'entity_type', 'entity_id', 'payload', 'timestamp')
+
+# Los ficheros del spool se agrupan por minuto; el de un minuto ya cerrado
+# no vuelve a recibir escrituras y se puede cargar sin carreras.
+SPOOL_BUCKET_FORMAT = '%Y%m%d%H%M'
+SPOOL_SETTLE_MINUTES = 2
+
+
+def build_entry(user, event, details, entity_type=None, entity_id=None, payload=None):
+    return {
+        'user_id': user.pk if user is not None and user.is_authenticated else None,
+        'event': str(event),
+        'details': details,
+        'entity_type': entity_type,
+        'entity_id': str(entity_id) if entity_id is not None else None,
+        'payload': payload,
+        'timestamp': timezone.now(),
+    }
+
+
+class AuditSink:
+    """
+    Interfaz común de los destinos del registro de auditoría.
+    """
+
+    def emit(self, entry):
+        raise NotImplementedError
+
+    def flush(self):
+        """Guarda los eventos pendientes, si los hay."""
+
+    def close(self):
+        self.flush()
+
+
+class SyncAuditSink(AuditSink):
+    """Guarda cada evento con un INSERT en el momento."""
+
+    def emit(self, entry):
+        Log.objects.create(**entry)
+
+
+class SpoolAuditSink(AuditSink):
+    """
+    Añade los eventos a ficheros JSONL del directorio AUDIT_SPOOL_DIR, uno
+    por proceso y minuto.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or settings.AUDIT_SPOOL_DIR
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_path = None
+
+    def path_for(self, moment):
+        bucket = moment.strftime(SPOOL_BUCKET_FORMAT)
+        return os.path.join(self.directory, f"{bucket}-{socket.gethostname()}-{os.getpid()}.jsonl")
+
+    def emit(self, entry):
+        self.write([entry])
+
+    def write(self, entries):
+        line = ''.join(
+            json.dumps({**entry, 'timestamp': entry['timestamp'].isoformat()}, default=str) + '\n'
+            for entry in entries
+        )
+        with self._lock:
+            path = self.path_for(datetime.utcnow())
+            if path != self._file_path:
+                if self._file is not None:
+                    self._file.close()
+                os.makedirs(self.directory, exist_ok=True)
+                self._file = open(path, 'a', encoding='utf-8')
+                self._file_path = path
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._file_path = None
+
+
+class BufferedAuditSink(AuditSink):
+    """
+    Acumula los eventos en memoria y los guarda por lotes desde un hilo de
+    fondo. El búfer es por proceso (por worker de gunicorn).
+
+    Args:
+        batch_size (int): Eventos que provocan un volcado inmediato
+        flush_interval (float): Segundos máximos que un evento espera
+        fallback (AuditSink): Destino de los lotes que no se pueden guardar
+    """
+
+    def __init__(self, batch_size=None, flush_interval=None, fallback=None):
+        self.batch_size = batch_size or settings.AUDIT_BUFFER_SIZE
+        self.flush_interval = flush_interval or settings.AUDIT_FLUSH_INTERVAL
+        self.fallback = fallback or SpoolAuditSink()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._buffer = []
+        self._pid = None
+        self._thread = None
+
+    def emit(self, entry):
+        self._ensure_thread()
+        with self._lock:
+            self._buffer.append(entry)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                entries, self._buffer = self._buffer, []
+            if not entries:
+                return
+            try:
+                Log.objects.bulk_create([Log(**entry) for entry in entries], batch_size=self.batch_size)
+            except Exception as e:
+                logger.error(f"Error al guardar {len(entries)} eventos de auditoría; se envían al spool: {str(e)}")
+                self._fallback(entries)
+
+    def close(self):
+        self.flush()
+        self.fallback.close()
+
+    def _fallback(self, entries):
+        try:
+            self.fallback.write(entries)
+        except Exception as e:
+            # Último recurso: que al menos queden en el log de la aplicación
+            logger.critical(f"No se pudieron guardar eventos de auditoría ({str(e)}): {entries}")
+
+    def _ensure_thread(self):
+        # Tras un fork (workers de gunicorn) el hilo del padre no existe en el hijo
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._buffer = []
+            self._thread = threading.Thread(target=self._run, name='audit-flusher', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.exception(f"Error inesperado al volcar la auditoría: {str(e)}")
+            finally:
+                connection.close()
+
+
+SINKS = {
+    'sync': SyncAuditSink,
+    'buffered': BufferedAuditSink,
+    'spool': SpoolAuditSink,
+}
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def get_audit_sink():
+    """
+    Devuelve el sink de auditoría del proceso, creándolo la primera vez a
+    partir de AUDIT_SINK ('sync', 'buffered', 'spool' o una ruta a clase).
+
+    Returns:
+        AuditSink: Sink configurado
+    """
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                sink_class = SINKS.get(settings.AUDIT_SINK) or import_string(settings.AUDIT_SINK)
+                _sink = sink_class()
+                atexit.register(_sink.close)
+    return _sink
+
+
+def record(user, event, details, entity_type=None, entity_id=None, payload=None):
+    """
+    Registra un evento de auditoría a través del sink configurado.
+
+    Args:
+        user (User): Usuario que realiza la acción
+        event (EventType | str): Evento
+        details (str): Descripción legible
+        entity_type (str): Tipo de la entidad afectada
+        entity_id: Identificador de la entidad afectada
+        payload (dict): Datos adicionales
+    """
+    entry = build_entry(user, event, details, entity_type, entity_id, payload)
+    try:
+        get_audit_sink().emit(entry)
+    except Exception as e:
+        logger.error(f"Error al registrar el evento de auditoría '{event}': {str(e)}")
+
+
+def ingest_spool(directory=None, batch_size=1000):
+    """
+    Carga en la base de datos los ficheros del spool de minutos ya cerrados
+    y los elimina.
+
+    Returns:
+        int: Número de eventos cargados
+    """
+    directory = directory or settings.AUDIT_SPOOL_DIR
+    settled_bucket = (datetime.utcnow() - timedelta(minutes=SPOOL_SETTLE_MINUTES)).strftime(SPOOL_BUCKET_FORMAT)
+    loaded = 0
+    for path in sorted(glob.glob(os.path.join(directory, '*.jsonl'))):
+        if os.path.basename(path).split('-', 1)[0] > settled_bucket:
+            continue
+        logs = []
+        with open(path, encoding='utf-8') as spool:
+            for line in spool:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.error(f"Línea no válida en el spool de auditoría '{path}': {line!r}")
+                    continue
+                entry['timestamp'] = datetime.fromisoformat(entry['timestamp'])
+                logs.append(Log(**{field: entry.get(field) for field in LOG_FIELDS}))
+        Log.objects.bulk_create(logs, batch_size=batch_size)
+        os.remove(path)
+        loaded += len(logs)
+    return loaded
@@ -0,0 +1,91 @@
+# tfg_ctaima_app/counts.py
+# Estrategias de conteo para los listados paginados. Un COUNT(*) exacto
+# sobre validaciones o documentos recorre toda la tabla (con sus joins) en
+# cada cambio de página. En su lugar:
+#   - sin filtros: la estimación de PostgreSQL (pg_class.reltuples), que
+#     mantienen ANALYZE y autovacuum, si la tabla es grande
+#   - con filtros: el COUNT(*) se guarda unos segundos en caché, por consulta
+#   - con ?exact_count=1: COUNT(*) exacto
+# Cada estrategia indica si el resultado es una estimación.
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+EXACT = 'exact'
+ESTIMATED = 'estimated'
+CACHED = 'cached'
+
+
+def table_estimate(model, using='default'):
+    """
+    Número de filas estimado por PostgreSQL para la tabla del modelo. En
+    tablas particionadas se suman las particiones.
+
+    Returns:
+        int | None: Estimación, o None si la tabla no se ha analizado nunca
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT CASE WHEN parent.relkind = 'p' THEN (
+                       SELECT SUM(GREATEST(child.reltuples, 0))
+                       FROM pg_inherits
+                       JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                       WHERE pg_inherits.inhparent = parent.oid
+                   ) ELSE parent.reltuples END
+            FROM pg_class parent
+            WHERE parent.oid = %s::regclass
+            """,
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def is_unfiltered(queryset):
+    query = queryset.query
+    # select_related no cambia el número de filas; cualquier WHERE sí
+    return not query.where and not query.distinct and not query.is_sliced
+
+
+def count_cache_key(queryset):
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.sha256(repr((sql, params)).encode('utf-8')).hexdigest()
+    return f"count:{settings.ENVIRONMENT}:{queryset.model._meta.label_lower}:{digest}"
+
+
+def count_queryset(queryset, exact=False):
+    """
+    Cuenta las filas de un listado con la estrategia que corresponda.
+
+    Args:
+        queryset (QuerySet): Consulta ya filtrada del listado
+        exact (bool): Fuerza un COUNT(*) exacto
+
+    Returns:
+        tuple[int, str]: Número de filas y estrategia usada (EXACT,
+        ESTIMATED o CACHED)
+    """
+    if exact:
+        return queryset.count(), EXACT
+
+    if is_unfiltered(queryset):
+        estimate = table_estimate(queryset.model, queryset.db)
+        # En tablas pequeñas el conteo exacto es barato y la estimación poco fiable
+        if estimate is not None and estimate >= settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD:
+            return estimate, ESTIMATED
+        return queryset.count(), EXACT
+
+    cache = caches[settings.PAGINATION_COUNT_CACHE_ALIAS]
+    key = count_cache_key(queryset)
+    count = cache.get(key)
+    if count is not None:
+        return count, CACHED
+    count = queryset.count()
+    cache.set(key, count, timeout=settings.PAGINATION_COUNT_CACHE_TTL)
+    return count, EXACT
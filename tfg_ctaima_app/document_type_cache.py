@@ -0,0 +1,202 @@
+# tfg_ctaima_app/document_type_cache.py
+# Caché en memoria del proceso de la configuración de los tipos de
+# documento: sus datos para el endpoint de validación y las listas de campos
+# a validar/extraer ya serializadas. Los tipos cambian muy poco pero se leían
+# y serializaban en cada validación listada o creada.
+#
+# Los tipos se cargan todos a la vez (son pocos) con tres consultas. La caché
+# lleva un número de versión: las señales de signals.py la invalidan al
+# guardar o borrar un tipo o sus campos. Si DOCUMENT_TYPE_CACHE_ALIAS indica
+# una entrada de CACHES, la versión se comparte a través de ella y los demás
+# procesos descartan su copia al ver que ha cambiado. DOCUMENT_TYPE_CACHE_TTL
+# acota en cualquier caso la vida de una copia.
+#
+# Sin caché compartida, otro proceso puede servir una copia antigua hasta
+# que caduque: la caché solo se usa para mostrar datos. Lo que se envía al
+# servicio de validación (validation_jobs.py, validation_batch.py) se lee
+# siempre de la base de datos.
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .models import DocumentType
+
+logger = logging.getLogger(__name__)
+
+
+def serialize_field(field):
+    # Mismo formato que devolvía DocumentTypeSerializer para cada campo
+    return {
+        'id': field.id,
+        'name': field.name,
+        'description': field.description,
+        'value': None,
+    }
+
+
+def build_config(document_type):
+    """
+    Configuración de un tipo de documento con sus campos precargados.
+
+    Returns:
+        dict: Datos del tipo para el endpoint de validación y listas de
+        campos serializadas. Es compartido: no se debe modificar.
+    """
+    fields_to_validate = sorted(document_type.fields_to_validate.all(), key=lambda field: field.id)
+    fields_to_extract = sorted(document_type.fields_to_extract.all(), key=lambda field: field.id)
+    return {
+        'id': document_type.id,
+        'name': document_type.name,
+        'api_doc_type_text': document_type.api_doc_type_text,
+        'sign': document_type.sign,
+        'pattern_validation': document_type.pattern_validation,
+        'pattern_invalidation': document_type.pattern_invalidation,
+        'fields_to_validate': [serialize_field(field) for field in fields_to_validate],
+        'fields_to_extract': [serialize_field(field) for field in fields_to_extract],
+    }
+
+
+class DocumentTypeConfigCache:
+    """
+    Configuraciones de todos los tipos de documento, por id.
+
+    Args:
+        ttl (float): Segundos máximos que se usa una copia
+        shared_cache_alias (str): Alias de CACHES para compartir la versión
+            entre procesos (opcional)
+        check_interval (float): Segundos entre consultas de la versión
+            compartida
+    """
+
+    def __init__(self, ttl=300, shared_cache_alias=None, check_interval=5):
+        self.ttl = ttl
+        self.shared_cache_alias = shared_cache_alias
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._configs = None
+        # Cambia con cada clear_local: una carga que empezó antes no se guarda
+        self._generation = 0
+        self._version = None
+        self._loaded_at = 0
+        self._checked_at = 0
+
+    @property
+    def version_key(self):
+        return f"doctype-config:{settings.ENVIRONMENT}:version"
+
+    @property
+    def shared_cache(self):
+        return caches[self.shared_cache_alias] if self.shared_cache_alias else None
+
+    def get(self, document_type_id):
+        """
+        Devuelve la configuración de un tipo de documento.
+
+        Returns:
+            dict | None: Configuración (ver build_config) o None si no existe
+        """
+        configs = self._current()
+        config = configs.get(document_type_id)
+        if config is None and document_type_id is not None:
+            # Un tipo creado después de la carga: se recarga una vez
+            configs = self._load()
+            config = configs.get(document_type_id)
+        return config
+
+    def clear_local(self):
+        with self._lock:
+            self._configs = None
+            self._generation += 1
+
+    def invalidate(self):
+        """
+        Descarta la copia de este proceso y, si hay caché compartida,
+        incrementa la versión para que la descarten los demás.
+        """
+        self.clear_local()
+        if self.shared_cache_alias:
+            cache = self.shared_cache
+            if not cache.add(self.version_key, 1, timeout=None):
+                try:
+                    cache.incr(self.version_key)
+                except ValueError:
+                    cache.set(self.version_key, 1, timeout=None)
+        logger.debug("Caché de configuraciones de tipos de documento invalidada.")
+
+    def _shared_version(self):
+        return self.shared_cache.get(self.version_key, 0) if self.shared_cache_alias else None
+
+    def _current(self):
+        now = time.monotonic()
+        with self._lock:
+            configs = self._configs
+            expired = configs is None or now - self._loaded_at > self.ttl
+            check = not expired and self.shared_cache_alias and now - self._checked_at > self.check_interval
+        if check:
+            with self._lock:
+                self._checked_at = now
+            expired = self._shared_version() != self._version
+        return self._load() if expired else configs
+
+    def _load(self):
+        # La versión se lee antes de cargar: si cambia durante la carga, la
+        # siguiente comprobación vuelve a cargar.
+        with self._lock:
+            generation = self._generation
+        version = self._shared_version()
+        document_types = DocumentType.objects.prefetch_related('fields_to_validate', 'fields_to_extract')
+        configs = {document_type.id: build_config(document_type) for document_type in document_types}
+        now = time.monotonic()
+        with self._lock:
+            if generation != self._generation:
+                # Invalidada durante la carga: lo leído puede ser anterior al commit
+                return configs
+            self._configs = configs
+            self._version = version
+            self._loaded_at = now
+            self._checked_at = now
+        return configs
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_document_type_cache():
+    """
+    Devuelve la caché de configuraciones del proceso, creándola la primera
+    vez.
+
+    Returns:
+        DocumentTypeConfigCache: Caché configurada desde settings
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DocumentTypeConfigCache(
+                    ttl=settings.DOCUMENT_TYPE_CACHE_TTL,
+                    shared_cache_alias=settings.DOCUMENT_TYPE_CACHE_ALIAS,
+                    check_interval=settings.DOCUMENT_TYPE_CACHE_CHECK_INTERVAL,
+                )
+    return _cache
+
+
+def get_document_type_config(document_type_id):
+    return get_document_type_cache().get(document_type_id)
+
+
+def invalidate_document_type_cache():
+    """
+    Invalida la caché. La copia de este proceso se descarta en el momento y
+    se vuelve a invalidar (también la versión compartida) al confirmarse la
+    transacción en curso, para no quedarse con datos leídos antes del commit.
+    """
+    cache = get_document_type_cache()
+    cache.clear_local()
+    transaction.on_commit(cache.invalidate)
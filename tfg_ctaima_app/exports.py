@@ -0,0 +1,126 @@
+# tfg_ctaima_app/exports.py
+# Exportación en streaming de listados a CSV o JSONL. Las filas se leen con
+# values().iterator(), que en PostgreSQL usa un cursor de servidor y trae
+# EXPORT_CHUNK_SIZE filas cada vez, y se escriben de una en una: la memoria
+# no depende del número de filas y los primeros bytes salen enseguida.
+#
+# El generador se ejecuta al enviar la respuesta, fuera de la vista, y abre
+# su propia transacción: en autocommit Django declararía el cursor WITH
+# HOLD y PostgreSQL materializaría el resultado entero al confirmar el
+# DECLARE, antes de enviar la primera fila.
+#
+# Una exportación grande dura más que el timeout de un worker síncrono de
+# gunicorn (30 s por defecto): el servidor web usa workers gthread (ver
+# gunicorn.conf.py), cuyo timeout no corta las peticiones largas.
+
+import csv
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+EXPORT_FORMAT_PARAM = 'export_format'
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+# (nombre en la exportación, campo de values())
+VALIDATION_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('document', 'document_id'),
+    ('document_name', 'document__name'),
+    ('document_type', 'document__document_type_id'),
+    ('document_type_name', 'document__document_type__name'),
+    ('company', 'document__company_id'),
+    ('resource_id', 'document__resource_id'),
+    ('user', 'user_id'),
+    ('status', 'status'),
+    ('justification', 'justification'),
+    ('timestamp', 'timestamp'),
+    ('validation_details', 'validation_details'),
+]
+
+DOCUMENT_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('name', 'name'),
+    ('document_type', 'document_type_id'),
+    ('document_type_name', 'document_type__name'),
+    ('company', 'company_id'),
+    ('resource', 'resource_id'),
+    ('user', 'user_id'),
+    ('url', 'url'),
+    ('file_hash', 'file_hash'),
+    ('timestamp', 'timestamp'),
+]
+
+# Prefijos con los que una hoja de cálculo interpretaría la celda como fórmula
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Echo:
+    # Buffer para csv.writer que devuelve la línea en lugar de guardarla
+    def write(self, value):
+        return value
+
+
+def csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def csv_lines(rows, columns):
+    writer = csv.writer(Echo())
+    yield writer.writerow([name for name, _ in columns])
+    for row in rows:
+        yield writer.writerow([csv_value(row[source]) for _, source in columns])
+
+
+def jsonl_lines(rows, columns):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode({name: row[source] for name, source in columns}) + '\n'
+
+
+EXPORT_WRITERS = {
+    'csv': csv_lines,
+    'jsonl': jsonl_lines,
+}
+
+
+def export_response(queryset, columns, export_format, basename):
+    """
+    Respuesta en streaming con las filas de la consulta.
+
+    Args:
+        queryset (QuerySet): Consulta ya filtrada y ordenada
+        columns (list[tuple[str, str]]): (nombre en la exportación, campo de
+            values()) de cada columna
+        export_format (str): 'csv' o 'jsonl'
+        basename (str): Nombre del fichero, sin fecha ni extensión
+
+    Returns:
+        StreamingHttpResponse: Fichero adjunto
+    """
+    def rows():
+        # El cursor de servidor vive dentro de la transacción (sin WITH HOLD)
+        with transaction.atomic():
+            yield from queryset.values(*(source for _, source in columns)).iterator(
+                chunk_size=settings.EXPORT_CHUNK_SIZE
+            )
+
+    lines = (line.encode('utf-8') for line in EXPORT_WRITERS[export_format](rows(), columns))
+    response = StreamingHttpResponse(lines, content_type=EXPORT_CONTENT_TYPES[export_format])
+    filename = f"{basename}-{timezone.localtime():%Y%m%d-%H%M%S}.{export_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'no-store'
+    return response
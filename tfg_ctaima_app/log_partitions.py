@@ -0,0 +1,215 @@
+# tfg_ctaima_app/log_partitions.py
+# Gestión de las particiones mensuales de la tabla de logs (ver la migración
+# 0030_partition_log). Crea por adelantado las particiones de los próximos
+# meses y aplica la retención: las particiones más antiguas se separan de la
+# tabla, se exportan a JSONL comprimido en el almacenamiento de documentos y
+# se eliminan. Las filas que caen en la partición por defecto (meses
+# sin partición) se mueven a su partición mensual, que se crea para ellas, y
+# así pasan también por la retención.
+
+import gzip
+import json
+import logging
+import re
+import tempfile
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import Log
+from .storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+TABLE = Log._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+PARTITION_PATTERN = re.compile(rf"^{TABLE}_p(?P<year>\d{{4}})_(?P<month>\d{{2}})$")
+
+EXPORT_COLUMNS = ('id', 'user_id', 'event', 'details', 'timestamp', 'entity_type', 'entity_id', 'payload')
+EXPORT_COLUMNS_SQL = ', '.join(f'"{column}"' for column in EXPORT_COLUMNS)
+EXPORT_BATCH_SIZE = 5000
+
+
+def month_start(moment):
+    return moment.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month):
+    return f"{TABLE}_p{month:%Y_%m}"
+
+
+def list_partitions():
+    """
+    Particiones mensuales existentes, ordenadas por mes.
+
+    Returns:
+        list[tuple[str, datetime]]: Nombre y primer instante del mes (UTC)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            month = datetime(int(match['year']), int(match['month']), 1, tzinfo=timezone.utc)
+            partitions.append((name, month))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def create_partition(month):
+    """
+    Crea la partición de un mes. Las filas de ese mes que hubieran caído en
+    la partición por defecto se mueven a la nueva antes de adjuntarla.
+
+    Args:
+        month (datetime): Primer instante del mes (UTC)
+    """
+    name = partition_name(month)
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} '
+            f'WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *) '
+            f'INSERT INTO {name} SELECT * FROM moved',
+            [start, end],
+        )
+        attach_partition(name, month)
+    logger.info(f"Partición '{name}' creada.")
+    return name
+
+
+def attach_partition(name, month):
+    """
+    Adjunta a la tabla de logs la tabla de un mes como su partición.
+
+    Args:
+        name (str): Tabla de la partición
+        month (datetime): Primer instante del mes (UTC)
+    """
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')")
+
+
+def default_partition_months():
+    """
+    Meses que tienen filas en la partición por defecto.
+
+    Returns:
+        list[datetime]: Primer instante de cada mes (UTC)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT DISTINCT date_trunc('month', \"timestamp\" AT TIME ZONE 'UTC') FROM {DEFAULT_PARTITION}"
+        )
+        return sorted(row[0].replace(tzinfo=timezone.utc) for row in cursor.fetchall())
+
+
+def default_partition_rows():
+    """
+    Número de filas en la partición por defecto. Debería ser 0 después de
+    ensure_partitions; si no lo es, esas filas no se archivan ni se eliminan.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT COUNT(*) FROM {DEFAULT_PARTITION}')
+        return cursor.fetchone()[0]
+
+
+def ensure_partitions(months_ahead=None):
+    """
+    Crea las particiones que falten desde el mes actual hasta months_ahead
+    meses después y las de los meses con filas en la partición por defecto,
+    que se mueven a ellas.
+
+    Returns:
+        list[str]: Particiones creadas
+    """
+    months_ahead = settings.LOG_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    existing = {month for _, month in list_partitions()}
+    current = month_start(datetime.now(timezone.utc))
+    months = {add_months(current, offset) for offset in range(months_ahead + 1)}
+    months.update(default_partition_months())
+    created = []
+    for month in sorted(months - existing):
+        created.append(create_partition(month))
+    return created
+
+
+def archive_blob_name(name):
+    return f"{settings.ENVIRONMENT}/_archive/logs/{name}.jsonl.gz"
+
+
+def export_partition(name):
+    """
+    Exporta las filas de una partición a JSONL comprimido en el
+    almacenamiento.
+
+    Returns:
+        tuple[str, int]: Nombre del objeto y número de filas exportadas
+    """
+    rows = 0
+    with tempfile.TemporaryFile() as buffer:
+        with gzip.GzipFile(fileobj=buffer, mode='wb') as archive:
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT {EXPORT_COLUMNS_SQL} FROM {name} ORDER BY "timestamp", id')
+                while batch := cursor.fetchmany(EXPORT_BATCH_SIZE):
+                    for row in batch:
+                        archive.write((json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str) + '\n').encode('utf-8'))
+                    rows += len(batch)
+        buffer.seek(0)
+        blob_name = archive_blob_name(name)
+        get_storage().upload(blob_name, buffer, overwrite=True)
+    return blob_name, rows
+
+
+def apply_retention(retention_months=None, archive=True):
+    """
+    Separa, archiva y elimina las particiones anteriores al periodo de
+    retención.
+
+    Args:
+        retention_months (int): Meses completos a conservar además del actual
+        archive (bool): Si es False las particiones se eliminan sin exportar
+
+    Returns:
+        list[dict]: Particiones procesadas con su archivo y filas
+    """
+    retention_months = settings.LOG_RETENTION_MONTHS if retention_months is None else retention_months
+    cutoff = add_months(month_start(datetime.now(timezone.utc)), -retention_months)
+    processed = []
+    for name, month in list_partitions():
+        if month >= cutoff:
+            continue
+        # Se separa antes de exportarla: así ninguna fila escrita durante la
+        # exportación se pierde al eliminarla. Si la exportación falla se
+        # vuelve a adjuntar y se reintenta en la siguiente pasada.
+        with connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION {name}')
+        try:
+            blob_name, rows = export_partition(name) if archive else (None, None)
+        except Exception:
+            attach_partition(name, month)
+            raise
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE {name}')
+        logger.info(f"Partición '{name}' retirada" + (f" y archivada en '{blob_name}' ({rows} filas)." if archive else "."))
+        processed.append({'partition': name, 'archive': blob_name, 'rows': rows})
+    return processed
@@ -0,0 +1,90 @@
+import json
+import statistics
+import time
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from tfg_ctaima_app import renderers
+from tfg_ctaima_app.models import Company, Document, DocumentType, Employee, Validation
+from tfg_ctaima_app.renderers import FastJSONRenderer
+from tfg_ctaima_app.serializers import ValidationSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara el tiempo de render de JSONRenderer y FastJSONRenderer sobre N validaciones serializadas '
+        '(creadas en una transacción que se deshace al terminar) y sobre N filas con UUID, datetime y Decimal'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10000, help='Filas de cada respuesta')
+        parser.add_argument('--repeat', type=int, default=5, help='Repeticiones de cada medida (se da la mediana)')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError('Hace falta un superusuario para crear las validaciones sintéticas.')
+        if renderers.orjson is None:
+            self.stdout.write(self.style.WARNING('orjson no está instalado: FastJSONRenderer usa JSONRenderer.'))
+        try:
+            with transaction.atomic():
+                self.seed(options['count'], user)
+                self.run(options['count'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, count, user):
+        document_type = DocumentType.objects.create(name='Benchmark render')
+        company = Company.objects.create(company_id='BENCH-RENDER', company_name='Benchmark', location='ES')
+        employee = Employee.objects.create(resource_type='employee', first_name='Bench', last_name='Render',
+                                           country='ES', worker_id='BENCH-RENDER')
+        documents = Document.objects.bulk_create(
+            Document(name=f'render{i}.pdf', url='https://example.com/render.pdf', user=user,
+                     document_type=document_type, company=company, resource=employee)
+            for i in range(max(1, count // 10))
+        )
+        details = {'fields_to_validate': [{'name': 'company_id', 'expected_value': 'B1', 'obtained_value': 'B1'}],
+                   'fields_to_extract': [{'name': 'fecha', 'obtained_value': '2024-01-01'}]}
+        Validation.objects.bulk_create(
+            (Validation(document=documents[i % len(documents)], user=user, status='success',
+                        justification='Validación de prueba', validation_details=details)
+             for i in range(count)),
+            batch_size=5000,
+        )
+        self.document_type = document_type
+
+    def measure(self, label, repeat, renderer, data):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            body = renderer.render(data, 'application/json', {})
+            timings.append((time.perf_counter() - start) * 1000)
+        self.stdout.write(f'{label:<60} {statistics.median(timings):9.1f} ms  {len(body) // 1024:7d} KiB')
+        return body
+
+    def run(self, count, repeat):
+        queryset = Validation.objects.filter(document__document_type=self.document_type).order_by('-timestamp')
+        serialized = ValidationSerializer(ValidationSerializer.setup_eager_loading(queryset), many=True).data
+        default = self.measure(f'JSONRenderer: {count} validaciones serializadas', repeat, JSONRenderer(), serialized)
+        fast = self.measure(f'FastJSONRenderer: {count} validaciones serializadas', repeat,
+                            FastJSONRenderer(), serialized)
+        if json.loads(default) != json.loads(fast):
+            raise CommandError('FastJSONRenderer no devuelve lo mismo que JSONRenderer.')
+
+        # Filas sin pasar por un serializer: tipos que el encoder tiene que convertir
+        now = timezone.now()
+        rows = [{'id': pk, 'timestamp': now, 'amount': Decimal('12.50'), 'status': 'success'}
+                for pk in queryset.values_list('pk', flat=True)]
+        self.measure(f'JSONRenderer: {count} filas con UUID, datetime y Decimal', repeat, JSONRenderer(), rows)
+        self.measure(f'FastJSONRenderer: {count} filas con UUID, datetime y Decimal', repeat,
+                     FastJSONRenderer(), rows)
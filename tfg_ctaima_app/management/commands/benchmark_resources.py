@@ -0,0 +1,91 @@
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from tfg_ctaima_app.models import Employee, Resource, Vehicle
+from tfg_ctaima_app.serializers import ResourceSerializer, get_resource_row_serializer
+from tfg_ctaima_app.views import ResourceViewSet
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide la latencia del listado de recursos (serializer por fila frente a la lectura rápida con values) '
+        'sobre N recursos sintéticos creados en una transacción que se deshace al terminar'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10000, help='Recursos sintéticos a crear')
+        parser.add_argument('--repeat', type=int, default=3, help='Repeticiones de cada medida (se da la mediana)')
+        parser.add_argument('--page-size', type=int, default=100, help='Tamaño de página de las peticiones al listado')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError('Hace falta un superusuario para las peticiones al listado.')
+        try:
+            with transaction.atomic():
+                self.seed(options['count'])
+                self.run(user, options['repeat'], options['page_size'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, count):
+        start = time.perf_counter()
+        for i in range(count):
+            if i % 2:
+                Vehicle.objects.create(resource_type='vehicle', name=f'Vehículo {i}', registration_id=f'B-{i:06d}',
+                                       manufacturer='Bench', model='X', weight=1000.0 + i)
+            else:
+                Employee.objects.create(resource_type='employee', first_name=f'Nombre{i}', last_name='Bench',
+                                        email=f'bench{i}@example.com', country='ES', worker_id=f'W{i:06d}')
+        self.stdout.write(f'{count} recursos creados en {time.perf_counter() - start:.1f} s '
+                          f'({Resource.objects.count()} en total).')
+
+    def measure(self, label, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append((time.perf_counter() - start) * 1000)
+        self.stdout.write(f'{label:<55} {statistics.median(timings):9.1f} ms')
+        return result
+
+    def run(self, user, repeat, page_size):
+        queryset = Resource.objects.all().order_by('-timestamp')
+        row_serializer = get_resource_row_serializer()
+
+        legacy = self.measure(
+            'Todos: ResourceSerializer(many=True) + select_related', repeat,
+            lambda: ResourceSerializer(ResourceSerializer.setup_eager_loading(queryset), many=True).data
+        )
+        fast = self.measure(
+            'Todos: values() + ResourceRowSerializer', repeat,
+            lambda: [row_serializer.to_representation(row) for row in row_serializer.values(queryset)]
+        )
+        if [dict(item) for item in legacy] != fast:
+            raise CommandError('La lectura rápida no devuelve lo mismo que ResourceSerializer.')
+
+        factory = APIRequestFactory()
+        view = ResourceViewSet.as_view({'get': 'list'})
+        last_page = max(1, Resource.objects.count() // page_size)
+
+        def get(params):
+            request = factory.get('/api/resources/', {'page_size': page_size, **params})
+            force_authenticate(request, user=user)
+            response = view(request)
+            response.render()
+            return response
+
+        self.measure(f'GET /api/resources/ página 1 ({page_size} filas)', repeat, lambda: get({}))
+        self.measure(f'GET /api/resources/ página {last_page}', repeat, lambda: get({'page': last_page}))
+        self.measure('GET /api/resources/ primera página por cursor', repeat, lambda: get({'pagination': 'cursor'}))
+        self.measure('GET /api/resources/?search=Nombre1', repeat, lambda: get({'search': 'Nombre1'}))
@@ -0,0 +1,78 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from tfg_ctaima_app.views import (
+    DocumentTypeViewSet, DocumentViewSet, EmployeeViewSet, ResourceViewSet, ValidationViewSet, VehicleViewSet
+)
+
+# Listados a comprobar: nombre, vista y ruta
+ENDPOINTS = [
+    ('validation', ValidationViewSet, '/api/validation/'),
+    ('document', DocumentViewSet, '/api/document/'),
+    ('documentTypes', DocumentTypeViewSet, '/api/documentTypes/'),
+    ('resources', ResourceViewSet, '/api/resources/'),
+    ('employees', EmployeeViewSet, '/api/employees/'),
+    ('vehicles', VehicleViewSet, '/api/vehicles/'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Comprueba que el número de consultas de los listados no crece con el tamaño de página '
+        '(detecta consultas N+1 en los serializers)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-sizes', default='1,10,100',
+                            help='Tamaños de página a comparar, separados por comas')
+        parser.add_argument('--username', help='Usuario con el que se hacen las peticiones (por defecto, un superusuario)')
+        parser.add_argument('--endpoint', action='append', dest='endpoints',
+                            help='Limita la comprobación a estos listados (se puede repetir)')
+
+    def handle(self, *args, **options):
+        page_sizes = [int(size) for size in options['page_sizes'].split(',')]
+        if options['username']:
+            user = User.objects.filter(username=options['username']).first()
+        else:
+            user = User.objects.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError('No hay un usuario con el que hacer las peticiones.')
+
+        factory = APIRequestFactory()
+        failures = []
+        for name, viewset, path in ENDPOINTS:
+            if options['endpoints'] and name not in options['endpoints']:
+                continue
+            view = viewset.as_view({'get': 'list'})
+            # La primera petición carga las cachés del proceso y no se mide
+            self.get(view, factory, path, page_sizes[0], user, name)
+            counts = []
+            for page_size in page_sizes:
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.get(view, factory, path, page_size, user, name)
+                counts.append((page_size, len(response.data.get('results', [])), len(queries)))
+
+            summary = ', '.join(f'{size} ({rows} filas): {total}' for size, rows, total in counts)
+            if len({total for _, _, total in counts}) > 1:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'{name}: {summary}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{name}: {summary}'))
+                if counts[-1][1] < counts[-1][0]:
+                    self.stdout.write('  Aviso: menos filas que el tamaño de página mayor; la comprobación es parcial.')
+
+        if failures:
+            raise CommandError(f"El número de consultas depende del tamaño de página en: {', '.join(failures)}")
+
+    def get(self, view, factory, path, page_size, user, name):
+        # exact_count para que la estrategia de conteo no varíe entre peticiones
+        request = factory.get(path, {'page_size': page_size, 'exact_count': 1})
+        force_authenticate(request, user=user)
+        response = view(request)
+        response.render()
+        if response.status_code != 200:
+            raise CommandError(f"{name}: respuesta {response.status_code} con page_size={page_size}")
+        return response
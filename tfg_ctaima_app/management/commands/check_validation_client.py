@@ -0,0 +1,88 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tfg_ctaima_app.validation_client import ValidationServiceClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 para que el cliente pueda reutilizar la conexión
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with server.lock:
+            server.connections.add(self.client_address)
+            failing = server.failures > 0
+            if failing:
+                server.failures -= 1
+        if failing:
+            self.send_response(503)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        fields = json.loads(body).get('fields_to_validate', {})
+        response = json.dumps({'result': 'OK', 'justificacion': 'stub', 'detalle': {
+            name: {'campo_extraido': field.get('value')} for name, field in fields.items()
+        }}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Comprueba el cliente del servicio de validación contra un servidor stub local: el stub responde 503 '
+        'las primeras --failures peticiones y después OK, y se verifica que el cliente reintenta y que todas '
+        'las peticiones reutilizan una sola conexión keep-alive'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20, help='Validaciones a enviar')
+        parser.add_argument('--failures', type=int, default=2, help='Respuestas 503 iniciales del stub')
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        server.lock = threading.Lock()
+        server.connections = set()
+        server.failures = options['failures']
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        client = ValidationServiceClient(
+            endpoint=f"http://127.0.0.1:{server.server_port}/validate",
+            subscription_key='stub',
+            max_retries=options['failures'],
+            backoff_base=0.01,
+        )
+        payload = {'fields_to_validate': {'company_id': {'value': 'B1', 'threshold': 80}}}
+        try:
+            for _ in range(options['requests']):
+                result = client.validate(payload)
+                if result.get('result') != 'OK':
+                    raise CommandError(f"Respuesta inesperada del stub: {result}")
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
+
+        metrics = client.metrics.snapshot()
+        self.stdout.write(json.dumps(metrics, indent=2))
+        self.stdout.write(f"Conexiones abiertas con el stub: {len(server.connections)}")
+
+        if metrics['retries'] != options['failures']:
+            raise CommandError(f"Se esperaban {options['failures']} reintentos y hubo {metrics['retries']}.")
+        if metrics['successes'] != options['requests']:
+            raise CommandError(f"Se esperaban {options['requests']} validaciones correctas y hubo {metrics['successes']}.")
+        if len(server.connections) != 1:
+            raise CommandError(f"El cliente abrió {len(server.connections)} conexiones en lugar de reutilizar una.")
+        self.stdout.write(self.style.SUCCESS('El cliente reintenta y reutiliza la conexión.'))
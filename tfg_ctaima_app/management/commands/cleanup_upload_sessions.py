@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from tfg_ctaima_app.uploads import expire_upload_sessions
+
+
+class Command(BaseCommand):
+    help = 'Aborta las subidas por partes caducadas y elimina sus bloques temporales'
+
+    def handle(self, *args, **options):
+        expired = expire_upload_sessions()
+        self.stdout.write(self.style.SUCCESS(f'{expired} subidas caducadas abortadas.'))
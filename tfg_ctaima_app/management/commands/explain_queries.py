@@ -0,0 +1,121 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from tfg_ctaima_app.models import Company, Document, DocumentType, Employee, Resource, Validation, Vehicle
+from tfg_ctaima_app.views import DocumentViewSet, ResourceViewSet, ValidationViewSet
+
+
+class Rollback(Exception):
+    pass
+
+
+def sample(model, field):
+    # Valor de un campo de una fila cualquiera, para los filtros de ejemplo
+    return str(model.objects.order_by().values_list(field, flat=True).first())
+
+
+# Consultas canónicas de los listados: nombre, ViewSet, ruta y parámetros
+# de la petición (calculados sobre los datos presentes).
+QUERIES = [
+    ('validation', ValidationViewSet, '/api/validation/', lambda: {}),
+    ('validation-status', ValidationViewSet, '/api/validation/', lambda: {'status': 'failure'}),
+    ('validation-document', ValidationViewSet, '/api/validation/',
+     lambda: {'document_id': sample(Validation, 'document_id')}),
+    ('validation-user', ValidationViewSet, '/api/validation/', lambda: {'user_id': sample(Validation, 'user_id')}),
+    ('validation-document-type', ValidationViewSet, '/api/validation/',
+     lambda: {'document_type': sample(Document, 'document_type_id')}),
+    ('validation-company', ValidationViewSet, '/api/validation/', lambda: {'company_id': sample(Document, 'company_id')}),
+    ('validation-resource', ValidationViewSet, '/api/validation/',
+     lambda: {'resource_id': sample(Document, 'resource_id')}),
+    ('validation-date-range', ValidationViewSet, '/api/validation/',
+     lambda: {'start_date': (timezone.now() - timedelta(days=7)).isoformat(), 'end_date': timezone.now().isoformat()}),
+    ('document', DocumentViewSet, '/api/document/', lambda: {}),
+    ('resources', ResourceViewSet, '/api/resources/', lambda: {}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Muestra el plan (EXPLAIN ANALYZE) de las consultas de los listados con sus filtros habituales. '
+        'Con --seed crea antes datos sintéticos en una transacción que se deshace al terminar'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Validaciones sintéticas a crear antes de medir (0: usar los datos existentes)')
+        parser.add_argument('--page-size', type=int, default=10, help='Filas de la página consultada')
+        parser.add_argument('--query', action='append', dest='queries',
+                            help='Limita la salida a estas consultas (se puede repetir)')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError('Hace falta un superusuario para construir las consultas de los listados.')
+        try:
+            with transaction.atomic():
+                if options['seed']:
+                    self.seed(options['seed'], user)
+                self.explain(user, options['page_size'], options['queries'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, count, user):
+        start = time.perf_counter()
+        document_types = [DocumentType.objects.get_or_create(name=f'Explain {i}')[0] for i in range(5)]
+        companies = Company.objects.bulk_create(
+            Company(company_id=f'EXPLAIN-{i:05d}', company_name=f'Explain {i}', location='ES') for i in range(50)
+        )
+        # Las subclases de Resource no admiten bulk_create
+        resources = [
+            Employee.objects.create(resource_type='employee', first_name=f'Explain{i}', last_name='Plan',
+                                    country='ES', worker_id=f'E{i:05d}')
+            for i in range(25)
+        ] + [
+            Vehicle.objects.create(resource_type='vehicle', name=f'Explain {i}', registration_id=f'EX-{i:05d}')
+            for i in range(25)
+        ]
+        now = timezone.now()
+        documents = Document.objects.bulk_create(
+            Document(name=f'explain{i}.pdf', url='https://example.com/explain.pdf', user=user,
+                     document_type=random.choice(document_types), company=random.choice(companies),
+                     resource=random.choice(resources), timestamp=now - timedelta(minutes=i))
+            for i in range(max(1, count // 3))
+        )
+        statuses = [status for status, _ in Validation.STATUS_CHOICES]
+        Validation.objects.bulk_create(
+            (Validation(document=random.choice(documents), user=user, status=random.choice(statuses),
+                        validation_details={}, timestamp=now - timedelta(minutes=i))
+             for i in range(count)),
+            batch_size=5000,
+        )
+        # Estadísticas al día para que el planificador vea los datos nuevos
+        with connection.cursor() as cursor:
+            for model in (Company, Resource, Document, Validation):
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+        self.stdout.write(f'{count} validaciones y {len(documents)} documentos creados en '
+                          f'{time.perf_counter() - start:.1f} s.')
+
+    def explain(self, user, page_size, names):
+        factory = APIRequestFactory()
+        for name, viewset, path, params in QUERIES:
+            if names and name not in names:
+                continue
+            request = factory.get(path, params())
+            force_authenticate(request, user=user)
+            # La consulta se construye como en el listado: get_queryset y los filter_backends del ViewSet
+            view = viewset(action_map={'get': 'list'}, format_kwarg=None)
+            view.kwargs = {}
+            view.request = view.initialize_request(request)
+            queryset = view.filter_queryset(view.get_queryset())[:page_size]
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {name} {request.GET.urlencode()}'))
+            self.stdout.write(queryset.explain(analyze=True, buffers=True))
+            self.stdout.write('')
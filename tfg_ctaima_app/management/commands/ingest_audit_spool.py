@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tfg_ctaima_app.audit import ingest_spool
+
+
+class Command(BaseCommand):
+    help = 'Carga en la base de datos los eventos de auditoría del spool (AUDIT_SINK=spool o volcados fallidos)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--directory', default=settings.AUDIT_SPOOL_DIR,
+                            help='Directorio del spool')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Eventos por INSERT')
+
+    def handle(self, *args, **options):
+        loaded = ingest_spool(options['directory'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{loaded} eventos de auditoría cargados.'))
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tfg_ctaima_app.log_partitions import (
+    ensure_partitions, apply_retention, list_partitions, default_partition_rows, DEFAULT_PARTITION,
+)
+
+
+class Command(BaseCommand):
+    help = ('Crea las particiones mensuales futuras de la tabla de logs y archiva las que superan '
+            'la retención. Pensado para ejecutarse a diario desde el planificador.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=settings.LOG_PARTITION_MONTHS_AHEAD,
+                            help='Meses futuros para los que debe existir partición')
+        parser.add_argument('--retention-months', type=int, default=settings.LOG_RETENTION_MONTHS,
+                            help='Meses completos a conservar además del actual')
+        parser.add_argument('--no-archive', action='store_true',
+                            help='Elimina las particiones caducadas sin exportarlas')
+        parser.add_argument('--skip-retention', action='store_true',
+                            help='Solo crea particiones, no aplica la retención')
+
+    def handle(self, *args, **options):
+        created = ensure_partitions(options['months_ahead'])
+        self.stdout.write(f"Particiones creadas: {', '.join(created) or 'ninguna'}")
+
+        if not options['skip_retention']:
+            for partition in apply_retention(options['retention_months'], archive=not options['no_archive']):
+                archive = f" -> {partition['archive']} ({partition['rows']} filas)" if partition['archive'] else ''
+                self.stdout.write(f"Partición retirada: {partition['partition']}{archive}")
+
+        # Filas que siguen en la partición por defecto (p. ej. insertadas
+        # mientras se ejecutaba el comando): la retención no las alcanza
+        rows = default_partition_rows()
+        if rows:
+            self.stderr.write(self.style.WARNING(
+                f"La partición '{DEFAULT_PARTITION}' contiene {rows} filas; "
+                f"vuelve a ejecutar el comando para moverlas a su partición mensual."
+            ))
+
+        partitions = list_partitions()
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(partitions)} particiones mensuales "
+            f"({partitions[0][0]} ... {partitions[-1][0]})." if partitions else "Sin particiones mensuales."
+        ))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tfg_ctaima_app.validation_summary import rebuild_daily_stats, rebuild_validation_summaries
+
+
+class Command(BaseCommand):
+    help = 'Recalcula desde cero el acumulado diario de validaciones (ValidationDailyStats) del dashboard'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--with-summaries', action='store_true',
+                            help='Reconstruye antes ValidationSummary (como refresh_validation_summaries)')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Validaciones por sentencia al reconstruir ValidationSummary')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options['with_summaries']:
+            total = rebuild_validation_summaries(batch_size=options['batch_size'])
+            self.stdout.write(f'{total} resúmenes de validación sincronizados.')
+        rows = rebuild_daily_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'Acumulado diario recalculado: {rows} filas en {time.perf_counter() - start:.1f} s.'
+        ))
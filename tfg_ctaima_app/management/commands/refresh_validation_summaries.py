@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tfg_ctaima_app.validation_summary import rebuild_validation_summaries
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye ValidationSummary (historial de validaciones) a partir de las validaciones y sus documentos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Validaciones por sentencia')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        total = rebuild_validation_summaries(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} resúmenes de validación sincronizados en {time.perf_counter() - start:.1f} s.'
+        ))
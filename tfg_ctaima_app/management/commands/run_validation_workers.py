@@ -0,0 +1,37 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tfg_ctaima_app.validation_jobs import ValidationWorkerPool
+
+
+class Command(BaseCommand):
+    help = 'Arranca el pool de workers que procesa la cola de validaciones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.VALIDATION_WORKERS,
+                            help='Número de hilos worker')
+        parser.add_argument('--poll-interval', type=float, default=settings.VALIDATION_JOB_POLL_INTERVAL,
+                            help='Segundos de espera cuando la cola está vacía')
+        parser.add_argument('--once', action='store_true',
+                            help='Procesa la cola (y las subidas pendientes) hasta vaciarla y termina')
+
+    def handle(self, *args, **options):
+        pool = ValidationWorkerPool(workers=options['workers'], poll_interval=options['poll_interval'])
+
+        if options['once']:
+            processed = pool.drain()
+            self.stdout.write(self.style.SUCCESS(f'{processed} trabajos procesados.'))
+            return
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+
+        pool.start()
+        self.stdout.write(self.style.SUCCESS(f'Pool de validación iniciado con {pool.workers} workers.'))
+        stop.wait()
+        self.stdout.write('Deteniendo workers...')
+        pool.stop()
@@ -0,0 +1,49 @@
+import re
+
+from django.db import migrations
+
+# Formato de 'details' escrito por log_event:
+#   User '<usuario>' performed 'EventType.<EVENTO>' on '<id o nombre>'.
+DETAILS_PATTERN = re.compile(r"performed '[^']*' on '(?P<target>[^']*)'\.?$")
+
+BATCH_SIZE = 2000
+
+
+def entity_type_for_event(event):
+    name = (event or '').removeprefix('EventType.')
+    if name in ('LOGIN', 'LOGOUT'):
+        return 'user'
+    if '_' not in name:
+        return None
+    return name.split('_', 1)[1].lower()
+
+
+def backfill_log_entity_fields(apps, schema_editor):
+    Log = apps.get_model('tfg_ctaima_app', 'Log')
+    pending = []
+    queryset = Log.objects.filter(entity_type__isnull=True).only('id', 'user_id', 'event', 'details')
+    for log in queryset.iterator(chunk_size=BATCH_SIZE):
+        log.entity_type = entity_type_for_event(log.event)
+        if log.entity_type == 'user' and log.event.endswith(('LOGIN', 'LOGOUT')):
+            log.entity_id = str(log.user_id) if log.user_id else None
+        else:
+            match = DETAILS_PATTERN.search(log.details or '')
+            target = match.group('target') if match else None
+            log.entity_id = target if target and target != 'N/A' else None
+        pending.append(log)
+        if len(pending) >= BATCH_SIZE:
+            Log.objects.bulk_update(pending, ['entity_type', 'entity_id'])
+            pending = []
+    if pending:
+        Log.objects.bulk_update(pending, ['entity_type', 'entity_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tfg_ctaima_app', '0028_log_entity_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_log_entity_fields, migrations.RunPython.noop),
+    ]
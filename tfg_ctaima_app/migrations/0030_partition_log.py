@@ -0,0 +1,147 @@
+# Convierte tfg_ctaima_app_log en una tabla particionada por mes
+# (particionado declarativo de PostgreSQL). La clave primaria pasa a ser
+# (id, timestamp) porque debe incluir la clave de partición, así que 'id' deja
+# de ser único en la base de datos (solo lo garantiza la secuencia). Django 5.1
+# no admite claves primarias compuestas: el estado del modelo mantiene 'id'
+# como clave primaria, pero sin unique=True, y declara la clave real como
+# restricción con el mismo nombre. Los índices y la clave foránea a auth_user
+# se leen del catálogo antes de recrear la tabla, con sus nombres originales.
+# Las particiones futuras y la retención se gestionan con el comando
+# manage_log_partitions.
+
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+
+TABLE = 'tfg_ctaima_app_log'
+MONTHS_AHEAD = 3
+
+COLUMNS = 'id, event, details, "timestamp", user_id, entity_type, entity_id, payload'
+
+
+def table_definitions(cursor):
+    """
+    Índices (salvo la clave primaria) y claves foráneas de la tabla, tal y
+    como están en el catálogo, para recrearlos con el mismo nombre.
+
+    Returns:
+        tuple[list[str], list[str]]: Sentencias de índices y de claves foráneas
+    """
+    cursor.execute(
+        'SELECT pg_get_indexdef(indexrelid) FROM pg_index WHERE indrelid = %s::regclass AND NOT indisprimary',
+        [TABLE],
+    )
+    # Los índices de una tabla particionada se crean "ON ONLY" la tabla padre
+    indexes = [row[0].replace(' ON ONLY ', ' ON ') for row in cursor.fetchall()]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+        [TABLE],
+    )
+    foreign_keys = [f'ALTER TABLE {TABLE} ADD CONSTRAINT "{name}" {definition}' for name, definition in cursor.fetchall()]
+    return indexes, foreign_keys
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_table(apps, schema_editor):
+    execute = schema_editor.execute
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT MIN("timestamp") FROM {TABLE}')
+        oldest = cursor.fetchone()[0]
+        indexes, foreign_keys = table_definitions(cursor)
+
+    now = datetime.now(timezone.utc)
+    current = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    month = (oldest.astimezone(timezone.utc) if oldest else now).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+
+    execute(f'ALTER TABLE {TABLE} RENAME TO {TABLE}_unpartitioned')
+    execute(f'CREATE SEQUENCE {TABLE}_partitioned_id_seq')
+    execute(f'''
+        CREATE TABLE {TABLE} (
+            id integer NOT NULL DEFAULT nextval('{TABLE}_partitioned_id_seq'),
+            event varchar(255) NOT NULL,
+            details text NULL,
+            "timestamp" timestamp with time zone NOT NULL,
+            user_id integer NULL,
+            entity_type varchar(50) NULL,
+            entity_id varchar(64) NULL,
+            payload jsonb NULL
+        ) PARTITION BY RANGE ("timestamp")
+    ''')
+    execute(f'ALTER SEQUENCE {TABLE}_partitioned_id_seq OWNED BY {TABLE}.id')
+
+    last = add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        following = add_months(month, 1)
+        execute(
+            f'CREATE TABLE {TABLE}_p{month:%Y_%m} PARTITION OF {TABLE} '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+    execute(f'CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT')
+
+    execute(f'INSERT INTO {TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {TABLE}_unpartitioned')
+    execute(f"SELECT setval('{TABLE}_partitioned_id_seq', COALESCE(MAX(id), 0) + 1, false) FROM {TABLE}")
+    execute(f'DROP TABLE {TABLE}_unpartitioned')
+    execute(f'ALTER SEQUENCE {TABLE}_partitioned_id_seq RENAME TO {TABLE}_id_seq')
+
+    execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, "timestamp")')
+    for statement in foreign_keys + indexes:
+        execute(statement)
+
+
+def unpartition_table(apps, schema_editor):
+    execute = schema_editor.execute
+    with schema_editor.connection.cursor() as cursor:
+        indexes, foreign_keys = table_definitions(cursor)
+
+    execute(f'ALTER TABLE {TABLE} RENAME TO {TABLE}_partitioned')
+    execute(f'''
+        CREATE TABLE {TABLE} (
+            id integer NOT NULL GENERATED BY DEFAULT AS IDENTITY,
+            event varchar(255) NOT NULL,
+            details text NULL,
+            "timestamp" timestamp with time zone NOT NULL,
+            user_id integer NULL,
+            entity_type varchar(50) NULL,
+            entity_id varchar(64) NULL,
+            payload jsonb NULL
+        )
+    ''')
+    execute(f'INSERT INTO {TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {TABLE}_partitioned')
+    execute(f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {TABLE}")
+    execute(f'DROP TABLE {TABLE}_partitioned CASCADE')
+    execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id)')
+    for statement in foreign_keys + indexes:
+        execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tfg_ctaima_app', '0029_backfill_log_entity_fields'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(partition_table, unpartition_table),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='log',
+                    name='id',
+                    field=models.AutoField(primary_key=True, serialize=False),
+                ),
+                migrations.AddConstraint(
+                    model_name='log',
+                    constraint=models.UniqueConstraint(fields=('id', 'timestamp'), name='tfg_ctaima_app_log_pkey'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tfg_ctaima_app', '0030_partition_log'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['-timestamp', '-id'], name='document_timestamp_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(fields=['-timestamp', '-id'], name='resource_timestamp_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='validation',
+            index=models.Index(fields=['-timestamp', '-id'], name='validation_timestamp_id_idx'),
+        ),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:46
+
+# Los índices compuestos se crean con CREATE INDEX CONCURRENTLY y, una vez
+# creados, se eliminan (también de forma concurrente) los índices simples de
+# las claves foráneas a los que sustituyen, para no bloquear las escrituras
+# en document y validation ni quedarse sin índice entre medias. Por eso la
+# migración no es atómica. Los nombres de los índices de las claves foráneas
+# se leen del catálogo.
+
+import django.db.models.deletion
+import tfg_ctaima_app.models
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+FOREIGN_KEY_INDEXES = [
+    ('document', 'company'),
+    ('document', 'document_type'),
+    ('document', 'resource'),
+    ('validation', 'document'),
+    ('validation', 'user'),
+]
+
+
+def drop_foreign_key_indexes(apps, schema_editor):
+    for model_name, field_name in FOREIGN_KEY_INDEXES:
+        model = apps.get_model('tfg_ctaima_app', model_name)
+        column = model._meta.get_field(field_name).column
+        for name in schema_editor._constraint_names(model, [column], index=True):
+            schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}')
+
+
+def create_foreign_key_indexes(apps, schema_editor):
+    for model_name, field_name in FOREIGN_KEY_INDEXES:
+        model = apps.get_model('tfg_ctaima_app', model_name)
+        column = model._meta.get_field(field_name).column
+        name = schema_editor._create_index_name(model._meta.db_table, [column], suffix='')
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {schema_editor.quote_name(name)} '
+            f'ON {schema_editor.quote_name(model._meta.db_table)} ({schema_editor.quote_name(column)})'
+        )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tfg_ctaima_app', '0032_search_vectors'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='document',
+            index=models.Index(fields=['company', '-timestamp', '-id'], name='document_company_ts_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='document',
+            index=models.Index(fields=['resource', '-timestamp', '-id'], name='document_resource_ts_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='document',
+            index=models.Index(fields=['document_type', '-timestamp', '-id'], name='document_type_ts_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='validation',
+            index=models.Index(fields=['status', '-timestamp', '-id'], name='validation_status_ts_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='validation',
+            index=models.Index(fields=['document', '-timestamp', '-id'], name='validation_document_ts_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='validation',
+            index=models.Index(fields=['user', '-timestamp', '-id'], name='validation_user_ts_idx'),
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(drop_foreign_key_indexes, create_foreign_key_indexes),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='document',
+                    name='company',
+                    field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='tfg_ctaima_app.company'),
+                ),
+                migrations.AlterField(
+                    model_name='document',
+                    name='document_type',
+                    field=models.ForeignKey(db_index=False, default=tfg_ctaima_app.models.default_document_type, on_delete=django.db.models.deletion.SET_DEFAULT, to='tfg_ctaima_app.documenttype'),
+                ),
+                migrations.AlterField(
+                    model_name='document',
+                    name='resource',
+                    field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='tfg_ctaima_app.resource'),
+                ),
+                migrations.AlterField(
+                    model_name='validation',
+                    name='document',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='tfg_ctaima_app.document'),
+                ),
+                migrations.AlterField(
+                    model_name='validation',
+                    name='user',
+                    field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tfg_ctaima_app', '0033_composite_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ValidationSummary',
+            fields=[
+                ('validation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='tfg_ctaima_app.validation')),
+                ('document_id', models.UUIDField()),
+                ('document_name', models.CharField(max_length=255)),
+                ('document_type_id', models.IntegerField(null=True)),
+                ('document_type_name', models.CharField(max_length=100, null=True)),
+                ('company_id', models.UUIDField(null=True)),
+                ('resource_id', models.UUIDField(null=True)),
+                ('user_id', models.IntegerField(null=True)),
+                ('status', models.CharField(max_length=10)),
+                ('timestamp', models.DateTimeField()),
+                ('fields_passed', models.PositiveIntegerField(default=0)),
+                ('fields_failed', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Validation Summary',
+                'verbose_name_plural': 'Validation Summaries',
+                'indexes': [models.Index(fields=['-timestamp', '-validation'], name='vsummary_timestamp_idx'), models.Index(fields=['status', '-timestamp', '-validation'], name='vsummary_status_ts_idx'), models.Index(fields=['company_id', '-timestamp', '-validation'], name='vsummary_company_ts_idx'), models.Index(fields=['resource_id', '-timestamp', '-validation'], name='vsummary_resource_ts_idx'), models.Index(fields=['document_type_id', '-timestamp', '-validation'], name='vsummary_type_ts_idx'), models.Index(fields=['document_id', '-timestamp', '-validation'], name='vsummary_document_ts_idx'), models.Index(fields=['user_id', '-timestamp', '-validation'], name='vsummary_user_ts_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:50
+
+from django.db import migrations, models
+
+
+def backfill_daily_stats(apps, schema_editor):
+    # El acumulado nace con las validaciones existentes (REBUILD_STATS_SQL):
+    # el dashboard lo lee en cuanto los filtros lo permiten.
+    from tfg_ctaima_app.validation_summary import rebuild_daily_stats
+
+    rebuild_daily_stats()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tfg_ctaima_app', '0034_validation_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ValidationDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('document_type_id', models.IntegerField(null=True)),
+                ('company_id', models.UUIDField(null=True)),
+                ('status', models.CharField(max_length=10)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Validation Daily Stats',
+                'verbose_name_plural': 'Validation Daily Stats',
+                'constraints': [models.UniqueConstraint(fields=('day', 'document_type_id', 'company_id', 'status'), name='validationdailystats_key', nulls_distinct=False)],
+            },
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
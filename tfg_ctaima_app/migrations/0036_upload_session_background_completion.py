@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-18 21:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tfg_ctaima_app', '0035_validation_daily_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadsession',
+            name='duplicate',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='uploadsession',
+            name='error',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='uploadsession',
+            name='status',
+            field=models.CharField(choices=[('active', 'Active'), ('completing', 'Completing'), ('assembling', 'Assembling'), ('completed', 'Completed'), ('aborted', 'Aborted')], default='active', max_length=10),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.4 on 2026-10-18 21:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tfg_ctaima_app', '0036_upload_session_background_completion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkerMetrics',
+            fields=[
+                ('process', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('metrics', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Worker Metrics',
+                'verbose_name_plural': 'Worker Metrics',
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Rellena ValidationSummary (0034) con las validaciones existentes, por lotes
+# de ids con el mismo upsert que las mantiene (validation_summary.py), para
+# que el historial (/api/validation/history/) las muestre desde el primer
+# momento. El upsert también suma al acumulado diario las validaciones que
+# aún no tenían resumen, y 0035 ya lo había rellenado con ellas, así que al
+# terminar se recalcula desde cero.
+#
+# No es atómica: cada lote se confirma por separado y una tabla grande no
+# queda bloqueada durante toda la migración. Si se interrumpe, volver a
+# ejecutarla es seguro (el upsert es idempotente).
+
+from django.db import migrations
+
+BATCH_SIZE = 5000
+
+
+def backfill_validation_summaries(apps, schema_editor):
+    from tfg_ctaima_app.validation_summary import rebuild_daily_stats, rebuild_validation_summaries
+
+    rebuild_validation_summaries(batch_size=BATCH_SIZE)
+    rebuild_daily_stats()
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tfg_ctaima_app', '0037_worker_metrics'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_validation_summaries, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,28 @@ from django.contrib.auth.models import User  # Importar el modelo User de Django
 import uuid
 from enum import Enum
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db.models.functions import Cast
+
+# Configuración de texto de las columnas de búsqueda: 'simple' no aplica
+# stemming ni stopwords, así que sirve igual para nombres, CIF o matrículas.
+SEARCH_CONFIG = 'simple'
+
+
+def search_vector_field(*weighted_fields):
+    """
+    Columna tsvector generada y almacenada por PostgreSQL a partir de los
+    campos indicados, para la búsqueda por texto (ver search.py).
+
+    Args:
+        weighted_fields: Pares (campo o expresión, peso 'A'-'D')
+    """
+    vectors = [SearchVector(field, weight=weight, config=SEARCH_CONFIG) for field, weight in weighted_fields]
+    expression = vectors[0]
+    for vector in vectors[1:]:
+        expression = expression + vector
+    return models.GeneratedField(expression=expression, output_field=SearchVectorField(), db_persist=True)
 
 class EventType(Enum):
     CREATE_DOCUMENT = 'CREATE_DOCUMENT'
@@ -42,6 +64,13 @@ class EventType(Enum):
     CREATE_VEHICLE = 'CREATE_VEHICLE'
     UPDATE_VEHICLE = 'UPDATE_VEHICLE'
     DELETE_VEHICLE = 'DELETE_VEHICLE'
+
+    @property
+    def entity_type(self):
+        """Tipo de entidad afectada: CREATE_DOCUMENT_TYPE -> 'document_type'."""
+        if self.name in ('LOGIN', 'LOGOUT'):
+            return 'user'
+        return self.name.split('_', 1)[1].lower()
     
 
 
@@ -61,11 +90,15 @@ class Company(models.Model):
     phone = models.CharField(max_length=20, null=True, blank=True)
     language = models.CharField(max_length=50, null=True, blank=True)
     timestamp = models.DateTimeField(auto_now_add=True)
+    search_vector = search_vector_field(('company_name', 'A'), ('company_id', 'A'))
 
     class Meta:
         ordering = ['company_name', 'company_id']  # Define el orden por defecto
         verbose_name = "Company"
         verbose_name_plural = "Companies"
+        indexes = [
+            GinIndex(fields=['search_vector'], name='company_search_idx'),
+        ]
 
     def __str__(self):
         return self.company_name
@@ -87,6 +120,10 @@ class Resource(models.Model):
         verbose_name = "Resource"
         verbose_name_plural = "Resources"
         abstract = False  # No es una clase abstracta, por lo que Django creará una tabla para esta clase.
+        indexes = [
+            # Listados por fecha y paginación por cursor sobre (timestamp, id)
+            models.Index(fields=['-timestamp', '-id'], name='resource_timestamp_id_idx'),
+        ]
 
 class Vehicle(Resource):
     name = models.CharField(max_length=255)
@@ -94,6 +131,12 @@ class Vehicle(Resource):
     manufacturer = models.CharField(max_length=100, blank=True, null=True)
     model = models.CharField(max_length=100, blank=True, null=True)
     weight = models.FloatField(blank=True, null=True)
+    search_vector = search_vector_field(('name', 'A'), ('registration_id', 'A'))
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='vehicle_search_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -106,6 +149,12 @@ class Employee(Resource):
     phone = models.CharField(max_length=25, blank=True, null=True)
     country = models.CharField(max_length=100)
     worker_id = models.CharField(max_length=50)
+    search_vector = search_vector_field(('first_name', 'A'), ('last_name', 'A'), ('worker_id', 'A'))
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='employee_search_idx'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -161,14 +210,29 @@ class FieldToExtract(models.Model):
 
 class Document(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    resource = models.ForeignKey(Resource, on_delete=models.CASCADE, null=True, blank=True)
-    company = models.ForeignKey(Company, on_delete=models.CASCADE, null=True, blank=True)
+    # Sin índice propio: lo cubren los índices compuestos de Meta.indexes
+    resource = models.ForeignKey(Resource, on_delete=models.CASCADE, null=True, blank=True, db_index=False)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, null=True, blank=True, db_index=False)
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)  # Usar el modelo User de Django
-    document_type = models.ForeignKey(DocumentType, on_delete=models.SET_DEFAULT, default=default_document_type)
+    document_type = models.ForeignKey(DocumentType, on_delete=models.SET_DEFAULT, default=default_document_type,
+                                      db_index=False)
     name = models.CharField(max_length=255)
     url = models.URLField(max_length=500)
     timestamp = models.DateTimeField(default=timezone.now)
     file_hash = models.CharField(max_length=500, unique=True, blank=True, null=True)
+    search_vector = search_vector_field(('name', 'A'), (Cast('id', models.TextField()), 'B'))
+
+    class Meta:
+        indexes = [
+            # Listados por fecha y paginación por cursor sobre (timestamp, id)
+            models.Index(fields=['-timestamp', '-id'], name='document_timestamp_id_idx'),
+            # Documentos de una compañía, recurso o tipo por fecha (filtros
+            # de los listados y de las validaciones vía document__*)
+            models.Index(fields=['company', '-timestamp', '-id'], name='document_company_ts_idx'),
+            models.Index(fields=['resource', '-timestamp', '-id'], name='document_resource_ts_idx'),
+            models.Index(fields=['document_type', '-timestamp', '-id'], name='document_type_ts_idx'),
+            GinIndex(fields=['search_vector'], name='document_search_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.document_type.name}"
@@ -182,24 +246,231 @@ class Validation(models.Model):
         ('failure', 'Failure'),
     ]
 
-    document = models.ForeignKey(Document, on_delete=models.CASCADE)
-    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)  # Usar el modelo User de Django
+    # Sin índice propio: lo cubren los índices compuestos de Meta.indexes
+    document = models.ForeignKey(Document, on_delete=models.CASCADE, db_index=False)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, db_index=False)  # Usar el modelo User de Django
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     validation_details = models.JSONField()  
     justification = models.TextField(blank=True, null=True)
     timestamp = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            # Listados por fecha y paginación por cursor sobre (timestamp, id)
+            models.Index(fields=['-timestamp', '-id'], name='validation_timestamp_id_idx'),
+            # Filtros de ValidationFilter con la ordenación del listado
+            models.Index(fields=['status', '-timestamp', '-id'], name='validation_status_ts_idx'),
+            models.Index(fields=['document', '-timestamp', '-id'], name='validation_document_ts_idx'),
+            models.Index(fields=['user', '-timestamp', '-id'], name='validation_user_ts_idx'),
+        ]
+
     def __str__(self):
         return f"Validation for {self.document.name} - Status: {self.status}"
 
+
+class ValidationSummary(models.Model):
+    """
+    Fila estrecha por validación para el historial: copia los datos del
+    documento y de su tipo que se filtran y muestran en el listado, de modo
+    que este no necesita joins. La mantiene validation_summary.py al
+    escribir validaciones, documentos o tipos; el comando
+    refresh_validation_summaries la reconstruye (la migración 0038 la rellena
+    con las validaciones existentes).
+    """
+    validation = models.OneToOneField(Validation, on_delete=models.CASCADE, primary_key=True, related_name='summary')
+    document_id = models.UUIDField()
+    document_name = models.CharField(max_length=255)
+    document_type_id = models.IntegerField(null=True)
+    document_type_name = models.CharField(max_length=100, null=True)
+    company_id = models.UUIDField(null=True)
+    resource_id = models.UUIDField(null=True)
+    user_id = models.IntegerField(null=True)
+    status = models.CharField(max_length=10)
+    timestamp = models.DateTimeField()
+    # Campos a validar que coinciden / no coinciden con el valor esperado
+    fields_passed = models.PositiveIntegerField(default=0)
+    fields_failed = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Validation Summary"
+        verbose_name_plural = "Validation Summaries"
+        indexes = [
+            # Mismos filtros y ordenación que el historial
+            models.Index(fields=['-timestamp', '-validation'], name='vsummary_timestamp_idx'),
+            models.Index(fields=['status', '-timestamp', '-validation'], name='vsummary_status_ts_idx'),
+            models.Index(fields=['company_id', '-timestamp', '-validation'], name='vsummary_company_ts_idx'),
+            models.Index(fields=['resource_id', '-timestamp', '-validation'], name='vsummary_resource_ts_idx'),
+            models.Index(fields=['document_type_id', '-timestamp', '-validation'], name='vsummary_type_ts_idx'),
+            models.Index(fields=['document_id', '-timestamp', '-validation'], name='vsummary_document_ts_idx'),
+            models.Index(fields=['user_id', '-timestamp', '-validation'], name='vsummary_user_ts_idx'),
+        ]
+
+    def __str__(self):
+        return f"Summary of validation {self.validation_id} ({self.status})"
+
+
+class ValidationDailyStats(models.Model):
+    """
+    Número de validaciones por día (en TIME_ZONE), tipo de documento,
+    compañía y estado para los indicadores del dashboard. Se actualiza por
+    incrementos junto con ValidationSummary (validation_summary.py); la
+    migración que la crea la rellena con las validaciones existentes y el
+    comando rebuild_stats la recalcula entera.
+    """
+    day = models.DateField()
+    document_type_id = models.IntegerField(null=True)
+    company_id = models.UUIDField(null=True)
+    status = models.CharField(max_length=10)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Validation Daily Stats"
+        verbose_name_plural = "Validation Daily Stats"
+        constraints = [
+            # NULL cuenta como un valor más para que el upsert encuentre la fila
+            models.UniqueConstraint(fields=['day', 'document_type_id', 'company_id', 'status'],
+                                    name='validationdailystats_key', nulls_distinct=False),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.document_type_id} {self.company_id} {self.status}: {self.count}"
+
 class Log(models.Model):
-    id = models.AutoField(primary_key=True, unique=True)
+    # La tabla está particionada por mes (migración 0030): la clave primaria
+    # real es (id, timestamp) y la unicidad de 'id' solo la da la secuencia.
+    id = models.AutoField(primary_key=True)
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)  # Usar el modelo User de Django
     event = models.CharField(max_length=255)
     details = models.TextField(blank=True, null=True)
     timestamp = models.DateTimeField(default=timezone.now)
+    # Entidad afectada por el evento, para buscar sus logs por índice
+    entity_type = models.CharField(max_length=50, blank=True, null=True)
+    entity_id = models.CharField(max_length=64, blank=True, null=True)
+    payload = models.JSONField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['entity_type', 'entity_id', '-timestamp'], name='log_entity_idx'),
+            models.Index(fields=['event', '-timestamp'], name='log_event_idx'),
+            models.Index(fields=['-timestamp'], name='log_timestamp_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['id', 'timestamp'], name='tfg_ctaima_app_log_pkey'),
+        ]
 
     def __str__(self):
         return f"Log {self.timestamp}: {self.event}"
 
 
+
+class ValidationJob(models.Model):
+    """
+    Trabajo de validación pendiente de ejecutar contra el endpoint externo.
+    La propia tabla actúa como cola: los workers reclaman filas con
+    SELECT ... FOR UPDATE SKIP LOCKED, sin necesidad de un broker externo.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    validation = models.OneToOneField(Validation, on_delete=models.CASCADE, related_name='job')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    request_details = models.JSONField()
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, null=True)
+    worker = models.CharField(max_length=255, blank=True, null=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = "Validation Job"
+        verbose_name_plural = "Validation Jobs"
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='validationjob_status_avail_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job {self.id} ({self.status}) for validation {self.validation_id}"
+
+
+class WorkerMetrics(models.Model):
+    """
+    Última instantánea de las métricas del cliente del servicio de
+    validación de cada proceso worker. Las llamadas al servicio solo se hacen
+    en los workers, así que cada uno publica aquí sus contadores cada cierto
+    tiempo y la vista de métricas los agrega.
+    """
+    process = models.CharField(max_length=255, primary_key=True)  # host:pid
+    metrics = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Worker Metrics"
+        verbose_name_plural = "Worker Metrics"
+
+    def __str__(self):
+        return f"Metrics of {self.process} at {self.updated_at}"
+
+
+class UploadSession(models.Model):
+    """
+    Subida por partes de un documento grande. Cada parte se sube como un
+    bloque sin confirmar de un blob temporal. Al completar la sesión pasa a
+    'completing' y un worker la reclama ('assembling'): confirma la lista de
+    bloques, calcula el hash y crea el documento.
+    """
+    STATUS_CHOICES = [
+        ('active', 'Active'),
+        ('completing', 'Completing'),
+        ('assembling', 'Assembling'),
+        ('completed', 'Completed'),
+        ('aborted', 'Aborted'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    part_size = models.PositiveIntegerField()
+    staging_name = models.CharField(max_length=500)
+    # document_type, company, resource y associated_entities del documento
+    metadata = models.JSONField(default=dict)
+    # {"<número de parte>": {"size": ..., "sha256": ...}} de las partes recibidas
+    parts = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='active')
+    document = models.ForeignKey(Document, on_delete=models.SET_NULL, null=True, blank=True)
+    # El contenido ya existía: document es el documento existente
+    duplicate = models.BooleanField(default=False)
+    # Último error al completar la subida (la sesión vuelve a 'active')
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Upload Session"
+        verbose_name_plural = "Upload Sessions"
+        indexes = [
+            models.Index(fields=['status', 'expires_at'], name='uploadsession_status_exp_idx'),
+        ]
+
+    @property
+    def total_parts(self):
+        return max(1, -(-self.size // self.part_size))
+
+    def part_length(self, part_number):
+        """Tamaño esperado de la parte part_number (numeradas desde 1)."""
+        if part_number < self.total_parts:
+            return self.part_size
+        return self.size - self.part_size * (self.total_parts - 1)
+
+    def __str__(self):
+        return f"Upload {self.id} ({self.status}) of {self.filename}"
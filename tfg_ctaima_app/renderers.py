@@ -1,7 +1,13 @@
 # app1/renderers.py
 # se usa para asegurarnos que los documentos lleguen al usuario sin ser alterados. Y que el usuario final en el frontend pueda descargar el documento sin problemas.
 
-from rest_framework.renderers import BaseRenderer
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+# orjson es opcional: sin él FastJSONRenderer se comporta como JSONRenderer
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 class NoOpRenderer(BaseRenderer):
     """
@@ -13,3 +19,37 @@ class NoOpRenderer(BaseRenderer):
 
     def render(self, data, accepted_media_type=None, renderer_context=None):
         return data
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer que serializa con orjson si está instalado. orjson recorre
+    en C los dict (también los OrderedDict/ReturnDict de los serializers) y
+    las listas, y convierte de forma nativa UUID y datetime (ISO 8601 con
+    microsegundos y 'Z' en UTC); el resto de tipos (Decimal, textos
+    traducibles, QuerySet...) pasan por el encoder de DRF.
+
+    Sin orjson, o si se pide salida indentada (API navegable, 'indent' en el
+    Accept), delega en JSONRenderer.
+
+    Diferencias con JSONRenderer (UUID, datetime, Decimal y claves no
+    textuales salen igual):
+    - NaN e Infinity se escriben como null; JSONRenderer lanza ValueError.
+    - Los enteros de más de 64 bits lanzan TypeError; JSONRenderer los
+      escribe.
+    - Los float con exponente se escriben sin '+' (1e300 en vez de 1e+300).
+    Por eso solo se usa si FAST_JSON_RENDERER está activado.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default,
+                           option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+        # Igual que JSONRenderer: U+2028 y U+2029 escapados para poder incrustar la respuesta en JavaScript
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
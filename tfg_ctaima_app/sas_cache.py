@@ -0,0 +1,154 @@
+# tfg_ctaima_app/sas_cache.py
+# Caché de tokens SAS. Firmar un token es barato pero no gratis, y los
+# documentos más usados (validaciones por lotes, dashboards, descargas) se
+# firmaban en cada petición. La caché guarda el token por blob, permisos y
+# duración pedida, y lo reutiliza mientras le quede suficiente vida. Es una
+# LRU en memoria del proceso y, opcionalmente, se comparte entre procesos a
+# través del framework de caché de Django (SAS_CACHE_ALIAS).
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class SasTokenCache:
+    """
+    LRU de tokens SAS con expiración.
+
+    Args:
+        max_entries (int): Tokens máximos en memoria
+        min_remaining_ratio (float): Fracción de la duración pedida que debe
+            quedarle a un token para reutilizarlo
+        shared_cache_alias (str): Alias de CACHES para compartir los tokens
+            entre procesos (opcional)
+    """
+
+    def __init__(self, max_entries=10000, min_remaining_ratio=0.5, shared_cache_alias=None):
+        self.max_entries = max_entries
+        self.min_remaining_ratio = min_remaining_ratio
+        self.shared_cache_alias = shared_cache_alias
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_metrics()
+
+    def reset_metrics(self):
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def shared_cache(self):
+        return caches[self.shared_cache_alias] if self.shared_cache_alias else None
+
+    def get_or_create(self, key, lifetime, factory):
+        """
+        Devuelve un token vigente para key o lo genera con factory.
+
+        Args:
+            key (tuple): Blob, permisos y cabeceras fijadas en el token
+            lifetime (float): Segundos de validez pedidos
+            factory (callable): Recibe la fecha de expiración (epoch) y
+                devuelve un token nuevo
+
+        Returns:
+            str: Token SAS
+        """
+        return self.get_or_create_entry(key, lifetime, factory)[0]
+
+    def get_or_create_entry(self, key, lifetime, factory):
+        """
+        Como get_or_create, pero devuelve también la expiración real del
+        token, que en un token reutilizado es anterior a now + lifetime.
+
+        Returns:
+            tuple[str, float]: Token SAS y fecha de expiración (epoch)
+        """
+        key = (*key, lifetime)
+        now = time.time()
+        min_remaining = lifetime * self.min_remaining_ratio
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                token, expires_at = entry
+                if expires_at - now >= min_remaining:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                del self._entries[key]
+
+        shared_key = self._shared_key(key) if self.shared_cache_alias else None
+        if shared_key:
+            entry = self.shared_cache.get(shared_key)
+            if entry is not None and entry[1] - now >= min_remaining:
+                self._store(key, entry)
+                with self._lock:
+                    self.shared_hits += 1
+                return entry
+
+        expires_at = now + lifetime
+        entry = (factory(expires_at), expires_at)
+        self._store(key, entry)
+        if shared_key:
+            # Se guarda solo mientras siga siendo reutilizable
+            self.shared_cache.set(shared_key, entry, timeout=max(1, int(lifetime - min_remaining)))
+        with self._lock:
+            self.misses += 1
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round((self.hits + self.shared_hits) * 100 / lookups, 2) if lookups else 0,
+            }
+
+    def _store(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _shared_key(self, key):
+        digest = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+        return f"sas:{settings.ENVIRONMENT}:{digest}"
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_sas_cache():
+    """
+    Devuelve la caché de tokens SAS del proceso, creándola la primera vez.
+
+    Returns:
+        SasTokenCache: Caché configurada desde settings
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SasTokenCache(
+                    max_entries=settings.SAS_CACHE_MAX_ENTRIES,
+                    min_remaining_ratio=settings.SAS_CACHE_MIN_REMAINING_RATIO,
+                    shared_cache_alias=settings.SAS_CACHE_ALIAS,
+                )
+    return _cache
@@ -0,0 +1,89 @@
+# tfg_ctaima_app/search.py
+# Búsqueda por texto sobre las columnas search_vector (tsvector generado por
+# PostgreSQL con índice GIN) de compañías, documentos, empleados y
+# vehículos. Cada palabra buscada se trata como prefijo ('ana lop' encuentra
+# 'Ana López') y todas deben aparecer; los resultados se ordenan por
+# relevancia con ts_rank.
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .models import SEARCH_CONFIG, Employee, Vehicle
+
+SEARCH_RANK = 'search_rank'
+
+# Palabras del texto buscado; el resto de caracteres separa palabras, así
+# que nada del texto llega a la sintaxis de tsquery.
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def build_search_query(text):
+    """
+    Convierte el texto buscado en una tsquery de prefijos.
+
+    Returns:
+        SearchQuery | None: Consulta, o None si el texto no tiene palabras
+    """
+    words = WORD_PATTERN.findall((text or '').lower())
+    if not words:
+        return None
+    return SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config=SEARCH_CONFIG)
+
+
+def order_by_rank(queryset, rank):
+    # La relevancia manda; la ordenación que ya tuviera la consulta desempata
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    return queryset.annotate(**{SEARCH_RANK: rank}).order_by(f'-{SEARCH_RANK}', *ordering)
+
+
+def search_queryset(queryset, text, rank=True, vector='search_vector'):
+    """
+    Filtra una consulta por su columna search_vector.
+
+    Args:
+        queryset (QuerySet): Consulta de un modelo con search_vector
+        text (str): Texto buscado
+        rank (bool): Ordenar por relevancia
+        vector (str): Campo tsvector
+
+    Returns:
+        QuerySet: Consulta filtrada (sin cambios si el texto está vacío)
+    """
+    query = build_search_query(text)
+    if query is None:
+        return queryset
+    queryset = queryset.filter(**{vector: query})
+    return order_by_rank(queryset, SearchRank(F(vector), query)) if rank else queryset
+
+
+def search_resources(queryset, text, rank=True):
+    """
+    Búsqueda de recursos: empleados por nombre, apellidos o worker_id y
+    vehículos por nombre o matrícula. Cada tabla hija se filtra con su
+    propio índice y el recurso se selecciona por id.
+
+    Args:
+        queryset (QuerySet): Consulta de Resource
+        text (str): Texto buscado
+        rank (bool): Ordenar por relevancia
+
+    Returns:
+        QuerySet: Consulta filtrada
+    """
+    query = build_search_query(text)
+    if query is None:
+        return queryset
+    # Sin ordenación en las subconsultas: solo aportan ids
+    employees = Employee.objects.filter(resource_type='employee', search_vector=query).order_by().values('pk')
+    vehicles = Vehicle.objects.filter(resource_type='vehicle', search_vector=query).order_by().values('pk')
+    queryset = queryset.filter(pk__in=employees.union(vehicles))
+    if not rank:
+        return queryset
+    # GREATEST ignora el NULL del tipo de recurso que no corresponde
+    return order_by_rank(queryset, Greatest(
+        SearchRank(F('employee__search_vector'), query),
+        SearchRank(F('vehicle__search_vector'), query),
+    ))
@@ -4,9 +4,11 @@ from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from .models import (
     Company, Resource, Vehicle, Employee, DocumentType,
-    FieldToValidate, FieldToExtract, Document, Validation, Log
+    Document, Validation, ValidationSummary, Log, ValidationJob, UploadSession
 )
 from .utils import calculate_file_hash  # Función que calcula el hash del archivo
+from .document_type_cache import get_document_type_config
+from .uploads import missing_parts
 
 
 # ------------------------------------------------------------------
@@ -81,6 +83,12 @@ class EmployeeDetailsSerializer(serializers.ModelSerializer):
         model = Employee
         fields = ['first_name', 'last_name', 'email', 'phone', 'country', 'worker_id']
 
+# Serializer de los detalles de cada tipo de recurso
+RESOURCE_DETAIL_SERIALIZERS = {
+    'vehicle': VehicleDetailsSerializer,
+    'employee': EmployeeDetailsSerializer,
+}
+
 class ResourceSerializer(serializers.ModelSerializer):
     resource_details = serializers.SerializerMethodField()
 
@@ -89,6 +97,15 @@ class ResourceSerializer(serializers.ModelSerializer):
         fields = ['id', 'resource_type', 'resource_details', 'timestamp']
         # fields = ['id', 'resource_type', 'company', 'resource_details', 'timestamp']
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Carga en la misma consulta el hijo (Employee/Vehicle) que usa
+        get_resource_details.
+        """
+        if queryset.model is Resource:
+            return queryset.select_related('employee', 'vehicle')
+        return queryset
 
     def get_resource_details(self, obj):
         """
@@ -96,17 +113,77 @@ class ResourceSerializer(serializers.ModelSerializer):
         Se asume que el objeto hijo (Vehicle o Employee) está accesible
         mediante el atributo cuyo nombre coincide con el valor de resource_type.
         """
-        serializer_mapping = {
-            'vehicle': VehicleDetailsSerializer,
-            'employee': EmployeeDetailsSerializer
-        }
-        # Se obtiene el objeto hijo (por ejemplo, obj.vehicle o obj.employee)
-        child_instance = getattr(obj, obj.resource_type, None)
+        # Se obtiene el objeto hijo (por ejemplo, obj.vehicle o obj.employee).
+        # En los listados de Employee/Vehicle el objeto ya es el hijo y el
+        # acceso obj.employee haría una consulta por fila.
+        if obj._meta.model_name == obj.resource_type:
+            child_instance = obj
+        else:
+            child_instance = getattr(obj, obj.resource_type, None)
         if child_instance:
-            serializer_class = serializer_mapping.get(obj.resource_type)
+            serializer_class = RESOURCE_DETAIL_SERIALIZERS.get(obj.resource_type)
             return serializer_class(child_instance, context=self.context).data
         return None
 
+class ResourceRowSerializer:
+    """
+    Serialización rápida de listados de recursos. Trabaja sobre filas de
+    values() que traen las columnas de Employee y Vehicle con LEFT JOIN en
+    la misma consulta, y produce la misma salida que ResourceSerializer sin
+    crear un objeto ni un serializer por fila: los campos DRF de cada
+    columna se resuelven una sola vez.
+    """
+
+    def __init__(self):
+        resource_fields = ResourceSerializer().fields
+        self.base_fields = {
+            name: resource_fields[name] for name in ResourceSerializer.Meta.fields if name != 'resource_details'
+        }
+        # Por tipo: columna que indica si existe el hijo y (nombre, columna, campo) de sus detalles
+        self.detail_fields = {
+            resource_type: (
+                f'{resource_type}__pk',
+                [(name, f'{resource_type}__{name}', field) for name, field in serializer_class().fields.items()],
+            )
+            for resource_type, serializer_class in RESOURCE_DETAIL_SERIALIZERS.items()
+        }
+        self.columns = list(self.base_fields)
+        for pk_column, fields in self.detail_fields.values():
+            self.columns += [pk_column, *(column for _, column, _ in fields)]
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def to_representation(self, row):
+        data = {}
+        for name in ResourceSerializer.Meta.fields:
+            if name == 'resource_details':
+                data[name] = self.details(row)
+            else:
+                value = row[name]
+                data[name] = None if value is None else self.base_fields[name].to_representation(value)
+        return data
+
+    def details(self, row):
+        detail = self.detail_fields.get(row['resource_type'])
+        if detail is None or row[detail[0]] is None:
+            return None
+        return {
+            name: None if row[column] is None else field.to_representation(row[column])
+            for name, column, field in detail[1]
+        }
+
+
+_resource_row_serializer = None
+
+
+def get_resource_row_serializer():
+    global _resource_row_serializer
+    if _resource_row_serializer is None:
+        _resource_row_serializer = ResourceRowSerializer()
+    return _resource_row_serializer
+
+
 class VehicleSerializer(ResourceSerializer):
     class Meta(ResourceSerializer.Meta):
         model = Vehicle
@@ -120,19 +197,9 @@ class EmployeeSerializer(ResourceSerializer):
 
 # ------------------------------------------------------------------
 # DOCUMENT TYPE Y CAMPOS RELACIONADOS
-# Se emplea un método auxiliar _serialize_fields para evitar duplicación
-# en la transformación de los campos asociados.
+# Los campos a validar/extraer se leen ya serializados de la caché de
+# configuraciones de tipos de documento (document_type_cache.py).
 # ------------------------------------------------------------------
-class FieldToValidateOutputSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = FieldToValidate
-        fields = ['id', 'name', 'expected_value', 'description']
-
-class FieldToExtractOutputSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = FieldToExtract
-        fields = ['id', 'name', 'description']
-
 class DocumentTypeSerializer(serializers.ModelSerializer):
     fields_to_validate = serializers.SerializerMethodField()
     fields_to_extract = serializers.SerializerMethodField()
@@ -144,23 +211,15 @@ class DocumentTypeSerializer(serializers.ModelSerializer):
             'fields_to_validate', 'fields_to_extract', 'associated_entities'
         ]
 
-    def _serialize_fields(self, queryset, serializer_class):
-        serializer = serializer_class(queryset, many=True)
-        return [
-            {
-                'id': item['id'],
-                'name': item['name'],
-                'description': item['description'],
-                'value': item.get('value', None)
-            }
-            for item in serializer.data
-        ]
+    def _cached_fields(self, obj, key):
+        config = get_document_type_config(obj.pk)
+        return config[key] if config is not None else []
 
     def get_fields_to_validate(self, obj):
-        return self._serialize_fields(obj.fields_to_validate.all(), FieldToValidateOutputSerializer)
+        return self._cached_fields(obj, 'fields_to_validate')
 
     def get_fields_to_extract(self, obj):
-        return self._serialize_fields(obj.fields_to_extract.all(), FieldToExtractOutputSerializer)
+        return self._cached_fields(obj, 'fields_to_extract')
 
 
 # ------------------------------------------------------------------
@@ -195,6 +254,43 @@ class DocumentSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+# ------------------------------------------------------------------
+# UPLOAD SESSION SERIALIZERS
+# Subida por partes reanudable: datos para iniciar la sesión y estado
+# de la sesión (partes recibidas y pendientes) para reanudarla.
+# ------------------------------------------------------------------
+class UploadInitiateSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    part_size = serializers.IntegerField(min_value=1, required=False)
+    document_type = serializers.PrimaryKeyRelatedField(queryset=DocumentType.objects.all(), required=False)
+    company = serializers.PrimaryKeyRelatedField(queryset=Company.objects.all(), required=False)
+    resource = serializers.PrimaryKeyRelatedField(queryset=Resource.objects.all(), required=False)
+    associated_entities = serializers.JSONField(required=False)
+
+    def get_metadata(self):
+        data = self.validated_data
+        metadata = {key: str(data[key].pk) for key in ('document_type', 'company', 'resource') if key in data}
+        if 'associated_entities' in data:
+            metadata['associated_entities'] = data['associated_entities']
+        return metadata
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    total_parts = serializers.IntegerField(read_only=True)
+    missing_parts = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id', 'filename', 'size', 'part_size', 'total_parts', 'parts',
+            'missing_parts', 'status', 'document', 'duplicate', 'error', 'created_at', 'expires_at'
+        ]
+
+    def get_missing_parts(self, obj):
+        return missing_parts(obj)
+
+
 # ------------------------------------------------------------------
 # VALIDATION SERIALIZER
 # La mayor parte de la lógica compleja (como llamadas a APIs externas)
@@ -216,6 +312,93 @@ class ValidationSerializer(serializers.ModelSerializer):
             'validation_details', 'timestamp'
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset, prefix=''):
+        """
+        Plan de carga que cubre los campos anidados del serializer: documento
+        con su tipo, recurso y compañía en la misma consulta. Los campos del
+        tipo de documento salen de la caché de configuraciones.
+
+        Args:
+            queryset (QuerySet): Consulta a la que añadir la carga
+            prefix (str): Ruta hasta la validación cuando el serializer va
+                anidado (p. ej. 'validation__')
+        """
+        return queryset.select_related(
+            f'{prefix}document__document_type', f'{prefix}document__resource', f'{prefix}document__company'
+        )
+
+
+
+# ------------------------------------------------------------------
+# VALIDATION SUMMARY SERIALIZER
+# Filas del historial de validaciones (ValidationSummary). Los nombres
+# coinciden con los de ValidationSerializer salvo company_id (allí
+# 'company' es el nombre); el detalle completo se pide aparte a
+# /api/validation/<id>/.
+# ------------------------------------------------------------------
+class ValidationSummarySerializer(serializers.ModelSerializer):
+    id = serializers.UUIDField(source='validation_id', read_only=True)
+    document = serializers.UUIDField(source='document_id', read_only=True)
+    document_type = serializers.IntegerField(source='document_type_id', read_only=True)
+    user = serializers.IntegerField(source='user_id', read_only=True)
+
+    class Meta:
+        model = ValidationSummary
+        fields = [
+            'id', 'document', 'document_name', 'resource_id', 'company_id', 'document_type_name', 'document_type',
+            'user', 'status', 'timestamp', 'fields_passed', 'fields_failed'
+        ]
+
+
+# ------------------------------------------------------------------
+# VALIDATION BATCH SERIALIZER
+# Entrada del endpoint de validación por lotes: una lista explícita de
+# documentos o un filtro por tipo de documento, compañía y/o recurso.
+# ------------------------------------------------------------------
+class ValidationBatchSerializer(serializers.Serializer):
+    documents = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False)
+    document_type = serializers.PrimaryKeyRelatedField(queryset=DocumentType.objects.all(), required=False)
+    company = serializers.PrimaryKeyRelatedField(queryset=Company.objects.all(), required=False)
+    resource = serializers.PrimaryKeyRelatedField(queryset=Resource.objects.all(), required=False)
+
+    def validate(self, attrs):
+        if not any(key in attrs for key in ('documents', 'document_type', 'company', 'resource')):
+            raise serializers.ValidationError(
+                "Debe indicar 'documents' o al menos un filtro: 'document_type', 'company' o 'resource'."
+            )
+        return attrs
+
+    def get_documents_queryset(self):
+        filters = {}
+        data = self.validated_data
+        if 'documents' in data:
+            filters['id__in'] = data['documents']
+        for key in ('document_type', 'company', 'resource'):
+            if key in data:
+                filters[key] = data[key]
+        return (Document.objects
+                .filter(**filters)
+                .select_related('document_type', 'company', 'resource__employee', 'resource__vehicle')
+                .prefetch_related('document_type__fields_to_validate', 'document_type__fields_to_extract')
+                .order_by('-timestamp'))
+
+
+# ------------------------------------------------------------------
+# VALIDATION JOB SERIALIZER
+# Estado de un trabajo de validación asíncrono. La validación se incluye
+# para que el cliente obtenga el resultado en la misma consulta cuando el
+# trabajo termina.
+# ------------------------------------------------------------------
+class ValidationJobSerializer(serializers.ModelSerializer):
+    validation = ValidationSerializer(read_only=True)
+
+    class Meta:
+        model = ValidationJob
+        fields = [
+            'id', 'status', 'attempts', 'error', 'created_at',
+            'started_at', 'finished_at', 'validation'
+        ]
 
 
 # ------------------------------------------------------------------
@@ -224,4 +407,4 @@ class ValidationSerializer(serializers.ModelSerializer):
 class LogSerializer(serializers.ModelSerializer):
     class Meta:
         model = Log
-        fields = ['id', 'user', 'event', 'details', 'timestamp']
+        fields = ['id', 'user', 'event', 'details', 'timestamp', 'entity_type', 'entity_id', 'payload']
@@ -0,0 +1,71 @@
+# tfg_ctaima_app/signals.py
+# Invalidación de la caché de configuraciones de tipos de documento
+# (document_type_cache.py) cuando cambia un tipo o sus campos, ya sea desde
+# DocumentTypeViewSet, el admin o cualquier otro punto, y sincronización de
+# ValidationSummary (validation_summary.py) con sus tablas de origen.
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .document_type_cache import invalidate_document_type_cache
+from .models import Document, DocumentType, FieldToExtract, FieldToValidate, Validation, ValidationSummary
+from .validation_summary import (
+    remove_summary_from_stats, run_in_background, sync_deleted_document_type, sync_document_summaries,
+    sync_document_type_name, sync_validation_summaries
+)
+
+
+@receiver(post_save, sender=DocumentType)
+@receiver(post_delete, sender=DocumentType)
+@receiver(post_save, sender=FieldToValidate)
+@receiver(post_delete, sender=FieldToValidate)
+@receiver(post_save, sender=FieldToExtract)
+@receiver(post_delete, sender=FieldToExtract)
+def document_type_changed(sender, **kwargs):
+    invalidate_document_type_cache()
+
+
+@receiver(m2m_changed, sender=FieldToValidate.document_types.through)
+@receiver(m2m_changed, sender=FieldToExtract.document_types.through)
+def document_type_fields_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_document_type_cache()
+
+
+@receiver(post_save, sender=Validation)
+def validation_saved(sender, instance, **kwargs):
+    sync_validation_summaries([instance.pk])
+
+
+@receiver(post_save, sender=Document)
+def document_saved(sender, instance, created, **kwargs):
+    # Un documento nuevo todavía no tiene validaciones
+    if not created:
+        sync_document_summaries(instance.pk)
+
+
+@receiver(pre_save, sender=DocumentType)
+def document_type_saving(sender, instance, update_fields=None, **kwargs):
+    # Del tipo, el resumen solo guarda el nombre
+    instance._name_changed = False
+    if instance.pk is None or (update_fields is not None and 'name' not in update_fields):
+        return
+    previous = DocumentType.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+    instance._name_changed = previous is not None and previous != instance.name
+
+
+@receiver(post_save, sender=DocumentType)
+def document_type_saved(sender, instance, created, **kwargs):
+    if not created and getattr(instance, '_name_changed', False):
+        run_in_background(sync_document_type_name, instance.pk)
+
+
+@receiver(post_delete, sender=DocumentType)
+def document_type_deleted(sender, instance, **kwargs):
+    run_in_background(sync_deleted_document_type, instance.pk)
+
+
+@receiver(post_delete, sender=ValidationSummary)
+def validation_summary_deleted(sender, instance, **kwargs):
+    # Se borra en cascada con su validación
+    remove_summary_from_stats(instance)
@@ -0,0 +1,229 @@
+# tfg_ctaima_app/stats.py
+# Agregaciones de validaciones para el dashboard. Si los filtros lo
+# permiten se leen del acumulado diario ValidationDailyStats (unas pocas
+# filas por día); si no, se cuentan las validaciones con GROUP BY.
+
+import uuid
+from datetime import time
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce, TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .document_type_cache import get_document_type_config
+from .models import ValidationDailyStats
+
+STATUSES = ('success', 'failure', 'pending')
+
+# Filtros de ValidationFilter que el acumulado diario no puede responder
+PER_VALIDATION_FILTERS = ('document_id', 'validation_id', 'resource_id', 'user_id')
+
+PERIOD_TRUNCATORS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+
+def status_aggregates(field='id'):
+    """
+    Construye las expresiones de conteo por estado para usarlas en
+    aggregate() o annotate().
+
+    Args:
+        field (str): Campo sobre el que contar
+
+    Returns:
+        dict: Expresiones 'total' y una por cada estado
+    """
+    aggregates = {'total': Count(field)}
+    for status in STATUSES:
+        aggregates[status] = Count(field, filter=Q(status=status))
+    return aggregates
+
+
+def daily_stats_aggregates():
+    # Como status_aggregates, sumando los contadores del acumulado
+    aggregates = {'total': Coalesce(Sum('count'), 0)}
+    for status in STATUSES:
+        aggregates[status] = Coalesce(Sum('count', filter=Q(status=status)), 0)
+    return aggregates
+
+
+def success_rate(row):
+    """
+    Calcula el porcentaje de validaciones con éxito de una fila agregada.
+
+    Args:
+        row (dict): Fila con 'total' y 'success'
+
+    Returns:
+        float: Porcentaje redondeado a dos decimales
+    """
+    total = row.get('total') or 0
+    return round(row.get('success', 0) * 100 / total, 2) if total else 0
+
+
+def compute_validation_stats(queryset, period='day'):
+    """
+    Calcula los indicadores del dashboard sobre un queryset de validaciones
+    ya filtrado: totales por estado, desglose por tipo de documento y serie
+    temporal agrupada por día, semana o mes.
+
+    Args:
+        queryset (QuerySet): Validaciones ya filtradas
+        period (str): 'day', 'week' o 'month'
+
+    Returns:
+        dict: Estadísticas listas para serializar
+    """
+    queryset = queryset.order_by()
+    truncator = PERIOD_TRUNCATORS[period]
+
+    totals = queryset.aggregate(**status_aggregates())
+
+    by_document_type = []
+    rows = (queryset
+            .values('document__document_type', 'document__document_type__name')
+            .annotate(**status_aggregates())
+            .order_by('-total'))
+    for row in rows:
+        by_document_type.append({
+            'document_type': row['document__document_type'],
+            'document_type_name': row['document__document_type__name'],
+            'total': row['total'],
+            **{status: row[status] for status in STATUSES},
+            'success_rate': success_rate(row),
+        })
+
+    timeline = []
+    rows = (queryset
+            .annotate(period=truncator('timestamp'))
+            .values('period')
+            .annotate(**status_aggregates())
+            .order_by('period'))
+    for row in rows:
+        timeline.append({
+            'period': period_start(row['period']),
+            'total': row['total'],
+            **{status: row[status] for status in STATUSES},
+        })
+
+    return {
+        'total': totals['total'],
+        'by_status': {status: totals[status] for status in STATUSES},
+        'success_rate': success_rate(totals),
+        'period': period,
+        'by_document_type': by_document_type,
+        'timeline': timeline,
+    }
+
+
+def period_start(value):
+    # TruncDay/TruncWeek/TruncMonth devuelven datetime sobre timestamp y date sobre day
+    return (value.date() if hasattr(value, 'date') else value).isoformat()
+
+
+def daily_stats_queryset(params):
+    """
+    Traduce los filtros de ValidationFilter a una consulta sobre
+    ValidationDailyStats.
+
+    Solo se admiten filtros por tipo de documento, compañía, estado y
+    fechas a día completo (en TIME_ZONE): start_date a medianoche y
+    end_date a medianoche (días anteriores) o a las 23:59:59 (ese día
+    incluido).
+
+    Args:
+        params (QueryDict): Parámetros de la petición
+
+    Returns:
+        QuerySet | None: Consulta filtrada, o None si algún filtro necesita
+        contar validaciones
+    """
+    if any(params.get(name) for name in PER_VALIDATION_FILTERS):
+        return None
+    queryset = ValidationDailyStats.objects.all()
+    try:
+        if params.get('document_type'):
+            queryset = queryset.filter(document_type_id=int(params['document_type']))
+        if params.get('company_id'):
+            queryset = queryset.filter(company_id=uuid.UUID(params['company_id']))
+        if params.get('status'):
+            queryset = queryset.filter(status=params['status'])
+        if params.get('start_date'):
+            start = timezone.localtime(forms.DateTimeField().clean(params['start_date']))
+            if start.time() != time.min:
+                return None
+            queryset = queryset.filter(day__gte=start.date())
+        if params.get('end_date'):
+            end = timezone.localtime(forms.DateTimeField().clean(params['end_date']))
+            if end.time() == time.min:
+                queryset = queryset.filter(day__lt=end.date())
+            elif end.time().replace(microsecond=0) == time(23, 59, 59):
+                queryset = queryset.filter(day__lte=end.date())
+            else:
+                return None
+    except (ValueError, ValidationError):
+        # Lo rechazará ValidationFilter
+        return None
+    return queryset
+
+
+def compute_daily_stats(queryset, period='day'):
+    """
+    Mismos indicadores que compute_validation_stats, leídos del acumulado
+    diario.
+
+    Args:
+        queryset (QuerySet): Filas de ValidationDailyStats ya filtradas
+        period (str): 'day', 'week' o 'month'
+
+    Returns:
+        dict: Estadísticas listas para serializar
+    """
+    queryset = queryset.order_by()
+    truncator = PERIOD_TRUNCATORS[period]
+
+    totals = queryset.aggregate(**daily_stats_aggregates())
+
+    by_document_type = []
+    rows = (queryset
+            .values('document_type_id')
+            .annotate(**daily_stats_aggregates())
+            .filter(total__gt=0)
+            .order_by('-total'))
+    for row in rows:
+        config = get_document_type_config(row['document_type_id'])
+        by_document_type.append({
+            'document_type': row['document_type_id'],
+            'document_type_name': config['name'] if config else None,
+            'total': row['total'],
+            **{status: row[status] for status in STATUSES},
+            'success_rate': success_rate(row),
+        })
+
+    timeline = []
+    rows = (queryset
+            .annotate(period=truncator('day'))
+            .values('period')
+            .annotate(**daily_stats_aggregates())
+            .filter(total__gt=0)
+            .order_by('period'))
+    for row in rows:
+        timeline.append({
+            'period': period_start(row['period']),
+            'total': row['total'],
+            **{status: row[status] for status in STATUSES},
+        })
+
+    return {
+        'total': totals['total'],
+        'by_status': {status: totals[status] for status in STATUSES},
+        'success_rate': success_rate(totals),
+        'period': period,
+        'by_document_type': by_document_type,
+        'timeline': timeline,
+    }
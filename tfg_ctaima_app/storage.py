@@ -0,0 +1,388 @@
+# tfg_ctaima_app/storage.py
+# Backend de almacenamiento de documentos. Toda la aplicación accede al
+# almacenamiento a través de get_storage(), que crea una única instancia por
+# proceso (y con ella un único pool de conexiones HTTP) la primera vez que
+# se usa. El backend se elige con DOCUMENT_STORAGE_BACKEND: Azure Blob
+# Storage (o un emulador tipo Azurite) o un directorio local para pruebas.
+
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone as dt_timezone
+from urllib.parse import quote
+
+import requests
+from django.conf import settings
+from django.utils.module_loading import import_string
+from requests.adapters import HTTPAdapter
+
+
+def document_blob_name(file_hash, filename):
+    """
+    Nombre del blob de un documento: direccionado por contenido y separado
+    por entorno.
+
+    Args:
+        file_hash (str): Hash SHA-256 del contenido
+        filename (str): Nombre original (se conserva la extensión)
+
+    Returns:
+        str: Nombre del blob
+    """
+    _, ext = os.path.splitext(filename)
+    return f"{settings.ENVIRONMENT}/{file_hash}{ext}"
+
+
+class StorageDownload:
+    """
+    Resultado de una descarga: iterador de trozos más el tamaño servido y
+    el tamaño total del objeto.
+    """
+
+    def __init__(self, chunks, size, total_size):
+        self._chunks = chunks
+        self.size = size
+        self.total_size = total_size
+
+    def chunks(self):
+        return self._chunks
+
+
+class StorageBackend:
+    """
+    Interfaz común de los backends de almacenamiento.
+    """
+    # Indica si el backend puede generar URLs que el navegador descargue
+    # directamente (sin pasar por la aplicación).
+    supports_direct_urls = False
+
+    def upload(self, name, data, overwrite=False):
+        """Sube data (bytes o fichero) y devuelve la URL del objeto."""
+        raise NotImplementedError
+
+    def download(self, name, offset=None, length=None):
+        """Devuelve un StorageDownload con el rango pedido del objeto."""
+        raise NotImplementedError
+
+    def exists(self, name):
+        raise NotImplementedError
+
+    def size(self, name):
+        """Tamaño en bytes del objeto."""
+        raise NotImplementedError
+
+    def delete(self, name):
+        raise NotImplementedError
+
+    def stage_block(self, name, block_id, data):
+        """Sube un bloque sin confirmar del objeto name."""
+        raise NotImplementedError
+
+    def commit_blocks(self, name, block_ids):
+        """Confirma los bloques en el orden dado y devuelve la URL del objeto."""
+        raise NotImplementedError
+
+    def discard_blocks(self, name):
+        """Descarta los bloques sin confirmar de name."""
+
+    def copy(self, source, destination):
+        """Copia un objeto dentro del almacenamiento sin pasar por la aplicación."""
+        raise NotImplementedError
+
+    def generate_sas(self, name, permissions, expiry, content_disposition=None, content_type=None):
+        """
+        Genera un token de acceso temporal con los permisos indicados.
+        content_disposition y content_type fijan esas cabeceras en la
+        respuesta del almacenamiento.
+        """
+        raise NotImplementedError
+
+    def url(self, name, sas_token=None):
+        raise NotImplementedError
+
+
+class AzureBlobStorage(StorageBackend):
+    """
+    Backend sobre Azure Blob Storage. El BlobServiceClient y su transporte
+    HTTP se crean una sola vez y se comparten entre peticiones e hilos.
+    Para pruebas con Azurite basta con apuntar AZURE_STORAGE_ACCOUNT_URL al
+    emulador (p. ej. http://127.0.0.1:10000/devstoreaccount1).
+    """
+    supports_direct_urls = True
+
+    def __init__(self, account_name=None, account_key=None, container=None, account_url=None, pool_maxsize=None):
+        self.account_name = account_name or settings.AZURE_ACCOUNT_NAME
+        self.account_key = account_key or settings.AZURE_ACCOUNT_KEY
+        self.container = container or settings.AZURE_CONTAINER
+        self.account_url = account_url or settings.AZURE_STORAGE_ACCOUNT_URL
+        self.pool_maxsize = pool_maxsize or settings.AZURE_STORAGE_POOL_MAXSIZE
+        self._container_client = None
+        self._lock = threading.Lock()
+
+    @property
+    def container_client(self):
+        if self._container_client is None:
+            with self._lock:
+                if self._container_client is None:
+                    from azure.core.pipeline.transport import RequestsTransport
+                    from azure.storage.blob import BlobServiceClient
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    service_client = BlobServiceClient(
+                        account_url=self.account_url,
+                        credential={'account_name': self.account_name, 'account_key': self.account_key},
+                        transport=RequestsTransport(session=session, session_owner=False),
+                    )
+                    self._container_client = service_client.get_container_client(self.container)
+        return self._container_client
+
+    def blob_client(self, name):
+        return self.container_client.get_blob_client(name)
+
+    def upload(self, name, data, overwrite=False):
+        blob_client = self.blob_client(name)
+        blob_client.upload_blob(data, overwrite=overwrite)
+        return blob_client.url
+
+    def download(self, name, offset=None, length=None):
+        stream = self.blob_client(name).download_blob(offset=offset, length=length)
+        return StorageDownload(stream.chunks(), stream.size, stream.properties.size)
+
+    def exists(self, name):
+        return self.blob_client(name).exists()
+
+    def size(self, name):
+        return self.blob_client(name).get_blob_properties().size
+
+    def delete(self, name):
+        self.blob_client(name).delete_blob()
+
+    def stage_block(self, name, block_id, data):
+        self.blob_client(name).stage_block(block_id, data)
+
+    def commit_blocks(self, name, block_ids):
+        blob_client = self.blob_client(name)
+        blob_client.commit_block_list(block_ids)
+        return blob_client.url
+
+    def copy(self, source, destination):
+        from azure.storage.blob import BlobSasPermissions
+
+        expiry = datetime.now(dt_timezone.utc) + timedelta(hours=1)
+        source_url = self.url(source, self.generate_sas(source, BlobSasPermissions(read=True), expiry))
+        blob_client = self.blob_client(destination)
+        # Put Blob From URL: copia síncrona en el servidor de almacenamiento
+        blob_client.upload_blob_from_url(source_url, overwrite=True)
+        return blob_client.url
+
+    def generate_sas(self, name, permissions, expiry, content_disposition=None, content_type=None):
+        from azure.storage.blob import generate_blob_sas
+
+        return generate_blob_sas(
+            account_name=self.account_name,
+            container_name=self.container,
+            blob_name=name,
+            account_key=self.account_key,
+            permission=permissions,
+            expiry=expiry,
+            content_disposition=content_disposition,
+            content_type=content_type,
+        )
+
+    def url(self, name, sas_token=None):
+        url = f"{self.account_url.rstrip('/')}/{self.container}/{quote(name)}"
+        return f"{url}?{sas_token}" if sas_token else url
+
+
+class LocalFileSystemStorage(StorageBackend):
+    """
+    Backend sobre un directorio local. Pensado para desarrollo y pruebas:
+    los tokens SAS no tienen efecto y las URLs se construyen sobre
+    DOCUMENT_STORAGE_LOCAL_BASE_URL.
+    """
+    CHUNK_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, root=None, base_url=None):
+        self.root = root or settings.DOCUMENT_STORAGE_LOCAL_ROOT
+        self.base_url = base_url or settings.DOCUMENT_STORAGE_LOCAL_BASE_URL
+
+    def path(self, name):
+        return os.path.join(self.root, *name.split('/'))
+
+    def upload(self, name, data, overwrite=False):
+        path = self.path(name)
+        if os.path.exists(path) and not overwrite:
+            raise FileExistsError(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as destination:
+            if isinstance(data, (bytes, bytearray)):
+                destination.write(data)
+            elif hasattr(data, 'chunks'):
+                for chunk in data.chunks():
+                    destination.write(chunk)
+            else:
+                shutil.copyfileobj(data, destination)
+        return self.url(name)
+
+    def download(self, name, offset=None, length=None):
+        path = self.path(name)
+        total_size = os.path.getsize(path)
+        start = offset or 0
+        end = total_size if length is None else min(start + length, total_size)
+
+        def chunks():
+            with open(path, 'rb') as source:
+                source.seek(start)
+                remaining = end - start
+                while remaining > 0:
+                    chunk = source.read(min(self.CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+
+        return StorageDownload(chunks(), max(end - start, 0), total_size)
+
+    def exists(self, name):
+        return os.path.exists(self.path(name))
+
+    def size(self, name):
+        return os.path.getsize(self.path(name))
+
+    def delete(self, name):
+        os.remove(self.path(name))
+        self.discard_blocks(name)
+
+    def block_path(self, name, block_id):
+        return os.path.join(self.root, '.blocks', *name.split('/'), block_id)
+
+    def stage_block(self, name, block_id, data):
+        path = self.block_path(name, block_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as destination:
+            destination.write(data)
+
+    def commit_blocks(self, name, block_ids):
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as destination:
+            for block_id in block_ids:
+                with open(self.block_path(name, block_id), 'rb') as block:
+                    shutil.copyfileobj(block, destination)
+        # Como en Azure, los bloques confirmados siguen disponibles para
+        # volver a confirmar la lista; se eliminan al borrar el objeto
+        return self.url(name)
+
+    def discard_blocks(self, name):
+        shutil.rmtree(os.path.join(self.root, '.blocks', *name.split('/')), ignore_errors=True)
+
+    def copy(self, source, destination):
+        path = self.path(destination)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copyfile(self.path(source), path)
+        return self.url(destination)
+
+    def generate_sas(self, name, permissions, expiry, content_disposition=None, content_type=None):
+        return ''
+
+    def url(self, name, sas_token=None):
+        return f"{self.base_url.rstrip('/')}/{quote(name)}"
+
+
+class StreamingUpload:
+    """
+    Sube un fichero leyéndolo una sola vez mientras se calcula su SHA-256.
+
+    Los ficheros pequeños se guardan en memoria y se suben con una única
+    petición al confirmar. Los grandes se suben por bloques en paralelo a
+    un blob temporal mientras se calcula el hash; al confirmar, se cierra
+    la lista de bloques y el blob se copia en el servidor a su nombre
+    definitivo (direccionado por contenido). Si el documento resulta
+    duplicado basta con descartar la subida: los bloques sin confirmar los
+    elimina el propio almacenamiento.
+    """
+
+    def __init__(self, storage=None, block_size=None, single_put_max=None, max_in_flight=None):
+        self.storage = storage or get_storage()
+        self.block_size = block_size or settings.DOCUMENT_UPLOAD_BLOCK_SIZE
+        self.single_put_max = single_put_max if single_put_max is not None else settings.DOCUMENT_UPLOAD_SINGLE_PUT_MAX
+        self.max_in_flight = max_in_flight or settings.DOCUMENT_UPLOAD_MAX_IN_FLIGHT
+        self.staging_name = f"{settings.ENVIRONMENT}/_staging/{uuid.uuid4().hex}"
+        self.block_ids = []
+        self._buffer = []
+        self._sha256 = hashlib.sha256()
+
+    def feed(self, uploaded_file):
+        """
+        Lee el fichero una vez, calculando el hash y subiendo los bloques.
+
+        Args:
+            uploaded_file (UploadedFile): Fichero recibido por Django
+
+        Returns:
+            str: Hash SHA-256 en formato hexadecimal
+        """
+        if uploaded_file.size is not None and uploaded_file.size <= self.single_put_max:
+            for chunk in uploaded_file.chunks():
+                self._sha256.update(chunk)
+                self._buffer.append(chunk)
+            return self._sha256.hexdigest()
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            in_flight = []
+            for index, chunk in enumerate(uploaded_file.chunks(chunk_size=self.block_size)):
+                self._sha256.update(chunk)
+                block_id = f"{index:08d}"
+                self.block_ids.append(block_id)
+                if len(in_flight) >= self.max_in_flight:
+                    in_flight.pop(0).result()
+                in_flight.append(executor.submit(self.storage.stage_block, self.staging_name, block_id, chunk))
+            for future in in_flight:
+                future.result()
+        return self._sha256.hexdigest()
+
+    def commit(self, name):
+        """
+        Confirma la subida bajo su nombre definitivo.
+
+        Returns:
+            str: URL del objeto
+        """
+        if not self.block_ids:
+            return self.storage.upload(name, b''.join(self._buffer), overwrite=True)
+        self.storage.commit_blocks(self.staging_name, self.block_ids)
+        url = self.storage.copy(self.staging_name, name)
+        self.storage.delete(self.staging_name)
+        return url
+
+    def discard(self):
+        if self.block_ids:
+            self.storage.discard_blocks(self.staging_name)
+        self._buffer = []
+        self.block_ids = []
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """
+    Devuelve el backend de almacenamiento del proceso, creándolo la primera
+    vez a partir de DOCUMENT_STORAGE_BACKEND.
+
+    Returns:
+        StorageBackend: Backend configurado
+    """
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = import_string(settings.DOCUMENT_STORAGE_BACKEND)()
+    return _storage
@@ -0,0 +1,390 @@
+# tfg_ctaima_app/uploads.py
+# Subida por partes reanudable para documentos grandes. El cliente inicia
+# una sesión, sube las partes (en paralelo y en cualquier orden) y la
+# completa. Cada parte se sube directamente como bloque sin confirmar de un
+# blob temporal, de modo que ninguna petición mantiene el fichero completo
+# en memoria ni en disco. Completar solo marca la sesión: un worker del pool
+# de validaciones (validation_jobs.py) confirma la lista de bloques, calcula
+# el SHA-256 del documento, aplica la deduplicación por hash y mueve el blob
+# a su nombre definitivo, sin transacción abierta ni bloqueo de la sesión
+# durante la E/S con el almacenamiento.
+
+import hashlib
+import json
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+from . import audit
+from .models import Document, EventType, Resource, UploadSession
+from .storage import document_blob_name, get_storage
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadError(Exception):
+    """
+    Error de la subida por partes con el código HTTP que debe devolverse.
+    """
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def build_document_data(params, user, filename, file_hash, blob_url):
+    """
+    Construye los datos del documento a crear a partir de los parámetros
+    de la subida (tipo, entidades asociadas, compañía y recurso). Lo usan
+    la subida directa y la subida por partes.
+
+    Args:
+        params (dict): Parámetros recibidos del cliente
+        user (User): Usuario que sube el documento
+        filename (str): Nombre original del fichero
+        file_hash (str): Hash SHA-256 del contenido
+        blob_url (str): URL del objeto en el almacenamiento
+
+    Returns:
+        dict: Datos para DocumentSerializer
+    """
+    # Primero, aseguramos que 'associated_entity' sea una lista.
+    associated_entities = params.get('associated_entities', None)
+    if isinstance(associated_entities, str):
+        try:
+            associated_entities = json.loads(associated_entities)
+        except ValueError:
+            pass
+    if not associated_entities:
+        associated_entities = ['resource']
+    elif isinstance(associated_entities, str):
+        # Si solo se envía un string, lo convertimos a lista.
+        associated_entities = [associated_entities]
+
+    data = {
+        'document_type': params.get('document_type'),
+        'url': blob_url,
+        'name': filename,
+        'file_hash': file_hash,
+        'user': user.id
+    }
+
+    # Si se requiere la compañía, la asignamos desde el request
+    if 'company' in associated_entities:
+        company_value = params.get('company')
+        if company_value:
+            data['company'] = company_value
+
+    # Si se requiere el recurso, lo buscamos y asignamos
+    if 'resource' in associated_entities:
+        resource_id = params.get('resource')
+        # No deberia pasar nunca, ya que al crear el documento el campo company es obligatorio
+        if resource_id:
+            resource = get_object_or_404(Resource, pk=resource_id)
+            data['resource'] = resource.id
+
+    return data
+
+
+def block_id(part_number):
+    # Todos los identificadores de bloque de un blob deben tener la misma longitud
+    return f"{part_number:08d}"
+
+
+def initiate_upload(user, filename, size, metadata, part_size=None):
+    """
+    Crea una sesión de subida por partes.
+
+    Args:
+        user (User): Usuario que sube el documento
+        filename (str): Nombre original del fichero
+        size (int): Tamaño total en bytes
+        metadata (dict): Datos del documento (tipo, compañía, recurso...)
+        part_size (int): Tamaño de parte pedido por el cliente (opcional)
+
+    Returns:
+        UploadSession: Sesión creada
+
+    Raises:
+        UploadError: Si el tamaño o el tamaño de parte no son válidos
+    """
+    part_size = part_size or settings.DOCUMENT_UPLOAD_PART_SIZE
+    if not 0 < size <= settings.DOCUMENT_UPLOAD_MAX_SIZE:
+        raise UploadError(f"El tamaño debe estar entre 1 y {settings.DOCUMENT_UPLOAD_MAX_SIZE} bytes.")
+    if not settings.DOCUMENT_UPLOAD_MIN_PART_SIZE <= part_size <= settings.DOCUMENT_UPLOAD_MAX_PART_SIZE:
+        raise UploadError(
+            f"El tamaño de parte debe estar entre {settings.DOCUMENT_UPLOAD_MIN_PART_SIZE} "
+            f"y {settings.DOCUMENT_UPLOAD_MAX_PART_SIZE} bytes."
+        )
+
+    return UploadSession.objects.create(
+        user=user,
+        filename=filename,
+        size=size,
+        part_size=part_size,
+        staging_name=f"{settings.ENVIRONMENT}/_staging/{uuid.uuid4().hex}",
+        metadata=metadata,
+        expires_at=timezone.now() + timedelta(seconds=settings.DOCUMENT_UPLOAD_SESSION_TTL),
+    )
+
+
+def check_active(session):
+    if session.status != 'active':
+        raise UploadError(f"La subida está en estado '{session.status}'.", status_code=409)
+    if session.expires_at <= timezone.now():
+        raise UploadError("La subida ha caducado.", status_code=410)
+
+
+def read_part(stream, expected_length):
+    """
+    Lee el cuerpo de una parte sin superar el tamaño esperado.
+
+    Returns:
+        bytes: Contenido de la parte
+
+    Raises:
+        UploadError: Si el cuerpo no tiene exactamente el tamaño esperado
+    """
+    chunks, received = [], 0
+    while stream is not None and received <= expected_length:
+        chunk = stream.read(min(READ_CHUNK_SIZE, expected_length + 1 - received))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        received += len(chunk)
+    if received != expected_length:
+        raise UploadError(f"La parte debe tener {expected_length} bytes.")
+    return b''.join(chunks)
+
+
+def store_part(session, part_number, stream, expected_sha256=None):
+    """
+    Sube una parte como bloque del blob temporal y la registra en la
+    sesión. Volver a subir una parte ya recibida la sustituye, lo que
+    permite reintentarla tras un fallo de red.
+
+    Args:
+        session (UploadSession): Sesión activa
+        part_number (int): Número de parte, desde 1
+        stream: Cuerpo de la petición
+        expected_sha256 (str): SHA-256 que el cliente declara (opcional)
+
+    Returns:
+        dict: Tamaño y SHA-256 de la parte recibida
+    """
+    check_active(session)
+    if not 1 <= part_number <= session.total_parts:
+        raise UploadError(f"El número de parte debe estar entre 1 y {session.total_parts}.")
+
+    data = read_part(stream, session.part_length(part_number))
+    digest = hashlib.sha256(data).hexdigest()
+    if expected_sha256 and expected_sha256.lower() != digest:
+        raise UploadError("El SHA-256 de la parte no coincide con el declarado.")
+
+    get_storage().stage_block(session.staging_name, block_id(part_number), data)
+
+    part = {'size': len(data), 'sha256': digest}
+    with transaction.atomic():
+        locked = UploadSession.objects.select_for_update().get(pk=session.pk)
+        check_active(locked)
+        locked.parts[str(part_number)] = part
+        locked.save(update_fields=['parts', 'updated_at'])
+    return part
+
+
+def missing_parts(session):
+    received = {int(number) for number in session.parts}
+    return [number for number in range(1, session.total_parts + 1) if number not in received]
+
+
+def request_completion(session):
+    """
+    Marca la sesión para que un worker la complete. Solo toca la base de
+    datos: la confirmación de bloques, el hash y la copia al nombre
+    definitivo se hacen en finish_upload, fuera de la petición.
+
+    Returns:
+        UploadSession: Sesión en estado 'completing'
+
+    Raises:
+        UploadError: Si la sesión no está activa o faltan partes
+    """
+    with transaction.atomic():
+        locked = UploadSession.objects.select_for_update().get(pk=session.pk)
+        check_active(locked)
+        missing = missing_parts(locked)
+        if missing:
+            raise UploadError(f"Faltan partes por subir: {missing}", status_code=409)
+        locked.status = 'completing'
+        locked.error = None
+        locked.save(update_fields=['status', 'error', 'updated_at'])
+    return locked
+
+
+def claim_next_upload():
+    """
+    Reclama la siguiente sesión pendiente de completar. El cambio a
+    'assembling' se confirma antes de cualquier E/S del almacenamiento.
+
+    Returns:
+        UploadSession | None: Sesión reclamada o None si no hay ninguna
+    """
+    with transaction.atomic():
+        session = (UploadSession.objects
+                   .select_for_update(skip_locked=True)
+                   .filter(status='completing')
+                   .order_by('updated_at')
+                   .first())
+        if session is None:
+            return None
+        session.status = 'assembling'
+        session.save(update_fields=['status', 'updated_at'])
+    return session
+
+
+def requeue_stale_uploads():
+    """
+    Devuelve a 'completing' las sesiones cuyo worker murió mientras las
+    completaba.
+
+    Returns:
+        int: Número de sesiones reencoladas
+    """
+    limit = timezone.now() - timedelta(seconds=settings.VALIDATION_JOB_STALE_AFTER)
+    return (UploadSession.objects
+            .filter(status='assembling', updated_at__lt=limit)
+            .update(status='completing', updated_at=timezone.now()))
+
+
+def assemble_upload(session):
+    """
+    Confirma los bloques en orden y calcula el SHA-256 del documento
+    leyendo el blob temporal desde el almacenamiento. La lista de bloques se
+    confirma siempre: si una parte se volvió a subir tras un intento
+    anterior, el blob debe recoger su nuevo contenido.
+
+    Returns:
+        str: Hash SHA-256 en formato hexadecimal
+    """
+    storage = get_storage()
+    storage.commit_blocks(session.staging_name, [block_id(n) for n in range(1, session.total_parts + 1)])
+
+    sha256 = hashlib.sha256()
+    for chunk in storage.download(session.staging_name).chunks():
+        sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def promote_upload(session, name):
+    """
+    Copia el blob temporal a su nombre definitivo y lo elimina.
+
+    Returns:
+        str: URL del objeto definitivo
+    """
+    storage = get_storage()
+    url = storage.copy(session.staging_name, name)
+    storage.delete(session.staging_name)
+    return url
+
+
+def _finish(session, document=None, duplicate=False):
+    # Cierra la sesión si sigue siendo de este worker (no se abortó entretanto)
+    with transaction.atomic():
+        locked = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if locked.status != 'assembling':
+            return False
+        locked.status = 'completed'
+        locked.document = document
+        locked.duplicate = duplicate
+        locked.error = None
+        locked.save(update_fields=['status', 'document', 'duplicate', 'error', 'updated_at'])
+    return True
+
+
+def finish_upload(session):
+    """
+    Completa una sesión reclamada con claim_next_upload: confirma los
+    bloques, calcula el hash, aplica la deduplicación y crea el documento.
+    Si algo falla la sesión vuelve a 'active' con el error, para que el
+    cliente pueda reintentar la subida de partes o el completado.
+
+    Returns:
+        Document | None: Documento creado o existente (None si falló)
+    """
+    from .serializers import DocumentSerializer
+
+    try:
+        file_hash = assemble_upload(session)
+        existing_document = Document.objects.filter(file_hash=file_hash).first()
+        if existing_document is not None:
+            discard_upload(session)
+            _finish(session, existing_document, duplicate=True)
+            logger.info(f"Upload '{session.id}' duplicates document '{existing_document.id}'")
+            return existing_document
+
+        blob_name = document_blob_name(file_hash, session.filename)
+        serializer = DocumentSerializer(data=build_document_data(
+            session.metadata, session.user, session.filename, file_hash, get_storage().url(blob_name)
+        ))
+        serializer.is_valid(raise_exception=True)
+        promote_upload(session, blob_name)
+        with transaction.atomic():
+            document = serializer.save()
+            if not _finish(session, document):
+                # Abortada mientras se completaba: no se crea el documento
+                transaction.set_rollback(True)
+                return None
+    except Exception as e:
+        logger.error(f"Error completing upload '{session.id}': {str(e)}")
+        UploadSession.objects.filter(pk=session.pk, status='assembling').update(
+            status='active', error=str(e), updated_at=timezone.now()
+        )
+        return None
+
+    audit.record(
+        session.user,
+        EventType.CREATE_DOCUMENT,
+        f"User '{session.user.username}' performed '{EventType.CREATE_DOCUMENT}' on '{document.id}'.",
+        entity_type=EventType.CREATE_DOCUMENT.entity_type,
+        entity_id=document.id,
+        payload={'upload': str(session.id), 'name': document.name},
+    )
+    logger.info(f"Document '{document.name}' created by {session.user.username} from upload '{session.id}'")
+    return document
+
+
+def discard_upload(session):
+    """Elimina los bloques y el blob temporal de la sesión."""
+    storage = get_storage()
+    storage.discard_blocks(session.staging_name)
+    if storage.exists(session.staging_name):
+        storage.delete(session.staging_name)
+
+
+def expire_upload_sessions():
+    """
+    Aborta las sesiones activas caducadas y libera su almacenamiento.
+
+    Returns:
+        int: Número de sesiones abortadas
+    """
+    expired = 0
+    for session in UploadSession.objects.filter(status='active', expires_at__lte=timezone.now()):
+        try:
+            discard_upload(session)
+        except Exception as e:
+            logger.error(f"Error al limpiar la subida '{session.id}': {str(e)}")
+            continue
+        session.status = 'aborted'
+        session.save(update_fields=['status', 'updated_at'])
+        expired += 1
+    return expired
@@ -1,10 +1,11 @@
 import hashlib
 import re
 import os
-from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPermissions, BlobClient
 from django.conf import settings
-from datetime import datetime, timedelta
-from azure.core.exceptions import ResourceExistsError
+import time
+from datetime import datetime, timezone
+from .storage import get_storage
+from .sas_cache import get_sas_cache
 import json
 import ast
 
@@ -31,12 +32,12 @@ def calculate_file_hash(file):
 
 def upload_to_blob_storage(uploaded_file, blob_name):
     """
-    Sube un archivo al almacenamiento Azure Blob Storage.
+    Sube un archivo al almacenamiento de documentos configurado.
     No sobrescribe archivos existentes con el mismo nombre.
     
     Args:
         uploaded_file (File): Archivo a subir
-        blob_name (str): Nombre para el blob en Azure
+        blob_name (str): Nombre para el blob
         
     Returns:
         str: URL completa del blob subido
@@ -45,44 +46,51 @@ def upload_to_blob_storage(uploaded_file, blob_name):
         Exception: Si ocurre un error durante la subida
     """
     try:
-        # Crear el cliente del servicio Blob
-        connect_str = f"DefaultEndpointsProtocol=https;AccountName={settings.AZURE_ACCOUNT_NAME};AccountKey={settings.AZURE_ACCOUNT_KEY};EndpointSuffix=core.windows.net"
-        blob_service_client = BlobServiceClient.from_connection_string(connect_str)
-        container_client = blob_service_client.get_container_client(settings.AZURE_CONTAINER)
-        blob_client = container_client.get_blob_client(blob_name)
-
+        storage = get_storage()
         # Subir el archivo si no existe
-        if not blob_client.exists():
-            blob_client.upload_blob(uploaded_file, overwrite=False)
-        # Obtener la URL del blob
-        blob_url = blob_client.url
-        return blob_url
+        if not storage.exists(blob_name):
+            return storage.upload(blob_name, uploaded_file, overwrite=False)
+        return storage.url(blob_name)
     except Exception as e:
         raise Exception(f"Error uploading file to Azure Blob Storage: {str(e)}")
         
 
-def generate_sas_token(blob_name, permissions, expiry_hours=5):
+def generate_sas_token(blob_name, permissions, expiry_hours=5, expiry_seconds=None, with_expiry=False, **overrides):
     """
     Genera un token SAS (Firma de Acceso Compartido) para un blob específico.
-    Permite acceso temporal al blob con permisos específicos.
+    Permite acceso temporal al blob con permisos específicos. Los tokens se
+    reutilizan desde la caché de SAS mientras les quede suficiente vida.
     
     Args:
         blob_name (str): Nombre del blob
         permissions (BlobSasPermissions): Permisos a otorgar
         expiry_hours (int): Horas hasta la expiración del token
+        expiry_seconds (int): Segundos hasta la expiración (tiene prioridad sobre expiry_hours)
+        with_expiry (bool): Si es True devuelve también la expiración real
+            del token (epoch), que es anterior a la pedida si viene de la caché
+        **overrides: Cabeceras de respuesta fijadas en el token
+            (content_disposition, content_type)
         
     Returns:
-        str: Token SAS generado
+        str: Token SAS generado (o tupla token, expiración si with_expiry)
     """
-    sas_token = generate_blob_sas(
-        account_name=settings.AZURE_ACCOUNT_NAME,
-        container_name=settings.AZURE_CONTAINER,
-        blob_name=blob_name,
-        account_key=settings.AZURE_ACCOUNT_KEY,
-        permission=permissions,
-        expiry=datetime.utcnow() + timedelta(hours=expiry_hours)
-    )
-    return sas_token
+    lifetime = expiry_seconds if expiry_seconds is not None else expiry_hours * 3600
+    key = (blob_name, str(permissions), *sorted(overrides.items()))
+
+    def sign(expires_at):
+        return get_storage().generate_sas(
+            blob_name,
+            permissions,
+            expiry=datetime.fromtimestamp(expires_at, tz=timezone.utc),
+            **overrides
+        )
+
+    if not settings.SAS_CACHE_ENABLED:
+        expires_at = time.time() + lifetime
+        entry = (sign(expires_at), expires_at)
+    else:
+        entry = get_sas_cache().get_or_create_entry(key, lifetime, sign)
+    return entry if with_expiry else entry[0]
 
 
 def transform_validation_details(data):
@@ -0,0 +1,142 @@
+# tfg_ctaima_app/validation_batch.py
+# Validación por lotes: prepara las peticiones de todos los documentos y
+# crea de una vez, en una sola transacción, sus validaciones en estado
+# 'pending' y los ValidationJob que las procesan. Las llamadas al endpoint
+# externo las hace el pool de workers (validation_jobs.py), igual que en el
+# alta individual, así que la petición HTTP no espera a ninguna.
+
+import json
+import logging
+
+from django.db import transaction
+
+from . import audit
+from .models import EventType, Validation, ValidationJob
+from .serializers import CompanySerializer, ResourceSerializer
+from .utils import transform_fields, transform_validation_details
+from .validation_summary import sync_validation_summaries
+
+logger = logging.getLogger(__name__)
+
+
+def expected_value(value):
+    # Como value?.toString() || '' en el formulario: los float enteros se
+    # escriben sin decimales y los vacíos quedan como ''
+    if value is None or value == '':
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def build_validation_input(document):
+    """
+    Construye los campos a validar/extraer de un documento con el mismo
+    criterio que el formulario de subida (useJunoUploadFile.ts): el valor
+    esperado sale de la compañía y/o del recurso según las entidades
+    asociadas del tipo de documento (el recurso prevalece), leídos con los
+    mismos serializers que usa el formulario.
+
+    Args:
+        document (Document): Documento con tipo, compañía y recurso cargados
+
+    Returns:
+        dict: Estructura que envía el formulario (listas de campos)
+    """
+    document_type = document.document_type
+    associated_entities = document_type.associated_entities or []
+    sources = []
+    if 'company' in associated_entities and document.company is not None:
+        sources.append(CompanySerializer(document.company).data)
+    if 'resource' in associated_entities and document.resource is not None:
+        details = ResourceSerializer(document.resource).data['resource_details']
+        if details:
+            sources.append(details)
+
+    fields_to_validate = []
+    for field in sorted(document_type.fields_to_validate.all(), key=lambda field: field.id):
+        value = ''
+        for source in sources:
+            if field.name in source:
+                value = expected_value(source[field.name])
+        fields_to_validate.append({
+            'id': field.id,
+            'name': field.name,
+            'description': field.description or '',
+            'expected_value': value,
+            'obtained_value': 'pending_to_obtain',
+        })
+
+    fields_to_extract = [
+        {
+            'id': field.id,
+            'name': field.name,
+            'description': field.description or '',
+            'obtained_value': 'pending_to_extract',
+        }
+        for field in sorted(document_type.fields_to_extract.all(), key=lambda field: field.id)
+    ]
+    return {'fields_to_validate': fields_to_validate, 'fields_to_extract': fields_to_extract}
+
+
+def build_request_details(document):
+    """
+    Campos a validar/extraer de un documento ya transformados, por la misma
+    ruta que el alta individual (transform_validation_details).
+
+    Returns:
+        dict: Estructura equivalente a transform_validation_details
+    """
+    return transform_validation_details(json.dumps(build_validation_input(document)))
+
+
+def enqueue_batch_validation(documents, user, request=None):
+    """
+    Crea una validación 'pending' y su ValidationJob por cada documento y
+    registra el alta en la auditoría, como el alta individual.
+
+    Args:
+        documents (list[Document]): Documentos con tipo (y sus campos),
+            compañía y recurso precargados
+        user (User): Usuario que lanza el lote
+        request (Request): Petición, para el payload de la auditoría
+
+    Returns:
+        list[ValidationJob]: Trabajos creados, con su validación
+    """
+    jobs = []
+    for document in documents:
+        request_details = build_request_details(document)
+        validation = Validation(
+            document=document,
+            user=user,
+            status='pending',
+            validation_details=transform_fields(request_details),
+        )
+        jobs.append(ValidationJob(validation=validation, request_details=request_details))
+
+    with transaction.atomic():
+        Validation.objects.bulk_create([job.validation for job in jobs], batch_size=500)
+        ValidationJob.objects.bulk_create(jobs, batch_size=500)
+        # bulk_create no lanza post_save
+        sync_validation_summaries([job.validation.pk for job in jobs])
+
+    event = EventType.CREATE_VALIDATION
+    for job in jobs:
+        details = f"User '{user.username}' performed '{event}' on '{job.validation.pk}'."
+        audit.record(
+            user,
+            event,
+            details,
+            entity_type=event.entity_type,
+            entity_id=job.validation.pk,
+            payload={
+                'method': request.method if request is not None else None,
+                'path': request.path if request is not None else None,
+                'status_code': 202,
+                'name': None,
+                'batch': True,
+                'job': str(job.pk),
+            },
+        )
+    return jobs
@@ -0,0 +1,253 @@
+# tfg_ctaima_app/validation_client.py
+# Cliente compartido del servicio externo de validación. Mantiene una única
+# requests.Session por proceso con conexiones keep-alive reutilizables,
+# timeouts de conexión/lectura y reintentos con espera exponencial con
+# jitter ante 429/5xx y errores de red. Las llamadas se hacen en los
+# workers (validation_jobs.py), que publican sus métricas en WorkerMetrics
+# para que la vista de métricas las agregue.
+
+import logging
+import random
+import threading
+import time
+
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from .models import WorkerMetrics
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+LATENCY_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class ValidationClientMetrics:
+    """
+    Contadores de peticiones, reintentos y latencia del cliente. Son por
+    proceso y seguros entre hilos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.successes = 0
+            self.failures = 0
+            self.retries = 0
+            self.latency_total = 0.0
+            self.latency_max = 0.0
+            self.status_codes = {}
+            self.latency_buckets = {bucket: 0 for bucket in LATENCY_BUCKETS}
+
+    def record_request(self, latency, status_code=None):
+        with self._lock:
+            self.requests += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            key = str(status_code) if status_code is not None else 'error'
+            self.status_codes[key] = self.status_codes.get(key, 0) + 1
+            for bucket in LATENCY_BUCKETS:
+                if latency <= bucket:
+                    self.latency_buckets[bucket] += 1
+                    break
+
+    def record_result(self, success):
+        with self._lock:
+            if success:
+                self.successes += 1
+            else:
+                self.failures += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'successes': self.successes,
+                'failures': self.failures,
+                'retries': self.retries,
+                'latency_total': round(self.latency_total, 4),
+                'latency_avg': round(self.latency_total / self.requests, 4) if self.requests else 0,
+                'latency_max': round(self.latency_max, 4),
+                'status_codes': dict(self.status_codes),
+                'latency_buckets': {f"le_{bucket}": count for bucket, count in self.latency_buckets.items()},
+            }
+
+
+def merge_snapshots(snapshots):
+    """
+    Suma las instantáneas de métricas de varios procesos.
+
+    Args:
+        snapshots (list[dict]): Resultados de ValidationClientMetrics.snapshot
+
+    Returns:
+        dict: Instantánea con el mismo formato que snapshot
+    """
+    merged = ValidationClientMetrics().snapshot()
+    for snapshot in snapshots:
+        for key in ('requests', 'successes', 'failures', 'retries', 'latency_total'):
+            merged[key] += snapshot.get(key, 0)
+        merged['latency_max'] = max(merged['latency_max'], snapshot.get('latency_max', 0))
+        for group in ('status_codes', 'latency_buckets'):
+            for key, count in snapshot.get(group, {}).items():
+                merged[group][key] = merged[group].get(key, 0) + count
+    merged['latency_total'] = round(merged['latency_total'], 4)
+    if merged['requests']:
+        merged['latency_avg'] = round(merged['latency_total'] / merged['requests'], 4)
+    return merged
+
+
+def publish_metrics(process):
+    """
+    Guarda en WorkerMetrics la instantánea de métricas del cliente de este
+    proceso.
+
+    Args:
+        process (str): Identificador del proceso (host:pid)
+    """
+    WorkerMetrics.objects.update_or_create(
+        process=process,
+        defaults={'metrics': get_validation_client().metrics.snapshot(), 'updated_at': timezone.now()},
+    )
+
+
+def collect_metrics():
+    """
+    Agrega las métricas publicadas por los workers que siguen activos.
+
+    Returns:
+        dict: Instantánea agregada y, en 'workers', los procesos incluidos
+    """
+    since = timezone.now() - timedelta(seconds=settings.VALIDATION_CLIENT_METRICS_MAX_AGE)
+    rows = list(WorkerMetrics.objects.filter(updated_at__gte=since).order_by('process'))
+    return {
+        **merge_snapshots([row.metrics for row in rows]),
+        'workers': [{'process': row.process, 'updated_at': row.updated_at} for row in rows],
+    }
+
+
+class ValidationServiceClient:
+    """
+    Cliente HTTP del endpoint de validación.
+
+    Args:
+        endpoint (str): URL del endpoint de validación
+        subscription_key (str): Clave de suscripción de APIM
+        pool_maxsize (int): Conexiones máximas por host
+        connect_timeout (float): Segundos para establecer la conexión
+        read_timeout (float): Segundos de espera de la respuesta
+        max_retries (int): Reintentos ante 429/5xx o errores de red
+        backoff_base (float): Espera base en segundos del backoff exponencial
+        backoff_max (float): Espera máxima en segundos entre reintentos
+    """
+
+    def __init__(self, endpoint, subscription_key, pool_maxsize=10, connect_timeout=5, read_timeout=120,
+                 max_retries=3, backoff_base=0.5, backoff_max=30):
+        self.endpoint = endpoint
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.metrics = ValidationClientMetrics()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, pool_block=True, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            "Ocp-Apim-Subscription-Key": subscription_key,
+            "Content-Type": "application/json",
+        })
+
+    def validate(self, payload):
+        """
+        Envía una petición de validación y devuelve la respuesta JSON.
+
+        Raises:
+            requests.exceptions.RequestException: Si la petición falla tras
+            agotar los reintentos
+        """
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            try:
+                response = self.session.post(self.endpoint, json=payload, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.metrics.record_request(time.monotonic() - start)
+                if attempt >= self.max_retries:
+                    self.metrics.record_result(False)
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"Error de red con el servicio de validación ({str(e)}); reintento en {delay:.2f}s.")
+            else:
+                self.metrics.record_request(time.monotonic() - start, response.status_code)
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    try:
+                        response.raise_for_status()
+                    except requests.exceptions.HTTPError:
+                        self.metrics.record_result(False)
+                        raise
+                    self.metrics.record_result(True)
+                    return response.json()
+                delay = self._retry_after(response) or self._backoff(attempt)
+                logger.warning(f"El servicio de validación respondió {response.status_code}; reintento en {delay:.2f}s.")
+                response.close()
+
+            self.metrics.record_retry()
+            attempt += 1
+            time.sleep(delay)
+
+    def close(self):
+        self.session.close()
+
+    def _backoff(self, attempt):
+        # Full jitter: espera aleatoria entre 0 y el techo exponencial.
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _retry_after(self, response):
+        value = response.headers.get('Retry-After')
+        try:
+            return min(float(value), self.backoff_max) if value else None
+        except ValueError:
+            return None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_validation_client():
+    """
+    Devuelve el cliente compartido del proceso, creándolo la primera vez.
+
+    Returns:
+        ValidationServiceClient: Cliente configurado desde settings
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ValidationServiceClient(
+                    endpoint=settings.VALIDATION_ENDPOINT,
+                    subscription_key=settings.OCP_APIM_VALIDATION_SUBSCRIPTION_KEY,
+                    pool_maxsize=settings.VALIDATION_CLIENT_POOL_MAXSIZE,
+                    connect_timeout=settings.VALIDATION_CLIENT_CONNECT_TIMEOUT,
+                    read_timeout=settings.VALIDATION_CLIENT_READ_TIMEOUT,
+                    max_retries=settings.VALIDATION_CLIENT_MAX_RETRIES,
+                    backoff_base=settings.VALIDATION_CLIENT_BACKOFF_BASE,
+                    backoff_max=settings.VALIDATION_CLIENT_BACKOFF_MAX,
+                )
+    return _client
@@ -0,0 +1,344 @@
+# tfg_ctaima_app/validation_jobs.py
+# Cola de trabajos de validación respaldada por la base de datos y pool de
+# workers que la consume. La vista crea la validación en estado 'pending'
+# y encola un ValidationJob; los workers llaman al endpoint externo fuera
+# de cualquier petición HTTP y actualizan la validación con el resultado.
+# Cuando la cola está vacía, los mismos workers completan las subidas por
+# partes pendientes (uploads.py).
+
+import logging
+import os
+import random
+import socket
+import threading
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import transaction, close_old_connections, connection
+from django.utils import timezone
+
+from azure.storage.blob import BlobSasPermissions
+
+from .models import Validation, ValidationJob
+from .utils import generate_sas_token, process_api_response, transform_fields
+from .validation_client import get_validation_client, publish_metrics
+from .storage import document_blob_name
+from .uploads import claim_next_upload, finish_upload, requeue_stale_uploads
+
+logger = logging.getLogger(__name__)
+
+
+def build_validation_request(document, request_details):
+    """
+    Construye el cuerpo de la petición al endpoint externo de validación.
+    El tipo de documento se lee de la base de datos y no de la caché de
+    configuraciones: el worker es otro proceso y no ve sus invalidaciones.
+
+    Args:
+        document (Document): Documento a validar, con su tipo cargado
+        request_details (dict): Campos a validar/extraer ya transformados
+
+    Returns:
+        dict: Parámetros de la petición
+    """
+    doc_name = document_blob_name(document.file_hash, document.name)
+    sas_token = generate_sas_token(doc_name, BlobSasPermissions(read=True, write=False, delete=False))
+    document_type = document.document_type
+
+    req_params = {
+        "fields_to_validate": request_details['fields_to_validate'],
+        "fields_to_extract": request_details['fields_to_extract'],
+        "account_url": settings.AZURE_STORAGE_ACCOUNT_URL,
+        "container_name": settings.AZURE_CONTAINER,
+        "doc_name": doc_name,
+        "sas_token": sas_token,
+        "document_type": document_type.api_doc_type_text,
+        "sign": document_type.sign,
+        "tfg": True,
+        "uuid": "dasdbahhdjaj",
+        "pattern_validation": document_type.pattern_validation,
+    }
+
+    if document_type.pattern_invalidation is not None:
+        req_params["pattern_invalidation"] = document_type.pattern_invalidation
+    if document_type.id == 4:
+        req_params["sign"] = True
+
+    return req_params
+
+
+def call_validation_endpoint(req_params):
+    """
+    Envía la petición al endpoint externo a través del cliente compartido
+    y devuelve su respuesta JSON.
+
+    Raises:
+        requests.exceptions.RequestException: Si la petición falla
+    """
+    return get_validation_client().validate(req_params)
+
+
+def apply_validation_result(validation, request_details, validation_result):
+    """
+    Vuelca el resultado del endpoint externo sobre la validación:
+    detalles transformados, estado y justificación.
+
+    Args:
+        validation (Validation): Validación a actualizar (no se guarda)
+        request_details (dict): Campos a validar/extraer enviados
+        validation_result (dict): Respuesta del endpoint externo
+    """
+    template = {
+        "fields_to_validate": request_details['fields_to_validate'],
+        "fields_to_extract": request_details['fields_to_extract'],
+    }
+    updated_template = process_api_response(validation_result, template)
+    validation.validation_details = transform_fields(updated_template)
+
+    result = validation_result.get("result")
+    validation.status = (
+        "success" if result == "OK" else
+        "failure" if result == "KO" else
+        "pending"
+    )
+    if result == "KO":
+        validation.justification = validation_result.get("justificacion")
+
+
+def enqueue_validation(validation, request_details):
+    """
+    Encola la validación para que la procese un worker.
+
+    Returns:
+        ValidationJob: Trabajo creado
+    """
+    return ValidationJob.objects.create(validation=validation, request_details=request_details)
+
+
+def claim_next_job(worker_name):
+    """
+    Reclama el siguiente trabajo disponible. SKIP LOCKED permite que varios
+    workers (hilos o procesos) consuman la cola sin bloquearse entre sí.
+
+    Returns:
+        ValidationJob | None: Trabajo reclamado o None si la cola está vacía
+    """
+    with transaction.atomic():
+        job = (ValidationJob.objects
+               .select_for_update(skip_locked=True)
+               .filter(status='queued', available_at__lte=timezone.now())
+               .order_by('available_at', 'created_at')
+               .first())
+        if job is None:
+            return None
+        job.status = 'running'
+        job.attempts += 1
+        job.worker = worker_name
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'attempts', 'worker', 'started_at'])
+    return job
+
+
+def requeue_stale_jobs():
+    """
+    Devuelve a la cola los trabajos 'running' cuyo worker murió sin
+    terminarlos.
+
+    Returns:
+        int: Número de trabajos reencolados
+    """
+    limit = timezone.now() - timedelta(seconds=settings.VALIDATION_JOB_STALE_AFTER)
+    stale = ValidationJob.objects.filter(status='running', started_at__lt=limit)
+    with transaction.atomic():
+        exhausted = list(stale.filter(attempts__gte=settings.VALIDATION_JOB_MAX_ATTEMPTS)
+                         .select_for_update(skip_locked=True)
+                         .values_list('pk', flat=True))
+        for job in ValidationJob.objects.filter(pk__in=exhausted).select_related('validation'):
+            _fail(job, 'Worker interrumpido')
+    return stale.update(status='queued', worker=None, available_at=timezone.now())
+
+
+def run_job(job):
+    """
+    Ejecuta un trabajo reclamado: llama al endpoint externo y actualiza la
+    validación. Los errores de conexión, timeouts, 429 y 5xx se reintentan
+    con espera exponencial hasta VALIDATION_JOB_MAX_ATTEMPTS; el resto de
+    errores (4xx, respuestas no JSON o sin resultado) fallan directamente.
+    """
+    validation = (Validation.objects
+                  .select_related('document__document_type')
+                  .get(pk=job.validation_id))
+    try:
+        req_params = build_validation_request(validation.document, job.request_details)
+        logger.debug(f"Parámetros de validación enviados al endpoint: {req_params}")
+        validation_result = call_validation_endpoint(req_params)
+        apply_validation_result(validation, job.request_details, validation_result)
+        if validation.status == 'pending':
+            raise ValueError(f"Respuesta sin resultado OK/KO (result={validation_result.get('result')!r})")
+    except requests.exceptions.JSONDecodeError as e:
+        # Subclase de RequestException: una respuesta que no es JSON no se
+        # arregla repitiendo la petición
+        logger.error(f"Respuesta no JSON del servicio de validación en el trabajo '{job.id}': {str(e)}")
+        _fail_or_retry(job, str(e), retry=False)
+        return
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error durante la solicitud de validación del trabajo '{job.id}': {str(e)}")
+        _fail_or_retry(job, str(e), retry=is_retryable_request_error(e))
+        return
+    except (TypeError, ValueError, KeyError) as e:
+        logger.error(f"Error al procesar la respuesta del trabajo '{job.id}': {str(e)}")
+        _fail_or_retry(job, str(e), retry=False)
+        return
+
+    with transaction.atomic():
+        validation.save()
+        job.status = 'done'
+        job.error = None
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+    logger.info(f"Validación '{validation.id}' completada con estado '{validation.status}'.")
+
+
+def is_retryable_request_error(error):
+    """
+    Indica si un error de la petición al servicio de validación puede
+    resolverse reintentando el trabajo más tarde.
+
+    Args:
+        error (requests.exceptions.RequestException): Error de la petición
+
+    Returns:
+        bool: True para errores de conexión, timeouts, 429 y 5xx; False para
+        el resto de respuestas 4xx (la petición es incorrecta y fallaría
+        igual) y para errores de la propia petición (URL inválida, etc.)
+    """
+    response = getattr(error, 'response', None)
+    if response is not None:
+        return response.status_code == 429 or response.status_code >= 500
+    return isinstance(error, (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        requests.exceptions.ChunkedEncodingError,
+    ))
+
+
+def _fail_or_retry(job, error, retry=True):
+    if retry and job.attempts < settings.VALIDATION_JOB_MAX_ATTEMPTS:
+        backoff = min(2 ** job.attempts, 60) + random.uniform(0, 1)
+        job.error = error
+        job.status = 'queued'
+        job.available_at = timezone.now() + timedelta(seconds=backoff)
+        job.save(update_fields=['status', 'error', 'available_at'])
+        return
+    _fail(job, error)
+
+
+def _fail(job, error):
+    """
+    Marca el trabajo como fallido definitivamente y su validación como
+    'failure' con el motivo, en la misma transacción: la validación no se
+    queda en 'pending' para siempre.
+    """
+    with transaction.atomic():
+        # save() y no update(): post_save mantiene al día ValidationSummary
+        validation = job.validation
+        validation.status = 'failure'
+        validation.justification = f"No se pudo completar la validación: {error}"
+        validation.save(update_fields=['status', 'justification'])
+        job.status = 'failed'
+        job.error = error
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+    logger.warning(f"Trabajo '{job.id}' fallido definitivamente: {error}")
+
+
+class ValidationWorkerPool:
+    """
+    Pool de hilos que consumen la cola de ValidationJob y las subidas por
+    partes pendientes de completar. Cada hilo reclama un trabajo (o una
+    subida), lo ejecuta y, si no hay nada, espera poll_interval segundos
+    antes de volver a consultar. Otro hilo publica las métricas del cliente
+    del servicio de validación del proceso (WorkerMetrics).
+    """
+
+    def __init__(self, workers=None, poll_interval=None):
+        self.workers = workers or settings.VALIDATION_WORKERS
+        self.poll_interval = poll_interval or settings.VALIDATION_JOB_POLL_INTERVAL
+        self.process = f"{socket.gethostname()}:{os.getpid()}"
+        self.stop_event = threading.Event()
+        self.threads = []
+
+    def start(self):
+        requeue_stale_jobs()
+        requeue_stale_uploads()
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, args=(f"{self.process}:{index}",), name=f"validation-worker-{index}", daemon=True
+            )
+            thread.start()
+            self.threads.append(thread)
+        thread = threading.Thread(target=self._publish_metrics, name='validation-metrics', daemon=True)
+        thread.start()
+        self.threads.append(thread)
+        logger.info(f"Pool de validación iniciado con {self.workers} workers.")
+
+    def stop(self, timeout=None):
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def drain(self):
+        """
+        Procesa trabajos y subidas en el hilo actual hasta vaciar la cola.
+
+        Returns:
+            int: Número de trabajos y subidas procesados
+        """
+        processed = 0
+        name = f"{self.process}:drain"
+        while self._run_next(name):
+            processed += 1
+        publish_metrics(self.process)
+        return processed
+
+    def _run_next(self, name):
+        # Los trabajos de validación van primero; después, las subidas
+        job = claim_next_job(name)
+        if job is not None:
+            run_job(job)
+            return True
+        session = claim_next_upload()
+        if session is not None:
+            finish_upload(session)
+            return True
+        return False
+
+    def _work(self, name):
+        try:
+            while not self.stop_event.is_set():
+                close_old_connections()
+                try:
+                    if not self._run_next(name):
+                        self.stop_event.wait(self.poll_interval)
+                except Exception as e:
+                    logger.exception(f"Error inesperado en el worker '{name}': {str(e)}")
+                    self.stop_event.wait(self.poll_interval)
+        finally:
+            connection.close()
+
+    def _publish_metrics(self):
+        # Publica al arrancar, cada VALIDATION_CLIENT_METRICS_INTERVAL
+        # segundos y una última vez al detener el pool
+        try:
+            while True:
+                close_old_connections()
+                try:
+                    publish_metrics(self.process)
+                except Exception as e:
+                    logger.warning(f"No se pudieron publicar las métricas del proceso '{self.process}': {str(e)}")
+                if self.stop_event.is_set():
+                    break
+                self.stop_event.wait(settings.VALIDATION_CLIENT_METRICS_INTERVAL)
+        finally:
+            connection.close()
@@ -0,0 +1,311 @@
+# tfg_ctaima_app/validation_summary.py
+# Mantenimiento de ValidationSummary, la tabla de lectura del historial de
+# validaciones, y de ValidationDailyStats, el acumulado diario del
+# dashboard. Las filas de resumen se calculan en la base de datos con un
+# único INSERT ... SELECT ... ON CONFLICT DO UPDATE a partir de la
+# validación, su documento y su tipo, así que el alta, la actualización y la
+# reconstrucción completa comparten la misma definición. La misma sentencia
+# resta del acumulado la clave anterior de cada fila y suma la nueva.
+#
+# Se sincroniza desde signals.py al guardar una validación o un documento y
+# al borrar un resumen. bulk_create no lanza señales: quien cree
+# validaciones en bloque (validation_batch.py) debe llamar a
+# sync_validation_summaries.
+#
+# Los cambios de un tipo de documento (nombre o borrado) pueden afectar a
+# millones de filas: se aplican por lotes en un hilo del proceso tras
+# confirmar la transacción (run_in_background), fuera de la petición. Si el
+# proceso muere antes, refresh_validation_summaries deja el resumen al día.
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import Document, DocumentType, Validation, ValidationDailyStats, ValidationSummary
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_COLUMNS = [
+    'validation_id', 'document_id', 'document_name', 'document_type_id', 'document_type_name',
+    'company_id', 'resource_id', 'user_id', 'status', 'timestamp', 'fields_passed', 'fields_failed',
+]
+
+# Un campo a validar pasa si se obtuvo un valor y coincide con el esperado
+# (sin distinguir mayúsculas ni espacios en los extremos), o si no se
+# esperaba un valor concreto. Las validaciones pendientes no cuentan.
+FIELD_PASSED = """
+    coalesce(f.value->>'obtained_value', '') <> ''
+    AND (coalesce(f.value->>'expected_value', '') = ''
+         OR lower(btrim(f.value->>'obtained_value')) = lower(btrim(f.value->>'expected_value')))
+"""
+
+# Día de una validación en la zona horaria de la aplicación
+DAY_SQL = "(({column}) AT TIME ZONE %s)::date"
+
+# Filas de origen de las validaciones que cumplen {condition}
+SOURCE_SQL = """
+    FROM {validation} v
+    JOIN {document} d ON d.id = v.document_id
+    LEFT JOIN {document_type} dt ON dt.id = d.document_type_id
+    WHERE {condition}
+"""
+
+# Bloquea los resúmenes que se van a reescribir. Va en una sentencia previa:
+# dentro del WITH, FOR UPDATE se saltaría las filas que el propio upsert ya
+# hubiera modificado.
+LOCK_SQL = """
+    SELECT 1 FROM {summary} s
+    WHERE s.validation_id IN (SELECT v.id {source})
+    FOR UPDATE OF s
+"""
+
+# Las sub-sentencias de un WITH ven la tabla de resumen antes del upsert:
+# 'previous' lee las claves anteriores y 'written' devuelve las nuevas.
+UPSERT_SQL = """
+    WITH source ({columns}) AS (
+        SELECT v.id, d.id, d.name, d.document_type_id, dt.name,
+               d.company_id, d.resource_id, v.user_id, v.status, v.timestamp,
+               counts.passed, counts.failed
+        FROM {validation} v
+        JOIN {document} d ON d.id = v.document_id
+        LEFT JOIN {document_type} dt ON dt.id = d.document_type_id
+        CROSS JOIN LATERAL (
+            SELECT count(*) FILTER (WHERE {passed}) AS passed,
+                   count(*) FILTER (WHERE NOT ({passed})) AS failed
+            FROM jsonb_array_elements(
+                CASE WHEN v.status <> 'pending' AND jsonb_typeof(v.validation_details->'fields_to_validate') = 'array'
+                     THEN v.validation_details->'fields_to_validate' ELSE '[]'::jsonb END
+            ) f
+        ) counts
+        WHERE {condition}
+    ),
+    previous AS (
+        SELECT s.timestamp, s.document_type_id, s.company_id, s.status
+        FROM {summary} s
+        WHERE s.validation_id IN (SELECT validation_id FROM source)
+    ),
+    written AS (
+        INSERT INTO {summary} ({columns})
+        SELECT * FROM source
+        ON CONFLICT (validation_id) DO UPDATE SET {updates}
+        RETURNING timestamp, document_type_id, company_id, status
+    ),
+    deltas AS (
+        SELECT timestamp, document_type_id, company_id, status, 1 AS delta FROM written
+        UNION ALL
+        SELECT timestamp, document_type_id, company_id, status, -1 FROM previous
+    )
+    INSERT INTO {stats} (day, document_type_id, company_id, status, count)
+    SELECT {day}, document_type_id, company_id, status, sum(delta)
+    FROM deltas
+    GROUP BY 1, 2, 3, 4
+    HAVING sum(delta) <> 0
+    ON CONFLICT (day, document_type_id, company_id, status)
+    DO UPDATE SET count = {stats}.count + EXCLUDED.count
+"""
+
+REBUILD_STATS_SQL = """
+    INSERT INTO {stats} (day, document_type_id, company_id, status, count)
+    SELECT {day}, d.document_type_id, d.company_id, v.status, count(*)
+    FROM {validation} v
+    JOIN {document} d ON d.id = v.document_id
+    GROUP BY 1, 2, 3, 4
+"""
+
+REMOVE_SQL = """
+    UPDATE {stats} SET count = count - 1
+    WHERE day = {day} AND document_type_id IS NOT DISTINCT FROM %s
+      AND company_id IS NOT DISTINCT FROM %s AND status = %s
+"""
+
+
+def _tables():
+    quote = connection.ops.quote_name
+    return {
+        'summary': quote(ValidationSummary._meta.db_table),
+        'stats': quote(ValidationDailyStats._meta.db_table),
+        'validation': quote(Validation._meta.db_table),
+        'document': quote(Document._meta.db_table),
+        'document_type': quote(DocumentType._meta.db_table),
+    }
+
+
+def _upsert(condition, params):
+    """
+    Crea o actualiza las filas de resumen de las validaciones que cumplen
+    la condición (sobre los alias v, d y dt de UPSERT_SQL) y aplica la
+    diferencia al acumulado diario.
+    """
+    quote = connection.ops.quote_name
+    tables = _tables()
+    lock_sql = LOCK_SQL.format(**tables, source=SOURCE_SQL.format(**tables, condition=condition))
+    sql = UPSERT_SQL.format(
+        **tables,
+        columns=', '.join(quote(column) for column in SUMMARY_COLUMNS),
+        passed=FIELD_PASSED,
+        condition=condition,
+        updates=', '.join(f'{quote(column)} = EXCLUDED.{quote(column)}' for column in SUMMARY_COLUMNS[1:]),
+        day=DAY_SQL.format(column='timestamp'),
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(lock_sql, params)
+        cursor.execute(sql, [*params, settings.TIME_ZONE])
+
+
+def sync_validation_summaries(validation_ids):
+    """
+    Sincroniza el resumen de las validaciones indicadas.
+
+    Args:
+        validation_ids (list): Ids de las validaciones creadas o modificadas
+    """
+    validation_ids = [str(pk) for pk in validation_ids]
+    if validation_ids:
+        _upsert('v.id = ANY(%s::uuid[])', [validation_ids])
+
+
+def sync_document_summaries(document_id):
+    # Nombre, tipo, compañía o recurso del documento pueden haber cambiado
+    _upsert('v.document_id = %s', [str(document_id)])
+
+
+def sync_document_type_name(document_type_id, batch_size=5000):
+    """
+    Copia el nombre actual de un tipo de documento a sus filas de resumen,
+    por lotes. El nombre no forma parte de la clave del acumulado diario.
+
+    Returns:
+        int: Filas actualizadas
+    """
+    name = DocumentType.objects.filter(pk=document_type_id).values_list('name', flat=True).first()
+    if name is None:
+        return 0
+    summary = _tables()['summary']
+    sql = f"""
+        UPDATE {summary} SET document_type_name = %s
+        WHERE validation_id IN (
+            SELECT validation_id FROM {summary}
+            WHERE document_type_id = %s AND document_type_name IS DISTINCT FROM %s
+            LIMIT %s
+        )
+    """
+    total = 0
+    with connection.cursor() as cursor:
+        while True:
+            cursor.execute(sql, [name, document_type_id, name, batch_size])
+            if not cursor.rowcount:
+                break
+            total += cursor.rowcount
+    return total
+
+
+def sync_deleted_document_type(document_type_id, batch_size=5000):
+    """
+    Resincroniza, por lotes, los resúmenes que aún apuntan a un tipo de
+    documento borrado. Sus documentos pasaron al tipo por defecto con un
+    UPDATE (SET_DEFAULT), que no lanza post_save.
+
+    Returns:
+        int: Validaciones sincronizadas
+    """
+    total = 0
+    while True:
+        ids = list(ValidationSummary.objects
+                   .filter(document_type_id=document_type_id)
+                   .order_by()
+                   .values_list('validation_id', flat=True)[:batch_size])
+        if not ids:
+            break
+        sync_validation_summaries(ids)
+        total += len(ids)
+    return total
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _run(func, *args):
+    try:
+        rows = func(*args)
+        logger.info(f"{func.__name__}{args}: {rows} filas de resumen sincronizadas.")
+    except Exception as e:
+        logger.exception(f"Error en {func.__name__}{args}: {str(e)}")
+    finally:
+        connection.close()
+
+
+def run_in_background(func, *args):
+    """
+    Ejecuta func(*args) en el hilo de sincronización del proceso cuando se
+    confirme la transacción en curso (o en el momento, si no hay ninguna).
+    """
+    def submit():
+        global _executor
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='summary-sync')
+        _executor.submit(_run, func, *args)
+
+    transaction.on_commit(submit)
+
+
+def remove_summary_from_stats(summary):
+    """
+    Descuenta del acumulado diario un resumen borrado (al borrar su
+    validación).
+
+    Args:
+        summary (ValidationSummary): Fila borrada
+    """
+    sql = REMOVE_SQL.format(**_tables(), day=DAY_SQL.format(column='%s'))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [summary.timestamp, settings.TIME_ZONE, summary.document_type_id,
+                             summary.company_id, summary.status])
+
+
+def rebuild_validation_summaries(batch_size=5000):
+    """
+    Reconstruye el resumen de todas las validaciones por lotes de ids, cada
+    lote en su propia sentencia. Como cada lote ajusta el acumulado con las
+    claves anteriores, el acumulado sigue siendo coherente; rebuild_daily_stats
+    lo recalcula desde cero.
+
+    Returns:
+        int: Validaciones sincronizadas
+    """
+    total = 0
+    last_id = None
+    while True:
+        ids = Validation.objects.order_by('pk')
+        if last_id is not None:
+            ids = ids.filter(pk__gt=last_id)
+        ids = list(ids.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+        sync_validation_summaries(ids)
+        total += len(ids)
+        last_id = ids[-1]
+        logger.debug(f"Resumen de validaciones: {total} filas sincronizadas.")
+    return total
+
+
+def rebuild_daily_stats():
+    """
+    Recalcula ValidationDailyStats desde las validaciones. La tabla se
+    bloquea frente a escrituras mientras tanto: los incrementos de otras
+    transacciones esperan y se aplican sobre el resultado nuevo.
+
+    Returns:
+        int: Filas del acumulado
+    """
+    tables = _tables()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {tables['stats']} IN SHARE ROW EXCLUSIVE MODE")
+        cursor.execute(f"DELETE FROM {tables['stats']}")
+        cursor.execute(REBUILD_STATS_SQL.format(**tables, day=DAY_SQL.format(column='v.timestamp')),
+                       [settings.TIME_ZONE])
+        return cursor.rowcount
@@ -8,5 +8,6 @@ from .company_views import CompanyViewSet
 from .resource_views import ResourceViewSet, EmployeeViewSet, VehicleViewSet
 from .validation_views import ValidationViewSet
 from .log_views import LogViewSet
+from .autocomplete_views import AutocompleteViewSet
 
 # Puedes agregar otros imports de vistas según sea necesario
\ No newline at end of file
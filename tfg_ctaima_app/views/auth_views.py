@@ -9,7 +9,8 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-from ..models import Log, EventType
+from ..models import EventType
+from .. import audit
 from ..serializers import UserSerializer  # Asegúrate de que el serializer esté correctamente importado
 
 # Configuración del logger
@@ -45,10 +46,12 @@ def login_view(request):
     user = authenticate(request, username=username, password=password)
     if user is not None:
         login(request, user)
-        Log.objects.create(
-            user=request.user,
-            event=EventType.LOGIN,
-            details=f'User {user.username} logged in successfully.'
+        audit.record(
+            request.user,
+            EventType.LOGIN,
+            f'User {user.username} logged in successfully.',
+            entity_type=EventType.LOGIN.entity_type,
+            entity_id=user.id
         )
         logger.info(f"Usuario '{user.username}' inició sesión exitosamente.")
         return Response({'message': f'Bienvenido {user.username}!'}, status=status.HTTP_200_OK)
@@ -63,10 +66,12 @@ def logout_view(request):
     """
     Vista para manejar el logout de usuarios.
     """
-    Log.objects.create(
-        user=request.user,
-        event=EventType.LOGOUT,
-        details='User logged out successfully.'
+    audit.record(
+        request.user,
+        EventType.LOGOUT,
+        'User logged out successfully.',
+        entity_type=EventType.LOGOUT.entity_type,
+        entity_id=request.user.id
     )
     logger.info(f"Usuario '{request.user.username}' cerró sesión.")
 
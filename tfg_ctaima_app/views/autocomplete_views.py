@@ -0,0 +1,102 @@
+# tfg_ctaima_app/views/autocomplete_views.py
+# Autocompletado del formulario de subida: pares {id, label} de compañías y
+# recursos a partir de lo tecleado. Cada petición es una consulta por
+# prefijo sobre los índices GIN de search_vector (ver search.py), limitada a
+# unos pocos resultados, y la respuesta se guarda unos segundos en caché.
+
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_cache_control
+
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..models import Company, Resource
+from ..search import WORD_PATTERN, search_queryset, search_resources
+
+logger = logging.getLogger(__name__)
+
+
+def company_label(row):
+    return f"{row['company_name']} ({row['company_id']})"
+
+
+def resource_label(row):
+    if row['resource_type'] == 'vehicle':
+        return f"{row['vehicle__name']} ({row['vehicle__registration_id']})"
+    return f"{row['employee__first_name']} {row['employee__last_name']} ({row['employee__worker_id']})"
+
+
+class AutocompleteViewSet(viewsets.ViewSet):
+    """
+    /api/autocomplete/companies/?q=<texto>&limit=<n>
+    /api/autocomplete/resources/?q=<texto>&limit=<n>
+
+    Devuelve una lista de {id, label} ordenada por relevancia. Sin texto, o
+    con menos de AUTOCOMPLETE_MIN_LENGTH caracteres, devuelve una lista vacía
+    sin consultar la base de datos.
+    """
+    permission_classes = [IsAuthenticated]
+    query_param = 'q'
+    limit_query_param = 'limit'
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return settings.AUTOCOMPLETE_LIMIT
+        return min(limit, settings.AUTOCOMPLETE_MAX_LIMIT) if limit > 0 else settings.AUTOCOMPLETE_LIMIT
+
+    def respond(self, request, kind, lookup):
+        """
+        Resuelve la petición desde la caché o con lookup(text, limit).
+
+        Args:
+            request (Request): Petición
+            kind (str): Entidad buscada, parte de la clave de caché
+            lookup (callable): Devuelve la lista de {id, label}
+
+        Returns:
+            Response: Lista de {id, label}
+        """
+        # Textos con las mismas palabras dan la misma consulta y la misma entrada de caché
+        text = ' '.join(WORD_PATTERN.findall(request.query_params.get(self.query_param, '').lower()))
+        limit = self.get_limit(request)
+        if len(text) < max(1, settings.AUTOCOMPLETE_MIN_LENGTH):
+            return Response([])
+
+        cache = caches[settings.AUTOCOMPLETE_CACHE_ALIAS]
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        key = f"autocomplete:{settings.ENVIRONMENT}:{kind}:{limit}:{digest}"
+        results = cache.get(key)
+        if results is None:
+            results = lookup(text, limit)
+            cache.set(key, results, timeout=settings.AUTOCOMPLETE_CACHE_TTL)
+        logger.debug(f"Autocompletado de {kind} con '{text}': {len(results)} resultados.")
+
+        response = Response(results)
+        patch_cache_control(response, private=True, max_age=settings.AUTOCOMPLETE_CACHE_TTL)
+        return response
+
+    @action(detail=False, methods=['get'], url_path='companies')
+    def companies(self, request):
+        def lookup(text, limit):
+            rows = search_queryset(Company.objects.all(), text).values('id', 'company_name', 'company_id')[:limit]
+            return [{'id': str(row['id']), 'label': company_label(row)} for row in rows]
+        return self.respond(request, 'companies', lookup)
+
+    @action(detail=False, methods=['get'], url_path='resources')
+    def resources(self, request):
+        def lookup(text, limit):
+            rows = search_resources(Resource.objects.all(), text).values(
+                'id', 'resource_type',
+                'employee__first_name', 'employee__last_name', 'employee__worker_id',
+                'vehicle__name', 'vehicle__registration_id',
+            )[:limit]
+            return [{'id': str(row['id']), 'label': resource_label(row)} for row in rows]
+        return self.respond(request, 'resources', lookup)
@@ -10,7 +10,7 @@ from rest_framework.response import Response
 from ..models import Company, Document, Log, EventType
 from ..serializers import CompanySerializer, DocumentSerializer
 
-from .filters import CompanyFilter
+from .filters import CompanyFilter, FullTextSearchFilter
 from .decorators import log_event
 from .pagination import StandardResultsSetPagination
 
@@ -19,8 +19,8 @@ logger = logging.getLogger(__name__)
 class CompanyViewSet(viewsets.ModelViewSet):
     queryset = Company.objects.all().order_by('-timestamp')
     serializer_class = CompanySerializer
-    filter_backends = [rest_framework_filters.SearchFilter, rest_framework_filters.OrderingFilter]
-    search_fields = ['company_name', 'company_id']
+    # ?search= busca en company_name y company_id (Company.search_vector)
+    filter_backends = [rest_framework_filters.OrderingFilter, FullTextSearchFilter]
     filterset_class = CompanyFilter
     ordering_fields = ['timestamp']
     permission_classes = [IsAuthenticated]
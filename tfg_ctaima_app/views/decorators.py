@@ -1,7 +1,8 @@
 # app1/views/decorators.py
 
 from functools import wraps
-from ..models import Log, EventType
+from ..models import EventType
+from .. import audit
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,16 +17,24 @@ def log_event(event_type):
         @wraps(func)
         def wrapper(self, request, *args, **kwargs):
             response = func(self, request, *args, **kwargs)
-            if response.status_code in [200, 201, 204]:
-                try:
-                    instance_info = response.data.get('id') or response.data.get('name') or 'N/A'
-                except AttributeError:
-                    instance_info = 'N/A'
+            if response.status_code in [200, 201, 202, 204]:
+                data = getattr(response, 'data', None)
+                data = data if isinstance(data, dict) else {}
+                entity_id = data.get('id') or kwargs.get('pk')
+                instance_info = entity_id or data.get('name') or 'N/A'
                 details = f"User '{request.user.username}' performed '{event_type}' on '{instance_info}'."
-                Log.objects.create(
-                    user=request.user,
-                    event=event_type,
-                    details=details
+                audit.record(
+                    request.user,
+                    event_type,
+                    details,
+                    entity_type=event_type.entity_type,
+                    entity_id=entity_id or None,
+                    payload={
+                        'method': request.method,
+                        'path': request.path,
+                        'status_code': response.status_code,
+                        'name': data.get('name'),
+                    },
                 )
                 logger.info(details)
             return response
@@ -1,59 +1,149 @@
 # # tfg_ctaima_app/views/document_views.py
 
 import os
-import json
+import time
 import logging
+import mimetypes
 from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.db import transaction
-from django.http import StreamingHttpResponse, JsonResponse
+from django.utils import timezone
+from django.http import (
+    StreamingHttpResponse, JsonResponse, HttpResponse, HttpResponseNotModified, HttpResponseRedirect
+)
 
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status, filters as rest_framework_filters
 from rest_framework.decorators import action, permission_classes, api_view
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from azure.storage.blob import BlobSasPermissions
 
-from azure.storage.blob import BlobClient, BlobSasPermissions
-
-from ..models import Document, Validation, Log, EventType, Resource
-from ..serializers import DocumentSerializer, ValidationSerializer, LogSerializer
-from .filters import DocumentFilter
+from ..models import Document, Validation, Log, EventType, Resource, UploadSession
+from ..serializers import (
+    DocumentSerializer, ValidationSerializer, LogSerializer, UploadInitiateSerializer, UploadSessionSerializer
+)
+from .filters import DocumentFilter, FullTextSearchFilter
 from .pagination import StandardResultsSetPagination
-from ..utils import upload_to_blob_storage, calculate_file_hash, generate_sas_token
+from ..storage import get_storage, document_blob_name, StreamingUpload
+from ..uploads import (
+    UploadError, build_document_data, initiate_upload, store_part, request_completion, discard_upload
+)
+from ..utils import generate_sas_token
 from .decorators import log_event
 from ..renderers import NoOpRenderer  # Asegúrate de la ruta correcta
+from ..exports import EXPORT_CONTENT_TYPES, EXPORT_FORMAT_PARAM, DOCUMENT_EXPORT_COLUMNS, export_response
 
 logger = logging.getLogger(__name__)
 
+# Los documentos se guardan por hash de contenido: el contenido de una URL
+# no cambia nunca, así que el navegador puede guardarlo en caché sin
+# revalidar. 'private' porque la descarga requiere sesión.
+DOCUMENT_CACHE_CONTROL = 'private, max-age=31536000, immutable'
+
+
+def parse_range_header(header, size):
+    """
+    Interpreta una cabecera Range de un único rango de bytes.
+
+    Args:
+        header (str): Valor de la cabecera (p. ej. 'bytes=0-1023')
+        size (int): Tamaño total del objeto
+
+    Returns:
+        tuple[int, int] | None: (inicio, fin inclusive) del rango, o None si
+        la cabecera no es un rango simple o es inválida (p. ej. fin menor
+        que inicio) y debe servirse el objeto entero
+
+    Raises:
+        ValueError: Si el rango no es satisfacible (empieza en el final del
+        objeto o más allá)
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, sep, last = (part.strip() for part in spec.partition('-'))
+    if not sep or not (first or last) or not all(part.isdigit() for part in (first, last) if part):
+        return None
+    if not first:
+        # Sufijo: los últimos N bytes
+        if int(last) == 0 or size == 0:
+            raise ValueError(header)
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        # Rango inválido (RFC 9110): se ignora la cabecera
+        return None
+    if start >= size:
+        raise ValueError(header)
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def etag_matches(header, etag):
+    if header.strip() == '*':
+        return True
+    candidates = [value.strip() for value in header.split(',')]
+    # If-None-Match usa comparación débil: se ignora el prefijo W/
+    return any(candidate.removeprefix('W/') == etag for candidate in candidates)
+
+
 class DocumentRetrieveView(APIView):
     permission_classes = [IsAuthenticated]
     renderer_classes = [NoOpRenderer]  # Utilizamos nuestro renderizador que acepta cualquier media
 
     def get(self, request, pk):
         try:
-            document = Document.objects.get(pk=pk)
-            _, ext = os.path.splitext(document.name)
-            blob_name = f"{settings.ENVIRONMENT}/{document.file_hash}{ext}"
+            document = Document.objects.only('name', 'file_hash').get(pk=pk)
+            etag = f'"{document.file_hash}"' if document.file_hash else None
 
-            sas_token = generate_sas_token(blob_name, BlobSasPermissions(read=True))
+            if etag and etag_matches(request.headers.get('If-None-Match', ''), etag):
+                response = HttpResponseNotModified()
+                response['ETag'] = etag
+                response['Cache-Control'] = DOCUMENT_CACHE_CONTROL
+                return response
 
+            storage = get_storage()
+            blob_name = document_blob_name(document.file_hash, document.name)
+            content_type = mimetypes.guess_type(document.name)[0] or 'application/octet-stream'
+            content_disposition = f'attachment; filename="{document.name}"'
 
-            blob_client = BlobClient(
-                account_url=f"https://{settings.AZURE_ACCOUNT_NAME}.blob.core.windows.net",
-                container_name=settings.AZURE_CONTAINER,
-                blob_name=f"{blob_name}",
-                credential=f'{sas_token}'
-            )
+            mode = self.get_download_mode(request)
+            if mode != 'proxy' and storage.supports_direct_urls:
+                return self.direct_download(request, document, blob_name, mode, content_type, content_disposition)
 
-            stream = blob_client.download_blob()
+            byte_range = None
+            range_header = request.headers.get('Range')
+            if_range = request.headers.get('If-Range')
+            # If-Range: si el cliente tiene otra versión se sirve el documento entero
+            if range_header and (not if_range or if_range == etag):
+                total_size = storage.size(blob_name)
+                try:
+                    byte_range = parse_range_header(range_header, total_size)
+                except ValueError:
+                    response = HttpResponse(status=416)
+                    response['Content-Range'] = f'bytes */{total_size}'
+                    return response
+
+            if byte_range:
+                start, end = byte_range
+                stream = storage.download(blob_name, offset=start, length=end - start + 1)
+            else:
+                stream = storage.download(blob_name)
 
             response = StreamingHttpResponse(
                 streaming_content=stream.chunks(),
-                content_type='application/octet-stream'
+                content_type=content_type,
+                status=206 if byte_range else 200
             )
             response['Content-Length'] = stream.size
-            response['Content-Disposition'] = f'attachment; filename="{document.name}"'
+            response['Accept-Ranges'] = 'bytes'
+            response['Content-Disposition'] = content_disposition
+            if byte_range:
+                response['Content-Range'] = f'bytes {byte_range[0]}-{byte_range[1]}/{stream.total_size}'
+            if etag:
+                response['ETag'] = etag
+                response['Cache-Control'] = DOCUMENT_CACHE_CONTROL
             logger.info(f"User {request.user.username} downloaded document {document.name}")
             return response
 
@@ -64,12 +154,58 @@ class DocumentRetrieveView(APIView):
             logger.error(f"Error al descargar el documento {pk}: {str(e)}")
             return Response({"error": f"Error al descargar el documento: {str(e)}"}, status=500)
 
+    def get_download_mode(self, request):
+        """
+        Modo de descarga según DOCUMENT_DOWNLOAD_MODE. Si el despliegue no
+        usa 'proxy', un GET sin más se redirige siempre al almacenamiento
+        para que quien espera los bytes (visor de PDF, descargas con
+        responseType 'blob') los siga recibiendo; el JSON con la URL firmada
+        solo se devuelve si el cliente lo pide con ?delivery=url.
+        """
+        mode = settings.DOCUMENT_DOWNLOAD_MODE
+        if mode == 'proxy':
+            return mode
+        if request.query_params.get('delivery') == 'url':
+            return 'url'
+        return 'redirect'
+
+    def direct_download(self, request, document, blob_name, mode, content_type, content_disposition):
+        """
+        Entrega el documento sin que sus bytes pasen por la aplicación: firma
+        un token SAS de solo lectura y corta duración y redirige al
+        almacenamiento (302) o devuelve la URL firmada en JSON.
+        """
+        sas_token, expires_at = generate_sas_token(
+            blob_name,
+            BlobSasPermissions(read=True),
+            expiry_seconds=settings.DOCUMENT_DOWNLOAD_SAS_TTL,
+            with_expiry=True,
+            content_disposition=content_disposition,
+            content_type=content_type,
+        )
+        url = get_storage().url(blob_name, sas_token)
+        logger.info(f"User {request.user.username} downloaded document {document.name} via {mode}")
+
+        if mode == 'url':
+            response = JsonResponse({
+                'url': url,
+                'name': document.name,
+                # Vida real del token: si viene de la caché puede quedarle
+                # bastante menos que DOCUMENT_DOWNLOAD_SAS_TTL
+                'expires_in': max(0, int(expires_at - time.time())),
+            })
+        else:
+            response = HttpResponseRedirect(url)
+        # La URL firmada caduca: la respuesta no debe guardarse en caché
+        response['Cache-Control'] = 'private, no-store'
+        return response
+
 
 class DocumentViewSet(viewsets.ModelViewSet):
     queryset = Document.objects.all().select_related('document_type', 'user', 'resource', 'company').order_by('-timestamp')
     serializer_class = DocumentSerializer
-    filter_backends = [rest_framework_filters.SearchFilter, rest_framework_filters.OrderingFilter]
-    search_fields = ['name', 'id']
+    # ?search= busca en el nombre y el id (Document.search_vector)
+    filter_backends = [rest_framework_filters.OrderingFilter, FullTextSearchFilter, DjangoFilterBackend]
     ordering_fields = ['timestamp', 'name', 'id']
     ordering = ['-timestamp', '-id']
     filterset_class = DocumentFilter
@@ -80,6 +216,15 @@ class DocumentViewSet(viewsets.ModelViewSet):
         self.permission_classes = [IsAuthenticated]
         return super(DocumentViewSet, self).get_permissions()
 
+    def duplicate_response(self, existing_document, user, filename):
+        serializer = self.get_serializer(existing_document)
+        response_data = {
+            'detail': 'A document with the same content already exists.',
+            'document': serializer.data
+        }
+        logger.info(f"Duplicate document upload attempt by {user.username}: {filename}")
+        return Response(response_data, status=status.HTTP_409_CONFLICT)
+
     @log_event(EventType.CREATE_DOCUMENT)
     @transaction.atomic
     def create(self, request, *args, **kwargs):
@@ -88,77 +233,145 @@ class DocumentViewSet(viewsets.ModelViewSet):
             logger.error(f"File not provided in the upload attempt by {request.user.username}.")
             return Response({"error": "File is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        file_hash = calculate_file_hash(uploaded_file)
         filename = uploaded_file.name
-        _, ext = os.path.splitext(filename)
-        blob_name = f"{settings.ENVIRONMENT}/{file_hash}{ext}"
+        # Una sola lectura del fichero: se calcula el hash mientras se suben
+        # los bloques, y solo se confirman si el documento no es duplicado.
+        upload = StreamingUpload()
+        try:
+            file_hash = upload.feed(uploaded_file)
+        except Exception as e:
+            logger.error(f"Error uploading file: {str(e)}")
+            return Response({"error": f"Error uploading file: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         existing_document = Document.objects.filter(file_hash=file_hash).first()
         if existing_document:
-            serializer = self.get_serializer(existing_document)
-            response_data = {
-                'detail': 'A document with the same content already exists.',
-                'document': serializer.data
-            }
-            logger.info(f"Duplicate document upload attempt by {request.user.username}: {filename}")
-            return Response(response_data, status=status.HTTP_409_CONFLICT)
+            upload.discard()
+            return self.duplicate_response(existing_document, request.user, filename)
 
         try:
-            blob_url = upload_to_blob_storage(uploaded_file, blob_name)
+            blob_url = upload.commit(document_blob_name(file_hash, filename))
         except Exception as e:
             logger.error(f"Error uploading file: {str(e)}")
             return Response({"error": f"Error uploading file: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        # Primero, aseguramos que 'associated_entity' sea una lista.
-        associated_entities_json = request.data.get('associated_entities', None)
-        print('associated_entities_json:', associated_entities_json)
-        associated_entities = json.loads(associated_entities_json)
-        if not associated_entities:
-            associated_entities = ['resource']
-        elif isinstance(associated_entities, str):
-            # Si solo se envía un string, lo convertimos a lista.
-            associated_entities = [associated_entities]
-
-        data = {
-            'document_type': request.data.get('document_type'),
-            'url': blob_url,
-            'name': filename,
-            'file_hash': file_hash,
-            'user': request.user.id
-        }
-
-        # Si se requiere la compañía, la asignamos desde el request
-        if 'company' in associated_entities:
-            company_value = request.data.get('company')
-            if company_value:
-                data['company'] = company_value
-
-        # Si se requiere el recurso, lo buscamos y asignamos
-        if 'resource' in associated_entities:
-            resource_id = request.data.get('resource')
-            # No deberia pasar nunca, ya que al crear el documento el campo company es obligatorio
-            if resource_id:
-                resource = get_object_or_404(Resource, pk=resource_id)
-                data['resource'] = resource.id
-               
-
-
+        data = build_document_data(request.data, request.user, filename, file_hash, blob_url)
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
         document = serializer.save()
         logger.info(f"Document '{document.name}' created by {request.user.username}")
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=['get'], url_path='export', permission_classes=[IsAuthenticated])
+    def export(self, request):
+        """
+        Exporta los documentos filtrados en streaming, con los mismos filtros
+        que el listado (?search=, ?ordering= y DocumentFilter).
+        ?export_format=csv (por defecto) o jsonl.
+        """
+        export_format = request.query_params.get(EXPORT_FORMAT_PARAM, 'csv')
+        if export_format not in EXPORT_CONTENT_TYPES:
+            return Response({'error': f"Formato de exportación no válido: '{export_format}'."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        queryset = self.filter_queryset(Document.objects.all())
+        logger.info(f"Usuario '{request.user.username}' exportó documentos en formato {export_format}.")
+        return export_response(queryset, DOCUMENT_EXPORT_COLUMNS, export_format, 'documents')
+
+    # ------------------------------------------------------------------
+    # Subida por partes reanudable:
+    #   POST   /api/document/uploads/                       -> inicia la sesión
+    #   PUT    /api/document/uploads/{id}/parts/{n}/        -> sube la parte n
+    #   GET    /api/document/uploads/{id}/                  -> partes recibidas/pendientes
+    #   POST   /api/document/uploads/{id}/complete/         -> crea el documento
+    #   DELETE /api/document/uploads/{id}/                  -> aborta la subida
+    # ------------------------------------------------------------------
+    @action(detail=False, methods=['post'], url_path='uploads')
+    def uploads(self, request):
+        serializer = UploadInitiateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            session = initiate_upload(
+                request.user, data['filename'], data['size'], serializer.get_metadata(), data.get('part_size')
+            )
+        except UploadError as e:
+            return Response({"error": e.message}, status=e.status_code)
+        logger.info(f"Upload session '{session.id}' started by {request.user.username} for {session.filename}")
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get', 'delete'], url_path=r'uploads/(?P<upload_id>[0-9a-fA-F-]{36})')
+    def upload_session(self, request, upload_id=None):
+        session = get_object_or_404(UploadSession, pk=upload_id, user=request.user)
+        if request.method == 'GET':
+            return Response(UploadSessionSerializer(session).data)
+
+        # Solo se aborta una sesión que ningún worker está completando
+        aborted = (UploadSession.objects
+                   .filter(pk=session.pk, status__in=['active', 'completing'])
+                   .update(status='aborted', updated_at=timezone.now()))
+        if not aborted:
+            session.refresh_from_db(fields=['status'])
+            return Response({"error": f"La subida está en estado '{session.status}'."}, status=status.HTTP_409_CONFLICT)
+        try:
+            discard_upload(session)
+        except Exception as e:
+            logger.error(f"Error al abortar la subida '{session.id}': {str(e)}")
+            return Response({"error": f"Error aborting upload: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        logger.info(f"Upload session '{session.id}' aborted by {request.user.username}")
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['put'],
+            url_path=r'uploads/(?P<upload_id>[0-9a-fA-F-]{36})/parts/(?P<part_number>[0-9]+)')
+    def upload_part(self, request, upload_id=None, part_number=None):
+        session = get_object_or_404(UploadSession, pk=upload_id, user=request.user)
+        # El cuerpo es el contenido binario de la parte; se lee del stream
+        # sin pasar por los parsers ni por los ficheros temporales de Django.
+        try:
+            part = store_part(session, int(part_number), request.stream, request.headers.get('X-Content-SHA256'))
+        except UploadError as e:
+            return Response({"error": e.message}, status=e.status_code)
+        except Exception as e:
+            logger.error(f"Error uploading part {part_number} of '{session.id}': {str(e)}")
+            return Response({"error": f"Error uploading part: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response({'part_number': int(part_number), **part})
+
+    @action(detail=False, methods=['post'], url_path=r'uploads/(?P<upload_id>[0-9a-fA-F-]{36})/complete')
+    def upload_complete(self, request, upload_id=None):
+        """
+        Acepta la sesión para completarla en segundo plano (202). El cliente
+        consulta GET /api/document/uploads/{id}/ hasta que el estado sea
+        'completed' (document es el documento creado o, con duplicate, el
+        que ya existía) o vuelva a 'active' con error.
+        """
+        session = get_object_or_404(UploadSession, pk=upload_id, user=request.user)
+        # Los datos del documento se validan ya, con un hash provisional,
+        # para que un error de datos se devuelva en esta misma petición.
+        placeholder_hash = '0' * 64
+        data = build_document_data(
+            session.metadata, request.user, session.filename, placeholder_hash,
+            get_storage().url(document_blob_name(placeholder_hash, session.filename))
+        )
+        self.get_serializer(data=data).is_valid(raise_exception=True)
+
+        try:
+            session = request_completion(session)
+        except UploadError as e:
+            return Response({"error": e.message}, status=e.status_code)
+        logger.info(f"Upload session '{session.id}' queued for completion by {request.user.username}")
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_202_ACCEPTED)
+
     @action(detail=True, methods=['get'], url_path='validations', permission_classes=[IsAuthenticated])
     def validations(self, request, pk=None):
         document = self.get_object()
-        validations = Validation.objects.filter(document=document).select_related('user')
+        validations = ValidationSerializer.setup_eager_loading(Validation.objects.filter(document=document))
         serializer = ValidationSerializer(validations, many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['get'], url_path='logs', permission_classes=[IsAuthenticated])
     def logs(self, request, pk=None):
         document = self.get_object()
-        logs = Log.objects.filter(details__icontains=f"'{document.id}'").select_related('user')
+        logs = (Log.objects
+                .filter(entity_type=EventType.CREATE_DOCUMENT.entity_type, entity_id=str(document.id))
+                .select_related('user')
+                .order_by('-timestamp'))
         serializer = LogSerializer(logs, many=True)
         return Response(serializer.data)
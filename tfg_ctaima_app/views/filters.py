@@ -1,7 +1,30 @@
 # tfg_ctaima_app/views/filters.py
 
 from django_filters import rest_framework as filters
-from ..models import Document, Validation, Resource, Company
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from ..models import Document, Validation, ValidationSummary, Resource, Company, Log
+from ..search import search_queryset
+from .pagination import KeysetPagination
+
+
+def rank_search_results(request):
+    # La relevancia solo ordena si no se pide otra ordenación ni se pagina por cursor
+    return not request.query_params.get(api_settings.ORDERING_PARAM) and not KeysetPagination.requested(request)
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    ?search= sobre la columna search_vector del modelo (ver search.py), con
+    los resultados ordenados por relevancia. Debe ir después de
+    OrderingFilter en filter_backends para que su ordenación prevalezca.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        return search_queryset(queryset, text, rank=rank_search_results(request))
+
 
 class DocumentFilter(filters.FilterSet):
     id__in = filters.BaseInFilter(field_name='id', lookup_expr='in')
@@ -26,6 +49,22 @@ class ValidationFilter(filters.FilterSet):
         model = Validation
         fields = []
 
+class ValidationSummaryFilter(filters.FilterSet):
+    # Mismos parámetros que ValidationFilter, sobre las columnas de ValidationSummary
+    document_type = filters.NumberFilter(field_name='document_type_id', lookup_expr='exact')
+    document_id = filters.UUIDFilter(field_name='document_id', lookup_expr='exact')
+    validation_id = filters.UUIDFilter(field_name='validation', lookup_expr='exact')
+    start_date = filters.DateTimeFilter(field_name='timestamp', lookup_expr='gte')
+    end_date = filters.DateTimeFilter(field_name='timestamp', lookup_expr='lte')
+    resource_id = filters.UUIDFilter(field_name='resource_id', lookup_expr='exact')
+    company_id = filters.UUIDFilter(field_name='company_id', lookup_expr='exact')
+    status = filters.CharFilter(field_name='status', lookup_expr='exact')
+    user_id = filters.NumberFilter(field_name='user_id', lookup_expr='exact')
+
+    class Meta:
+        model = ValidationSummary
+        fields = []
+
 class ResourceFilter(filters.FilterSet):
     id__in = filters.BaseInFilter(field_name='id', lookup_expr='in')
     company__in = filters.BaseInFilter(field_name='company', lookup_expr='in')
@@ -42,4 +81,17 @@ class CompanyFilter(filters.FilterSet):
 
     class Meta:
         model = Company
-        fields = ['id__in']
\ No newline at end of file
+        fields = ['id__in']
+
+
+class LogFilter(filters.FilterSet):
+    entity_type = filters.CharFilter(field_name='entity_type', lookup_expr='exact')
+    entity_id = filters.CharFilter(field_name='entity_id', lookup_expr='exact')
+    event = filters.CharFilter(field_name='event', lookup_expr='exact')
+    user_id = filters.CharFilter(field_name='user', lookup_expr='exact')
+    start_date = filters.DateTimeFilter(field_name='timestamp', lookup_expr='gte')
+    end_date = filters.DateTimeFilter(field_name='timestamp', lookup_expr='lte')
+
+    class Meta:
+        model = Log
+        fields = []
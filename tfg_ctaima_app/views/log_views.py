@@ -1,6 +1,7 @@
 # app1/views/log_views.py
 
 import logging
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
@@ -8,14 +9,18 @@ from rest_framework.response import Response
 from ..models import Log, EventType
 from ..serializers import LogSerializer
 from .decorators import log_event
+from .filters import LogFilter
+from .pagination import OptionalKeysetPagination
 
 logger = logging.getLogger(__name__)
 
 class LogViewSet(viewsets.ModelViewSet):
-    queryset = Log.objects.all().select_related('user')
+    queryset = Log.objects.all().select_related('user').order_by('-timestamp')
     serializer_class = LogSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = LogFilter
     permission_classes = [IsAdminUser]
-    pagination_class = None
+    pagination_class = OptionalKeysetPagination
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
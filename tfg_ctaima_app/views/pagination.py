@@ -1,21 +1,245 @@
 # tfg_ctaima_app/views/pagination.py
 
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from datetime import datetime
+from functools import cached_property, partial
+
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
 
+from ..counts import EXACT, count_queryset
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) sobre (timestamp, id).
+
+    En lugar de OFFSET filtra por la posición del último elemento devuelto,
+    así que el coste de una página no depende de lo lejos que esté y no se
+    calcula COUNT(*). El cursor es opaco para el cliente: se pide la primera
+    página con ?pagination=cursor y las siguientes con ?cursor=<next_cursor>
+    o ?cursor=<previous_cursor>.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    ordering_field = 'timestamp'
+
+    @classmethod
+    def requested(cls, request):
+        return (request.query_params.get(cls.mode_query_param) == 'cursor'
+                or cls.cursor_query_param in request.query_params)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def encode_cursor(self, instance, reverse):
+        # Las filas pueden ser instancias o diccionarios de values()
+        if isinstance(instance, dict):
+            value, pk = instance[self.ordering_field], instance.get('pk', instance.get('id'))
+        else:
+            value, pk = getattr(instance, self.ordering_field), instance.pk
+        position = {
+            't': value.isoformat(),
+            'i': str(pk),
+            'r': int(reverse),
+        }
+        return base64.urlsafe_b64encode(json.dumps(position).encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, request):
+        """
+        Returns:
+            tuple[datetime, str, bool] | None: Posición y sentido del cursor
+            recibido, o None en la primera página
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            return datetime.fromisoformat(position['t']), position['i'], bool(position.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound('Cursor no válido.')
+
+    def is_descending(self, queryset):
+        """
+        El sentido lo marca la ordenación ya aplicada a la consulta (la del
+        ViewSet o la de ?ordering=). Solo se admite ordenar por el campo del
+        cursor.
+        """
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not ordering or str(ordering[0]).lstrip('-') != self.ordering_field:
+            raise ValidationError({
+                self.cursor_query_param: f"La paginación por cursor requiere ordenar por '{self.ordering_field}'."
+            })
+        return str(ordering[0]).startswith('-')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        descending = self.is_descending(queryset)
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor[2])
+
+        # Hacia atrás se recorre en el sentido contrario y se da la vuelta
+        # al resultado.
+        backwards = descending != reverse
+        field = self.ordering_field
+        if cursor:
+            value, pk = cursor[0], cursor[1]
+            # La condición redundante sobre el campo solo acota el rango del
+            # índice; la disyunción deshace el empate por id.
+            if backwards:
+                queryset = queryset.filter(**{f'{field}__lte': value}).filter(
+                    Q(**{f'{field}__lt': value}) | Q(pk__lt=pk)
+                )
+            else:
+                queryset = queryset.filter(**{f'{field}__gte': value}).filter(
+                    Q(**{f'{field}__gt': value}) | Q(pk__gt=pk)
+                )
+        prefix = '-' if backwards else ''
+        queryset = queryset.order_by(f'{prefix}{field}', f'{prefix}pk')
+
+        rows = list(queryset[:self.page_size_value + 1])
+        has_more = len(rows) > self.page_size_value
+        rows = rows[:self.page_size_value]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        self.next_cursor = self.encode_cursor(rows[-1], reverse=False) if rows and has_next else None
+        self.previous_cursor = self.encode_cursor(rows[0], reverse=True) if rows and has_previous else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'success': True,
+            'next_cursor': self.next_cursor,
+            'previous_cursor': self.previous_cursor,
+            'page_size': self.page_size_value,
+            'results': data
+        })
+
+
+class OptionalKeysetPagination(KeysetPagination):
+    """
+    Paginación por cursor solo si se pide; sin parámetros de cursor la lista
+    se devuelve completa, como antes.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.requested(request):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+class CountingPaginator(Paginator):
+    """
+    Paginator cuyo total se obtiene con counts.count_queryset. Si el total
+    es aproximado no se usa para recortar la última página ni para rechazar
+    páginas posteriores: solo se rechaza una página que salga vacía. La
+    página pide una fila de más para saber si hay siguiente y corrige el
+    total con lo leído (en la última página queda exacto), de modo que
+    num_pages, has_next() y el enlace next son coherentes con los datos.
+
+    Args:
+        exact (bool): Fuerza un COUNT(*) exacto
+    """
+
+    def __init__(self, object_list, per_page, exact=False, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.exact = exact
+
+    @cached_property
+    def count_result(self):
+        return count_queryset(self.object_list, exact=self.exact)
+
+    @cached_property
+    def count(self):
+        return self.count_result[0]
+
+    @property
+    def count_estimated(self):
+        return self.count_result[1] != EXACT
+
+    def validate_number(self, number):
+        if not self.count_estimated:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        if not self.count_estimated:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        # Una fila de más indica si hay página siguiente sin fiarse del total
+        objects = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not objects and number > 1:
+            raise EmptyPage(self.error_messages['no_results'])
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+        if has_more:
+            # El total debe llegar al menos hasta la página siguiente
+            self.set_count(max(self.count, bottom + self.per_page + 1), self.count_result[1])
+        else:
+            # Última página: el total ya es exacto
+            self.set_count(bottom + len(objects), EXACT)
+        return self._get_page(objects, number, self)
+
+    def set_count(self, count, kind):
+        # count, count_estimated, num_pages y page_range salen de count_result
+        self.__dict__['count_result'] = (count, kind)
+        for name in ('count', 'num_pages', 'page_range'):
+            self.__dict__.pop(name, None)
+
+
 class StandardResultsSetPagination(PageNumberPagination):
     """
-    Clase de paginación estándar.
+    Clase de paginación estándar. Por defecto pagina por número de página
+    con un total aproximado o cacheado (ver counts.py); ?exact_count=1 pide
+    el total exacto. Con ?pagination=cursor o ?cursor=... usa
+    KeysetPagination, que no calcula total.
     """
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
+    exact_count_query_param = 'exact_count'
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.keyset_class() if self.keyset_class.requested(request) else None
+        if self.keyset is not None:
+            return self.keyset.paginate_queryset(queryset, request, view)
+        exact = request.query_params.get(self.exact_count_query_param, '').lower() in ('1', 'true')
+        self.django_paginator_class = partial(CountingPaginator, exact=exact)
+        return super().paginate_queryset(queryset, request, view)
 
     def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
         return Response({
             'success': True,
             'count': self.page.paginator.count,
+            'count_estimated': self.page.paginator.count_estimated,
             'num_pages': self.page.paginator.num_pages,
             'current_page': self.page.number,
             'results': data
-        })
\ No newline at end of file
+        })
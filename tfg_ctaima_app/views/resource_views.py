@@ -1,8 +1,7 @@
 # app1/views/resource_views.py
 
 import logging
-from django.db.models import Q, Value, CharField
-from django.db.models.functions import Concat
+from django.db.models import Q
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import viewsets, status, filters as rest_framework_filters
@@ -11,15 +10,16 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 
 from ..models import Resource, Employee, Vehicle, Log, EventType
-from ..serializers import ResourceSerializer, EmployeeSerializer, VehicleSerializer
-from .filters import ResourceFilter
+from ..serializers import ResourceSerializer, EmployeeSerializer, VehicleSerializer, get_resource_row_serializer
+from ..search import search_resources
+from .filters import ResourceFilter, FullTextSearchFilter, rank_search_results
 from .pagination import StandardResultsSetPagination
 from .decorators import log_event
 
 logger = logging.getLogger(__name__)
 
 class ResourceViewSet(viewsets.ModelViewSet):
-    queryset = Resource.objects.select_related('employee', 'vehicle').all().order_by('-timestamp')
+    queryset = ResourceSerializer.setup_eager_loading(Resource.objects.all()).order_by('-timestamp')
     serializer_class = ResourceSerializer
     filter_backends = [rest_framework_filters.SearchFilter, rest_framework_filters.OrderingFilter]
     filterset_class = ResourceFilter
@@ -68,23 +68,23 @@ class ResourceViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
         search = self.request.query_params.get('search', None)
         if search:
-            employee_qs = Resource.objects.filter(resource_type='employee').annotate(
-                full_name=Concat('employee__first_name', Value(' '), 'employee__last_name', output_field=CharField())
-            ).filter(
-                Q(full_name__icontains=search) |
-                Q(employee__first_name__icontains=search) |
-                Q(employee__last_name__icontains=search) |
-                Q(employee__worker_id__icontains=search)
-            )
-            vehicle_qs = Resource.objects.filter(resource_type='vehicle').filter(
-                Q(vehicle__name__icontains=search) |
-                Q(vehicle__registration_id__icontains=search)
-            )
-            resources = (employee_qs | vehicle_qs).select_related('employee', 'vehicle').distinct()
+            resources = search_resources(queryset, search, rank=rank_search_results(self.request))
             logger.debug(f"Búsqueda de recursos con término '{search}'.")
             return resources
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        # Lectura rápida: una consulta con las columnas de Employee y Vehicle
+        # (values) y serialización sin instancias por fila.
+        row_serializer = get_resource_row_serializer()
+        queryset = row_serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else queryset
+        data = [row_serializer.to_representation(row) for row in rows]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
     @action(detail=False, methods=['get'], url_path='search', permission_classes=[IsAuthenticated])
     def search_resources(self, request):
         query = request.GET.get('query', '')
@@ -103,8 +103,8 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     queryset = Employee.objects.all().order_by('-timestamp')
     # queryset = Employee.objects.select_related('company').all().order_by('-timestamp')
 
-    filter_backends = [rest_framework_filters.SearchFilter, rest_framework_filters.OrderingFilter]
-    search_fields = ['first_name', 'last_name','worker_id']
+    # ?search= busca en first_name, last_name y worker_id (Employee.search_vector)
+    filter_backends = [rest_framework_filters.OrderingFilter, FullTextSearchFilter]
     serializer_class = EmployeeSerializer
     ordering_fields = ['timestamp']
     permission_classes = [IsAuthenticated]
@@ -7,7 +7,7 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 
-from ..models import Log, EventType
+from ..models import Log, EventType, Validation
 from ..serializers import UserSerializer, ValidationSerializer
 from .decorators import log_event
 
@@ -85,8 +85,7 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'], url_path='validations')
     def validations(self, request, pk=None):
         user = self.get_object()
-        from ..serializers import ValidationSerializer
-        validations = Validation.objects.filter(user=user).select_related('document')
+        validations = ValidationSerializer.setup_eager_loading(Validation.objects.filter(user=user))
         serializer = ValidationSerializer(validations, many=True)
         logger.info(f"Usuario '{request.user.username}' obtuvo las validaciones de '{user.username}'.")
         return Response(serializer.data)
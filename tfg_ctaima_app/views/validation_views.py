@@ -2,8 +2,6 @@
 
 import logging
 import json
-import requests
-import os
 
 from django.conf import settings
 from django.shortcuts import get_object_or_404
@@ -11,22 +9,29 @@ from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status, filters as rest_framework_filters
 from rest_framework.decorators import action, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
 from .decorators import log_event
-from ..models import Validation, Document, Log, EventType
-from ..serializers import ValidationSerializer, LogSerializer
-from .filters import ValidationFilter
+from ..models import Validation, ValidationSummary, ValidationJob, Document, Log, EventType
+from ..serializers import (
+    ValidationSerializer, ValidationSummarySerializer, ValidationJobSerializer, ValidationBatchSerializer, LogSerializer
+)
+from .filters import ValidationFilter, ValidationSummaryFilter
 from .pagination import StandardResultsSetPagination
-from ..utils import transform_validation_details, generate_sas_token, update_info, process_api_response, transform_fields
-
-from azure.storage.blob import BlobSasPermissions
+from ..utils import transform_validation_details, transform_fields
+from ..stats import compute_daily_stats, compute_validation_stats, daily_stats_queryset, PERIOD_TRUNCATORS
+from ..validation_jobs import enqueue_validation
+from ..validation_batch import enqueue_batch_validation
+from ..validation_client import collect_metrics
+from ..sas_cache import get_sas_cache
+from ..exports import EXPORT_CONTENT_TYPES, EXPORT_FORMAT_PARAM, VALIDATION_EXPORT_COLUMNS, export_response
 
 logger = logging.getLogger(__name__)
 
 class ValidationViewSet(viewsets.ModelViewSet):
-    queryset = Validation.objects.all().select_related('document__document_type', 'user').order_by('-timestamp')
+    queryset = ValidationSerializer.setup_eager_loading(Validation.objects.all()).order_by('-timestamp')
     serializer_class = ValidationSerializer
     filter_backends = [rest_framework_filters.OrderingFilter, DjangoFilterBackend]
     filterset_class = ValidationFilter
@@ -36,121 +41,82 @@ class ValidationViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     @log_event(EventType.CREATE_VALIDATION)
-    @transaction.atomic
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         validation_details = request.data.get('validation_details')
         logger.debug(f"Detalles de validación recibidos: {validation_details}")
-        print(f"Validation Details: {validation_details}")
 
         try:
             request_validation_details = transform_validation_details(validation_details)
-            document = get_object_or_404(Document, id=request.data['document'])
-            _, ext = os.path.splitext(document.name)
-            doc_name = f"{settings.ENVIRONMENT}/{document.file_hash}{ext}"
-            sas_token = generate_sas_token(doc_name, BlobSasPermissions(read=True, write=False, delete=False))
-
-            req_params = {
-                "fields_to_validate": request_validation_details['fields_to_validate'],
-                "fields_to_extract": request_validation_details['fields_to_extract'],
-                "account_url": f"https://{settings.AZURE_ACCOUNT_NAME}.blob.core.windows.net",
-                "container_name": settings.AZURE_CONTAINER,
-                "doc_name": doc_name,
-                "sas_token": sas_token,
-                "document_type": document.document_type.api_doc_type_text,
-                "sign": document.document_type.sign,
-                "tfg": True,
-                "uuid": "dasdbahhdjaj",
-                "pattern_validation": document.document_type.pattern_validation,
-            }
-
-            if document.document_type.pattern_invalidation is not None:
-                req_params["pattern_invalidation"] = document.document_type.pattern_invalidation
-            if document.document_type.id == 4:
-                req_params["sign"] = True
-
-            logger.debug(f"Parámetros de validación enviados al endpoint: {req_params}")
-            print(req_params)
-
-            response = requests.post(
-                settings.VALIDATION_ENDPOINT,
-                json=req_params,
-                headers={
-                    "Ocp-Apim-Subscription-Key": settings.OCP_APIM_VALIDATION_SUBSCRIPTION_KEY,
-                    "Content-Type": "application/json"
-                }
+        except (TypeError, ValueError) as e:
+            logger.error(f"validation_details no es un JSON válido: {str(e)}")
+            return Response({"error": f"validation_details no es un JSON válido: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # La llamada al endpoint externo la hace un worker de la cola; aquí solo
+        # se registra la validación como 'pending' y se encola el trabajo.
+        with transaction.atomic():
+            validation = serializer.save(
+                validation_details=transform_fields(request_validation_details),
+                status='pending',
+            )
+            job = enqueue_validation(validation, request_validation_details)
+
+        logger.info(f"Validación '{validation.id}' encolada (trabajo '{job.id}') para el documento '{validation.document.name}'.")
+        response_data = {**serializer.data, 'job': {'id': str(job.id), 'status': job.status}}
+        return Response(response_data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['post'], url_path='batch', permission_classes=[IsAuthenticated])
+    def batch(self, request):
+        batch_serializer = ValidationBatchSerializer(data=request.data)
+        batch_serializer.is_valid(raise_exception=True)
+
+        max_documents = settings.VALIDATION_BATCH_MAX_DOCUMENTS
+        documents = list(batch_serializer.get_documents_queryset()[:max_documents + 1])
+        if not documents:
+            return Response({'error': 'No hay documentos que validar.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(documents) > max_documents:
+            return Response(
+                {'error': f'El lote supera el máximo de {max_documents} documentos.'},
+                status=status.HTTP_400_BAD_REQUEST
             )
 
-            template = {
-                "fields_to_validate": request_validation_details['fields_to_validate'],
-                "fields_to_extract": request_validation_details['fields_to_extract'],
-            }
-
-            response.raise_for_status()
-            validation_result = response.json()
-
-            print(f"Validation Result: {validation_result}")
-
-            updated_template = process_api_response(validation_result, template)
-            # print(f"updated_template KKKK: {updated_template}")
-            # logger.info(f"Resultado de la validación: {validation_result}")
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error durante la solicitud de validación: {str(e)}")
-            return Response({"error": f"Error during validation request: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        # if isinstance(validation_details, str):
-        #     try:
-        #         validation_details = json.loads(validation_details)
-        #     except json.JSONDecodeError:
-        #         logger.error("validation_details no es un JSON válido.")
-        #         return Response({"error": "validation_details no es un JSON válido."}, status=status.HTTP_400_BAD_REQUEST)
-        # elif not isinstance(validation_details, dict):
-        #     logger.error("validation_details debe ser un objeto JSON.")
-        #     return Response({"error": "validation_details debe ser un objeto JSON."}, status=status.HTTP_400_BAD_REQUEST)
-
-        try:
-            # plantilla_actualizada = update_info(validation_result, validation_details)
-            new_fields_transformed = transform_fields(updated_template)
-            # print(f"\n\n new_fields_transformed NEW NEW NEW: {new_fields_transformed}")
-            # logger.debug(f"Plantilla actualizada: {plantilla_actualizada}")
-        except TypeError as e:
-            logger.error(f"Error al actualizar la plantilla: {str(e)}")
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-        # if validation_result.get('result') == 'OK':
-        #     status_validation = 'success'
-        # elif validation_result.get('result') == 'KO':
-        #     justificacion = validation_result.get('justification')
-        #     status_validation = 'failure'
-        # else:
-        #     status_validation = 'pending'
-
-        # serializer.save(
-        #     validation_details=new_fields_transformed,
-        #     # validation_details=plantilla_actualizada,
-        #     status=status_validation
-        # )
-
-        result = validation_result.get("result")
-        status_validation = (
-            "success" if result == "OK" else
-            "failure" if result == "KO" else
-            "pending"
-        )
-
-        extra_fields = {"justification": validation_result.get("justificacion")} if result == "KO" else {}
-
-        serializer.save(
-            validation_details=new_fields_transformed,
-            status=status_validation,
-            **extra_fields
+        # Las validaciones quedan 'pending' y las procesa el pool de workers;
+        # el estado de cada una se consulta en /api/validation/jobs/{id}/
+        jobs = enqueue_batch_validation(documents, request.user, request)
+
+        logger.info(f"Usuario '{request.user.username}' encoló un lote de {len(jobs)} validaciones.")
+        return Response({
+            'count': len(jobs),
+            'validations': [
+                {
+                    'id': str(job.validation.pk),
+                    'document': str(job.validation.document_id),
+                    'status': job.validation.status,
+                    'job': {'id': str(job.pk), 'status': job.status},
+                }
+                for job in jobs
+            ],
+        }, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'], url_path=r'jobs/(?P<job_id>[0-9a-fA-F-]{36})', permission_classes=[IsAuthenticated])
+    def job(self, request, job_id=None):
+        job = get_object_or_404(
+            ValidationSerializer.setup_eager_loading(ValidationJob.objects.all(), prefix='validation__'),
+            pk=job_id
         )
+        serializer = ValidationJobSerializer(job)
+        return Response(serializer.data)
 
-        logger.info(f"Validación '{serializer.instance.id}' creada para el documento '{serializer.instance.document.name}'.")
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    @action(detail=False, methods=['get'], url_path='service-metrics', permission_classes=[IsAdminUser])
+    def service_metrics(self, request):
+        # Métricas del cliente del servicio de validación agregadas de los
+        # workers (que son los que lo llaman) y de la caché de SAS de este proceso
+        return Response({
+            **collect_metrics(),
+            'sas_cache': get_sas_cache().snapshot(),
+        })
 
     @log_event(EventType.UPDATE_VALIDATION)
     def partial_update(self, request, pk=None):
@@ -165,13 +131,29 @@ class ValidationViewSet(viewsets.ModelViewSet):
     def search(self, request):
         query = request.GET.get('query', '')
         if query:
-            validations = Validation.objects.filter(id__icontains=query).select_related('document', 'user')
+            validations = ValidationSerializer.setup_eager_loading(Validation.objects.filter(id__icontains=query))
             serializer = self.get_serializer(validations, many=True)
             logger.info(f"Usuario '{request.user.username}' buscó validaciones con query '{query}'.")
             return Response(serializer.data)
         logger.warning("Solicitud de búsqueda sin término proporcionado.")
         return Response({'error': 'No se proporcionó un término de búsqueda.'}, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['get'], url_path='history', permission_classes=[IsAuthenticated])
+    def history(self, request):
+        """
+        Historial de validaciones desde ValidationSummary: mismos filtros que
+        el listado, sin joins y sin los detalles de cada validación.
+        """
+        filterset = ValidationSummaryFilter(
+            request.query_params, queryset=ValidationSummary.objects.order_by('-timestamp', '-validation'), request=request
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        page = self.paginate_queryset(filterset.qs)
+        serializer = ValidationSummarySerializer(page, many=True)
+        logger.info(f"Usuario '{request.user.username}' obtuvo el historial de validaciones.")
+        return self.get_paginated_response(serializer.data)
+
     @action(detail=False, methods=['get'], url_path='allValidations', permission_classes=[IsAuthenticated])
     def get_all(self, request):
         queryset = self.filter_queryset(self.get_queryset())
@@ -179,11 +161,41 @@ class ValidationViewSet(viewsets.ModelViewSet):
         logger.info(f"Usuario '{request.user.username}' obtuvo todas las validaciones filtradas.")
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=['get'], url_path='export', permission_classes=[IsAuthenticated])
+    def export(self, request):
+        """
+        Exporta las validaciones filtradas (mismos filtros y ordenación que
+        el listado) en streaming. ?export_format=csv (por defecto) o jsonl.
+        """
+        export_format = request.query_params.get(EXPORT_FORMAT_PARAM, 'csv')
+        if export_format not in EXPORT_CONTENT_TYPES:
+            return Response({'error': f"Formato de exportación no válido: '{export_format}'."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        queryset = self.filter_queryset(Validation.objects.all())
+        logger.info(f"Usuario '{request.user.username}' exportó validaciones en formato {export_format}.")
+        return export_response(queryset, VALIDATION_EXPORT_COLUMNS, export_format, 'validations')
+
+    @action(detail=False, methods=['get'], url_path='stats', permission_classes=[IsAuthenticated])
+    def stats(self, request):
+        period = request.query_params.get('period', 'day')
+        if period not in PERIOD_TRUNCATORS:
+            return Response({'error': f"Periodo no válido: '{period}'."}, status=status.HTTP_400_BAD_REQUEST)
+        daily_stats = daily_stats_queryset(request.query_params)
+        if daily_stats is not None:
+            stats = compute_daily_stats(daily_stats, period=period)
+        else:
+            queryset = self.filter_queryset(Validation.objects.all())
+            stats = compute_validation_stats(queryset, period=period)
+        logger.info(f"Usuario '{request.user.username}' obtuvo las estadísticas de validaciones.")
+        return Response(stats, status=status.HTTP_200_OK)
+
     @action(detail=True, methods=['get'], url_path='logs', permission_classes=[IsAuthenticated])
     def logs(self, request, pk=None):
         validation = self.get_object()
-        logs = Log.objects.filter(details__icontains=f"'{validation.id}'").select_related('user')
-        from ..serializers import LogSerializer
+        logs = (Log.objects
+                .filter(entity_type=EventType.CREATE_VALIDATION.entity_type, entity_id=str(validation.id))
+                .select_related('user')
+                .order_by('-timestamp'))
         serializer = LogSerializer(logs, many=True)
         logger.info(f"Usuario '{request.user.username}' obtuvo los logs para la validación '{validation.id}'.")
         return Response(serializer.data)
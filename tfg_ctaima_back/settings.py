@@ -3,6 +3,7 @@ import environ
 import os
 import django
 from logging.handlers import RotatingFileHandler
+from corsheaders.defaults import default_headers
 
 SESSION_ENGINE = 'django.contrib.sessions.backends.db'  # Usa base de datos para almacenar sesiones
 
@@ -52,10 +53,112 @@ DB_PORT = env(f"{ENVIRONMENT}_DB_PORT")
 VALIDATION_ENDPOINT = env(f"{ENVIRONMENT}_VALIDATION_ENDPOINT")
 OCP_APIM_VALIDATION_SUBSCRIPTION_KEY = env(f"{ENVIRONMENT}_OCP_APIM_VALIDATION_SUBSCRIPTION_KEY")
 
+# Cliente HTTP del servicio de validación (conexiones keep-alive, timeouts y reintentos)
+VALIDATION_CLIENT_POOL_MAXSIZE = env.int('VALIDATION_CLIENT_POOL_MAXSIZE', default=10)  # conexiones por host
+VALIDATION_CLIENT_CONNECT_TIMEOUT = env.float('VALIDATION_CLIENT_CONNECT_TIMEOUT', default=5.0)
+VALIDATION_CLIENT_READ_TIMEOUT = env.float('VALIDATION_CLIENT_READ_TIMEOUT', default=120.0)
+VALIDATION_CLIENT_MAX_RETRIES = env.int('VALIDATION_CLIENT_MAX_RETRIES', default=3)
+VALIDATION_CLIENT_BACKOFF_BASE = env.float('VALIDATION_CLIENT_BACKOFF_BASE', default=0.5)
+VALIDATION_CLIENT_BACKOFF_MAX = env.float('VALIDATION_CLIENT_BACKOFF_MAX', default=30.0)
+# Los workers publican sus métricas del cliente en la base de datos cada
+# VALIDATION_CLIENT_METRICS_INTERVAL segundos; la vista de métricas ignora las
+# de procesos que llevan más de VALIDATION_CLIENT_METRICS_MAX_AGE sin publicar.
+VALIDATION_CLIENT_METRICS_INTERVAL = env.int('VALIDATION_CLIENT_METRICS_INTERVAL', default=30)  # segundos
+VALIDATION_CLIENT_METRICS_MAX_AGE = env.int('VALIDATION_CLIENT_METRICS_MAX_AGE', default=300)  # segundos
+
+# Cola de validaciones asíncronas (python manage.py run_validation_workers)
+VALIDATION_WORKERS = env.int('VALIDATION_WORKERS', default=4)
+VALIDATION_JOB_MAX_ATTEMPTS = env.int('VALIDATION_JOB_MAX_ATTEMPTS', default=3)
+VALIDATION_JOB_POLL_INTERVAL = env.float('VALIDATION_JOB_POLL_INTERVAL', default=2.0)
+VALIDATION_JOB_STALE_AFTER = env.int('VALIDATION_JOB_STALE_AFTER', default=600)  # segundos
+
+# Validación por lotes (POST /api/validation/batch/)
+VALIDATION_BATCH_MAX_DOCUMENTS = env.int('VALIDATION_BATCH_MAX_DOCUMENTS', default=500)
+
 AZURE_ACCOUNT_NAME = env('AZURE_ACCOUNT_NAME')
 AZURE_ACCOUNT_KEY = env('AZURE_ACCOUNT_KEY')
 AZURE_CONTAINER = env('AZURE_CONTAINER')
 
+# Backend de almacenamiento de documentos (ver tfg_ctaima_app/storage.py).
+# Para Azurite: AZURE_STORAGE_ACCOUNT_URL=http://127.0.0.1:10000/devstoreaccount1
+# Para pruebas locales: DOCUMENT_STORAGE_BACKEND=tfg_ctaima_app.storage.LocalFileSystemStorage
+DOCUMENT_STORAGE_BACKEND = env('DOCUMENT_STORAGE_BACKEND', default='tfg_ctaima_app.storage.AzureBlobStorage')
+AZURE_STORAGE_ACCOUNT_URL = env('AZURE_STORAGE_ACCOUNT_URL', default=f"https://{AZURE_ACCOUNT_NAME}.blob.core.windows.net")
+AZURE_STORAGE_POOL_MAXSIZE = env.int('AZURE_STORAGE_POOL_MAXSIZE', default=10)
+DOCUMENT_STORAGE_LOCAL_ROOT = env('DOCUMENT_STORAGE_LOCAL_ROOT', default=os.path.join(BASE_DIR, 'document_storage'))
+DOCUMENT_STORAGE_LOCAL_BASE_URL = env('DOCUMENT_STORAGE_LOCAL_BASE_URL', default='http://localhost:8000/document_storage/')
+
+# Registro de auditoría (ver tfg_ctaima_app/audit.py): 'sync', 'buffered' o 'spool'
+AUDIT_SINK = env('AUDIT_SINK', default='buffered')
+AUDIT_BUFFER_SIZE = env.int('AUDIT_BUFFER_SIZE', default=100)  # eventos por volcado
+AUDIT_FLUSH_INTERVAL = env.float('AUDIT_FLUSH_INTERVAL', default=2.0)  # segundos
+AUDIT_SPOOL_DIR = env('AUDIT_SPOOL_DIR', default=os.path.join(LOG_DIR, 'audit_spool'))
+
+# Particiones mensuales de la tabla de logs (python manage.py manage_log_partitions)
+LOG_PARTITION_MONTHS_AHEAD = env.int('LOG_PARTITION_MONTHS_AHEAD', default=3)
+LOG_RETENTION_MONTHS = env.int('LOG_RETENTION_MONTHS', default=12)
+
+# Totales de los listados paginados (ver tfg_ctaima_app/counts.py): sin
+# filtros se usa la estimación de PostgreSQL a partir de este número de filas;
+# con filtros el total se guarda en caché estos segundos.
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = env.int('PAGINATION_COUNT_ESTIMATE_THRESHOLD', default=10000)
+PAGINATION_COUNT_CACHE_TTL = env.int('PAGINATION_COUNT_CACHE_TTL', default=30)
+PAGINATION_COUNT_CACHE_ALIAS = env('PAGINATION_COUNT_CACHE_ALIAS', default='default')
+
+# Caché de configuraciones de tipos de documento (ver
+# tfg_ctaima_app/document_type_cache.py). DOCUMENT_TYPE_CACHE_ALIAS indica una
+# entrada de CACHES para propagar las invalidaciones entre procesos.
+DOCUMENT_TYPE_CACHE_TTL = env.int('DOCUMENT_TYPE_CACHE_TTL', default=300)  # segundos
+DOCUMENT_TYPE_CACHE_ALIAS = env('DOCUMENT_TYPE_CACHE_ALIAS', default=None)
+DOCUMENT_TYPE_CACHE_CHECK_INTERVAL = env.float('DOCUMENT_TYPE_CACHE_CHECK_INTERVAL', default=5.0)  # segundos
+
+# Autocompletado (ver tfg_ctaima_app/views/autocomplete_views.py): número de
+# resultados por defecto y máximo, caracteres mínimos del texto (con menos no
+# se consulta: un prefijo de una letra casa con casi toda la tabla) y
+# segundos que se guarda cada respuesta en la entrada AUTOCOMPLETE_CACHE_ALIAS
+# de CACHES.
+AUTOCOMPLETE_LIMIT = env.int('AUTOCOMPLETE_LIMIT', default=10)
+AUTOCOMPLETE_MAX_LIMIT = env.int('AUTOCOMPLETE_MAX_LIMIT', default=50)
+AUTOCOMPLETE_MIN_LENGTH = env.int('AUTOCOMPLETE_MIN_LENGTH', default=2)
+AUTOCOMPLETE_CACHE_TTL = env.int('AUTOCOMPLETE_CACHE_TTL', default=30)  # segundos
+AUTOCOMPLETE_CACHE_ALIAS = env('AUTOCOMPLETE_CACHE_ALIAS', default='default')
+
+# Exportaciones en streaming (ver tfg_ctaima_app/exports.py): filas que se
+# traen del cursor de servidor en cada viaje a la base de datos.
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', default=2000)
+
+# Caché de tokens SAS (ver tfg_ctaima_app/sas_cache.py). SAS_CACHE_ALIAS
+# indica una entrada de CACHES para compartir los tokens entre procesos.
+SAS_CACHE_ENABLED = env.bool('SAS_CACHE_ENABLED', default=True)
+SAS_CACHE_MAX_ENTRIES = env.int('SAS_CACHE_MAX_ENTRIES', default=10000)
+SAS_CACHE_MIN_REMAINING_RATIO = env.float('SAS_CACHE_MIN_REMAINING_RATIO', default=0.5)
+SAS_CACHE_ALIAS = env('SAS_CACHE_ALIAS', default=None)
+
+# Descarga de documentos (GET /api/documents/<id>/):
+#   'proxy'    -> la aplicación sirve los bytes del documento
+#   'redirect' -> 302 a una URL firmada (SAS) del almacenamiento
+#   'url'      -> igual que 'redirect'; 'url' y 'redirect' solo habilitan la
+#                 descarga directa, y el JSON con la URL firmada se devuelve
+#                 únicamente a quien lo pida con ?delivery=url
+# El frontend pide el documento con withCredentials, así que al seguir la
+# redirección el almacenamiento debe responder a CORS permitiendo credenciales
+# (Access-Control-Allow-Origin con el origen concreto, no '*', y
+# Access-Control-Allow-Credentials: true); si no, el navegador bloquea la descarga.
+DOCUMENT_DOWNLOAD_MODE = env('DOCUMENT_DOWNLOAD_MODE', default='proxy')
+DOCUMENT_DOWNLOAD_SAS_TTL = env.int('DOCUMENT_DOWNLOAD_SAS_TTL', default=300)  # segundos
+
+# Subida de documentos en una sola pasada (hash + subida por bloques)
+DOCUMENT_UPLOAD_SINGLE_PUT_MAX = env.int('DOCUMENT_UPLOAD_SINGLE_PUT_MAX', default=4 * 1024 * 1024)  # bytes
+DOCUMENT_UPLOAD_BLOCK_SIZE = env.int('DOCUMENT_UPLOAD_BLOCK_SIZE', default=4 * 1024 * 1024)  # bytes
+DOCUMENT_UPLOAD_MAX_IN_FLIGHT = env.int('DOCUMENT_UPLOAD_MAX_IN_FLIGHT', default=4)  # bloques en paralelo
+
+# Subida por partes reanudable (POST /api/document/uploads/)
+DOCUMENT_UPLOAD_PART_SIZE = env.int('DOCUMENT_UPLOAD_PART_SIZE', default=8 * 1024 * 1024)  # bytes
+DOCUMENT_UPLOAD_MIN_PART_SIZE = env.int('DOCUMENT_UPLOAD_MIN_PART_SIZE', default=1024 * 1024)  # bytes
+DOCUMENT_UPLOAD_MAX_PART_SIZE = env.int('DOCUMENT_UPLOAD_MAX_PART_SIZE', default=64 * 1024 * 1024)  # bytes
+DOCUMENT_UPLOAD_MAX_SIZE = env.int('DOCUMENT_UPLOAD_MAX_SIZE', default=5 * 1024 * 1024 * 1024)  # bytes
+DOCUMENT_UPLOAD_SESSION_TTL = env.int('DOCUMENT_UPLOAD_SESSION_TTL', default=24 * 3600)  # segundos
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',  # Especificamos que estamos usando PostgreSQL
@@ -120,6 +223,15 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
     ], 
+    # FAST_JSON_RENDERER=True serializa con orjson si está instalado (ver
+    # tfg_ctaima_app/renderers.py). Desactivado por defecto porque la salida
+    # no es idéntica a la de JSONRenderer en todos los casos (las diferencias
+    # están en el docstring de FastJSONRenderer).
+    'DEFAULT_RENDERER_CLASSES': [
+        'tfg_ctaima_app.renderers.FastJSONRenderer'
+        if env.bool('FAST_JSON_RENDERER', default=False) else 'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 
 }
 
@@ -131,6 +243,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'tfg_ctaima_app',
     'corsheaders',
@@ -160,6 +273,11 @@ CORS_ALLOWED_ORIGINS = [
     'https://api.validatortwind.site',
 ]
 
+# Cabeceras necesarias para las descargas parciales (Range) del visor de PDF
+# y para la subida por partes desde el frontend.
+CORS_ALLOW_HEADERS = (*default_headers, 'range', 'if-range', 'if-none-match', 'x-content-sha256')
+CORS_EXPOSE_HEADERS = ['Accept-Ranges', 'Content-Range', 'Content-Length', 'Content-Disposition', 'ETag']
+
 CSRF_TRUSTED_ORIGINS = [
     'http://localhost:5173',  # URL de tu frontend
     'https://app.validatortwind.site',
@@ -22,8 +22,16 @@ API Endpoints (prefijo: /api/):
     - /api/users/                    # CRUD de usuarios
     - /api/documentTypes/           # CRUD de tipos de documentos
     - /api/documents/               # CRUD de documentos
+    - /api/document/uploads/        # Subida por partes reanudable de documentos grandes
     - /api/validations/            # CRUD de validaciones
+    - /api/validation/stats/        # Estadísticas agregadas para el dashboard
+    - /api/validation/batch/        # Validación por lotes de documentos
+    - /api/validation/history/      # Historial de validaciones (ValidationSummary)
+    - /api/validation/export/       # Exportación CSV/JSONL de validaciones
+    - /api/document/export/         # Exportación CSV/JSONL de documentos
     - /api/logs/                    # CRUD de logs
+    - /api/autocomplete/companies/  # Autocompletado {id, label} de compañías
+    - /api/autocomplete/resources/  # Autocompletado {id, label} de recursos
 
 Admin Endpoint:
     - /admin/                       # Panel de administración de Django
@@ -41,6 +49,7 @@ from tfg_ctaima_app.views.company_views import CompanyViewSet
 from tfg_ctaima_app.views.resource_views import ResourceViewSet, EmployeeViewSet, VehicleViewSet
 from tfg_ctaima_app.views.validation_views import ValidationViewSet
 from tfg_ctaima_app.views.log_views import LogViewSet
+from tfg_ctaima_app.views.autocomplete_views import AutocompleteViewSet
 
 # Crear un enrutador para las vistas
 router = DefaultRouter()
@@ -53,6 +62,7 @@ router.register(r'resources', ResourceViewSet)
 router.register(r'vehicles', VehicleViewSet)
 router.register(r'employees', EmployeeViewSet)
 router.register(r'logs', LogViewSet)
+router.register(r'autocomplete', AutocompleteViewSet, basename='autocomplete')
 
 urlpatterns = [
     path('api/', include(router.urls)),